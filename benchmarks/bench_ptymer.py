@@ -0,0 +1,246 @@
+"""
+Benchmarks of ptymer's own overhead and timing accuracy.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_ptymer.py [--output results.json] [--baseline previous.json] [--tolerance 0.25] [--quick]
+
+Every result is printed and written as JSON. With `--baseline`, the script exits with status 1 if a result is worse
+than the same result of the baseline by more than the tolerance, so regressions of the hot paths show up before a release.
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from multiprocessing import Process, Value, cpu_count
+from platform import platform, python_version
+from time import perf_counter_ns, monotonic, sleep, time
+from typing import Callable, Dict, List, Optional
+import cProfile
+import json
+import sys
+
+from psutil import Process as psProcess
+from ptymer import Timer, HourGlass, Alarm, Registry, TimeoutWheel, Instrumenter
+
+RESULTS: Dict[str, Dict[str, float]] = {}
+# results indexed by benchmark name, each one with its `value` and `unit`; lower is always better
+
+def report(name: str, value: float, unit: str) -> None:
+    """
+    Store and print a result.
+
+    Args:
+        name (str): The name of the benchmark.
+        value (float): The measured value, lower is better.
+        unit (str): The unit of the value.
+    """
+    RESULTS[name] = {"value": round(value, 3), "unit": unit}
+    print(f"{name:<40} {value:>14.3f} {unit}")
+
+def per_call(function: Callable[[], None], number: int, repeat: int = 5) -> float:
+    """
+    Return the best time of a function, in nanoseconds per call.
+
+    Args:
+        function (Callable[[], None]): The function to time.
+        number (int): The number of calls of each round.
+        repeat (int): The number of rounds, the fastest one is kept. Defaults to 5.
+    """
+    best = None
+    for _ in range(repeat):
+        started = perf_counter_ns()
+        for _ in range(number):
+            function()
+        elapsed = (perf_counter_ns() - started) / number
+        best = elapsed if best is None or elapsed < best else best
+    return best
+
+def nothing() -> None:
+    pass
+
+def burn(until: float) -> None:
+    """
+    Keep a CPU busy until a monotonic deadline.
+    """
+    while monotonic() < until:
+        pass
+
+def stamp(fired: Value) -> None:
+    """
+    Store the wall clock time of a firing.
+    """
+    fired.value = time()
+
+def bench_timer(number: int) -> None:
+    """
+    Cost per call of `Timer.start/stop`, the decorator and `mark()`.
+    """
+    registry = Registry()
+    empty = per_call(nothing, number)
+
+    timer = Timer()
+    def start_stop():
+        timer.start()
+        timer.stop()
+    report("timer.start_stop", per_call(start_stop, number) - empty, "ns/call")
+
+    def context_manager():
+        with timer:
+            pass
+    report("timer.context_manager", per_call(context_manager, number) - empty, "ns/call")
+
+    decorated = Timer(name="bench", registry=registry)(nothing)
+    report("timer.decorator", per_call(decorated, number) - empty, "ns/call")
+
+    sampled = Timer(name="sampled", registry=registry, sample_rate=0.01)(nothing)
+    report("timer.decorator_sampled", per_call(sampled, number) - empty, "ns/call")
+
+    marked = Timer().start()
+    report("timer.mark", per_call(lambda: marked.mark("mark"), number) - empty, "ns/call")
+    marked.stop()
+
+def bench_wheel(number: int) -> None:
+    """
+    Cost per call of `TimeoutWheel.arm()` and `Timeout.cancel()`, the path of a request that finishes in time.
+    """
+    wheel = TimeoutWheel()
+    empty = per_call(nothing, number)
+    report("wheel.arm_cancel", per_call(lambda: wheel.arm(30).cancel(), number) - empty, "ns/call")
+
+    armed = [wheel.arm(30) for _ in range(number)]
+    started = perf_counter_ns()
+    [timeout.cancel() for timeout in armed]
+    report("wheel.cancel", (perf_counter_ns() - started) / number, "ns/call")
+
+def bench_instrument(number: int) -> None:
+    """
+    Cost per call of a function instrumented by `Instrumenter`, and of the same calls under `cProfile`.
+    """
+    empty = per_call(nothing, number)
+    instrumenter = Instrumenter(sys.modules[__name__], include="*.nothing", registry=Registry()).start()
+    report("instrument.call", per_call(nothing, number) - empty, "ns/call")
+    instrumenter.stop()
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    report("instrument.cprofile_call", per_call(nothing, number) - empty, "ns/call")
+    profiler.disable()
+
+def bench_start(number: int) -> None:
+    """
+    Latency of `HourGlass.start()` and `Alarm.start()` for each backend.
+    """
+    for backend in ("process", "thread", "inline"):
+        latencies = []
+        for _ in range(number):
+            hourglass = HourGlass(seconds=60, backend=backend)
+            started = perf_counter_ns()
+            hourglass.start()
+            latencies.append(perf_counter_ns() - started)
+            hourglass.stop()
+        report(f"hourglass.start.{backend}", min(latencies) / 1000, "us")
+
+        latencies = []
+        for _ in range(number):
+            alarm = Alarm(schedules=[datetime.now() + timedelta(hours=1)], backend=backend)
+            started = perf_counter_ns()
+            alarm.start()
+            latencies.append(perf_counter_ns() - started)
+            alarm.stop()
+        report(f"alarm.start.{backend}", min(latencies) / 1000, "us")
+
+def bench_lateness(load: bool, rounds: int) -> None:
+    """
+    How late `HourGlass` and `Alarm` fire, idle or with every CPU busy.
+
+    Notes:
+        - The firing time is stored by the target in a shared value, so the function runs in the worker process.
+    """
+    label = "loaded" if load else "idle"
+    workers: List[Process] = []
+    if load:
+        workers = [Process(target=burn, args=(monotonic() + 60,), daemon=True) for _ in range(cpu_count())]
+        [worker.start() for worker in workers]
+
+    try:
+        for backend in ("process", "thread"):
+            late = []
+            for _ in range(rounds):
+                fired = Value('d', 0.0)
+                started = time()
+                HourGlass(seconds=0.2, target=stamp, args=(fired,), backend=backend).start().wait()
+                late.append(fired.value - (started + 0.2))
+            report(f"hourglass.late.{backend}.{label}", max(late) * 1000, "ms")
+
+            late = []
+            for _ in range(rounds):
+                fired = Value('d', 0.0)
+                due = datetime.now().replace(microsecond=0) + timedelta(seconds=1)
+                Alarm(schedules=[due], target=stamp, args=(fired,), backend=backend).start().wait()
+                late.append(fired.value - due.timestamp())
+            report(f"alarm.late.{backend}.{label}", max(late) * 1000, "ms")
+    finally:
+        [worker.terminate() for worker in workers]
+
+def bench_idle_alarm(seconds: float) -> None:
+    """
+    CPU use of an armed `Alarm` whose schedule is far away.
+    """
+    alarm = Alarm(schedules=[datetime.now() + timedelta(hours=1)]).start()
+    worker = psProcess(alarm.pid)
+    sleep(0.5)
+    # Let the worker settle after its start
+    before = sum(worker.cpu_times()[:2])
+    sleep(seconds)
+    used = sum(worker.cpu_times()[:2]) - before
+    alarm.stop()
+    report("alarm.idle_cpu", 100 * used / seconds, "%")
+
+def compare(baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Return the results worse than the baseline by more than the tolerance.
+
+    Args:
+        baseline (Dict[str, Dict[str, float]]): The results of a previous run.
+        tolerance (float): The accepted relative increase, e.g. 0.25 for 25%.
+    """
+    regressions = []
+    for name, result in RESULTS.items():
+        previous = baseline.get(name)
+        if previous and previous["value"] > 0 and result["value"] > previous["value"] * (1 + tolerance):
+            regressions.append(f"{name}: {previous['value']} -> {result['value']} {result['unit']}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(description="Measure ptymer's own overhead and timing accuracy.")
+    parser.add_argument("--output", default="benchmarks/results.json", help="where the JSON results are written")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="accepted relative regression (default: 0.25)")
+    parser.add_argument("--quick", action="store_true", help="fewer rounds, for a smoke run")
+    options = parser.parse_args(argv)
+
+    bench_timer(20_000 if options.quick else 200_000)
+    bench_wheel(20_000 if options.quick else 200_000)
+    bench_instrument(20_000 if options.quick else 200_000)
+    bench_start(3 if options.quick else 20)
+    bench_lateness(load=False, rounds=1 if options.quick else 5)
+    bench_lateness(load=True, rounds=1 if options.quick else 5)
+    bench_idle_alarm(1 if options.quick else 5)
+
+    with open(options.output, "w") as file:
+        json.dump({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": python_version(),
+            "platform": platform(),
+            "cpus": cpu_count(),
+            "results": RESULTS,
+        }, file, indent=2)
+    print(f"Results written to {options.output}")
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compare(json.load(file)["results"], options.tolerance)
+        [print(f"Regression: {line}") for line in regressions]
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
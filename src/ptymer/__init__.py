@@ -1,5 +1,15 @@
 from ._hourglass import HourGlass
 from ._timer import Timer
+from ._stats import Registry, REGISTRY
+from ._spans import SpanTree, SPANS
+from ._trace import TraceRecorder
+from ._exporter import MetricsServer, render_metrics
 from ._alarm import Alarm
+from ._recurrence import Every, Cron
+from ._scheduler import Scheduler
+from ._async import AsyncHourGlass, AsyncAlarm
+from ._wheel import TimeoutWheel
+from ._watchdog import Watchdog
+from ._instrument import Instrumenter, instrument
 
-__all__ = ["HourGlass", "Timer", "Alarm"]
\ No newline at end of file
+__all__ = ["HourGlass", "Timer", "Registry", "REGISTRY", "SpanTree", "SPANS", "TraceRecorder", "MetricsServer", "render_metrics", "Alarm", "Every", "Cron", "Scheduler", "AsyncHourGlass", "AsyncAlarm", "TimeoutWheel", "Watchdog", "Instrumenter", "instrument"]
\ No newline at end of file
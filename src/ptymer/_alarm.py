@@ -1,14 +1,25 @@
+from collections import deque
 from datetime import datetime
-from typing import Callable, Any, List, Tuple, Union, Optional
+from typing import Callable, Any, Deque, Dict, Iterable, List, Tuple, Union, Optional
 from dataclasses import dataclass
-from dateutil import parser
-from psutil import Process as psProcess, pid_exists
-from multiprocessing import Process, freeze_support
+from concurrent.futures import Future
+from threading import Lock
+from time import time
+from psutil import Process as psProcess
+from ._scheduler import Scheduler, Handle
+from ._backends import make_backend
+from ._trace import traced, target_name
+from ._recurrence import Recurrence
+from ._schedules import Schedules, Cursor, ScheduleQueue, parse_date, check_misfire
+from ._dispatch import Dispatcher, check_policy, capture, run_function
+
+HISTORY: int = 1000
+# number of the latest futures and misfire reports kept by an alarm, so a recurring alarm runs in constant memory
 
 @dataclass
 class Alarm():
-    schedules: List[Union[datetime, str, Tuple[int, int, int, int, int, int, int]]]
-    # list of datetime objects
+    schedules: Union[List[Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]], Schedules]
+    # list of datetime objects and recurring schedules (`Every`, `Cron`), or compact `Schedules` (see `Alarm.bulk()`)
     target: Optional[Callable] = None
     # function that will be executed when the alarm is triggered
     args: Optional[Tuple[Any]] = None
@@ -17,10 +28,18 @@ class Alarm():
     # defines if the alarm will show messages or not
     keep_schedules: bool = False
     # if true, the alarm will not be elimnated after being triggered
-    __pid: Optional[int] = None
-    # process id of the alarm
-    __process: Optional[Process] = None
-    # process object of the alarm
+    shared: bool = False
+    # if true, the alarm runs in the shared scheduler worker instead of its own process
+    backend: str = "process"
+    # where the alarm loop runs: "process", "thread" or "inline" (driven by the caller through poll())
+    dispatch: str = "suspend"
+    # how the function runs: "suspend" (main process suspended), "concurrent" (in the worker) or "queue" (thread pool of the main process)
+    misfire: str = "coalesce"
+    # what happens to the schedules missed by more than `grace` seconds: "all" (each fires), "coalesce" (they fire once) or "skip"
+    grace: Union[int, float] = 1
+    # lateness in seconds up to which a schedule fires as usual
+    __handle: Optional[Handle] = None
+    # handle of the alarm inside the shared scheduler
 
     def __post_init__(self) -> None:
         """
@@ -33,19 +52,31 @@ class Alarm():
         Raises:
             TypeError: If `schedules` is not a list, if `target` is not a callable function, 
                     if `args` is not a tuple, if `visibility` is not a boolean, if `keep_schedules` 
-                    is not a boolean, or if any schedule entry is not a valid date.
-            ValueError: If `schedules` is empty, if `target` is not defined, or if `args` 
-                        are defined without a target function.
+                    or `shared` is not a boolean, if `backend`, `dispatch` or `misfire` is not a string, if `grace` is not
+                    a number, or if any schedule entry is not a valid date.
+            ValueError: If `schedules` is empty, if `target` is not defined, if `args` 
+                        are defined without a target function, if `backend`, `dispatch` or `misfire` is unknown, if `grace`
+                        is negative, or if a shared alarm does not use the process backend.
 
         Notes:
-            - `schedules` should be a list of dates in `datetime`, `tuple`, or `str` format.
+            - `schedules` should be a list of dates in `datetime`, `tuple`, or `str` format, or of `Recurrence`
+            instances (`Every`, `Cron`), which are kept as they are.
             - `target` should be a callable function.
             - `args` should be a tuple of arguments for the target function.
-            - `visibility` and `keep_schedules` should be boolean values.
+            - `visibility`, `keep_schedules` and `shared` should be boolean values.
+            - `backend` selects the execution backend, stored in `self.__backend`.
+            - `dispatch` selects how the function runs. Only the process backend can suspend the main process, the
+            other backends run it concurrently with `"suspend"` too.
+            - `misfire` and `grace` decide what happens to the schedules the loop reaches late, e.g. on a saturated host
+            (see `ScheduleQueue.due()`). Each schedule missed by more than `grace` seconds is reported in `self.misfires`.
             - The method converts string dates to `datetime` objects and tuple dates to 
-            `datetime` objects, truncating microseconds for `datetime` objects.
+            `datetime` objects, truncating microseconds for `datetime` objects. Strings are parsed with
+            `datetime.fromisoformat()` when possible, and repeated strings only once.
+            - `Schedules` built by `Alarm.bulk()` are already converted and sorted.
         """
-        if not isinstance(self.schedules, list):
+        if isinstance(self.schedules, Schedules) and not self.schedules:
+            raise ValueError("Schedules must be defined!")
+        elif not isinstance(self.schedules, (list, Schedules)):
             raise TypeError("Schedules must be a list!")
         elif not self.schedules:
             raise ValueError("Schedules must be defined!")
@@ -59,32 +90,77 @@ class Alarm():
             raise TypeError("Visibility must be a boolean!")
         elif not isinstance(self.keep_schedules, bool):
             raise TypeError("keep_schedules must be a boolean!")
+        elif not isinstance(self.shared, bool):
+            raise TypeError("Shared must be a boolean!")
+        elif self.shared and self.backend != "process":
+            raise ValueError(f"Only the process backend can be shared! Got {self.backend!r}!")
+        elif not isinstance(self.grace, (int, float)) or isinstance(self.grace, bool):
+            raise TypeError(f"Grace must be a number! Got {type(self.grace)}!")
+        elif self.grace < 0:
+            raise ValueError(f"Grace must not be negative! Got {self.grace}!")
         else:
-            for idx, date_obj in enumerate(self.schedules):
-                try:
-                    assert (type(date_obj) in [datetime, tuple, str])
-                    if type(date_obj) == str:
-                        self.schedules[idx] = parser.parse(date_obj)
-                    elif type(date_obj) == tuple:
-                        self.schedules[idx] = datetime(*date_obj)
-                        # converting tuple(d, h, m, s) to datetime object
-                    elif type(date_obj) == datetime:
-                        self.schedules[idx] = date_obj.replace(microsecond=0)
-                        # truncating microseconds
-                except:
-                    raise TypeError(f"Invalid datetime object: {date_obj}")
-                finally:
-                    pass
+            check_policy(self.dispatch)
+            check_misfire(self.misfire)
+            self.__backend = make_backend(self.backend)
+            self.__dispatcher: Optional[Dispatcher] = None
+            self.__key: Optional[int] = None
+            self.__futures: Deque[Future] = deque(maxlen=HISTORY)
+            self.__misfires: Deque[Tuple[datetime, float, bool, int]] = deque(maxlen=HISTORY)
+            self.__wakeup = self.__backend.event()
+            self.__queue: ScheduleQueue = ScheduleQueue()
+            self.__commands, self.__sender = None, None
+            self.__lock: Lock = Lock()
+            # Guards `self.schedules`, changed by `reschedule()` in the main thread and by the loop of the thread backend
+
+            cache: Dict[str, datetime] = {}
+            for idx, date_obj in enumerate(self.schedules if isinstance(self.schedules, list) else []):
+                if not isinstance(date_obj, Recurrence):
+                    self.schedules[idx] = parse_date(date_obj, cache)
+                # recurring schedules are kept, their occurrences are computed when needed
+
+    @classmethod
+    def bulk(cls, schedules: Iterable[Union[datetime, str, int, float, Tuple[int, ...], Recurrence]], **kwargs) -> "Alarm":
+        """
+        Create an alarm from many schedules.
+
+        Args:
+            schedules (Iterable[Union[datetime, str, int, float, Tuple[int, ...], Recurrence]]): The schedules, from any
+                iterable or generator: dates, ISO-8601 or other date strings, epoch timestamps or recurring schedules.
+            **kwargs: The other fields of the alarm (`target`, `args`, `visibility`...).
+
+        Returns:
+            Alarm: The alarm, not started.
+
+        Raises:
+            TypeError: If `schedules` is not iterable or if one of them is not a valid date.
+
+        Notes:
+            - The dates are stored as a sorted `array('d')` of epoch timestamps (see `Schedules`), and the alarm loop
+            walks it with a single heap entry, so 100k schedules load in a fraction of a second.
+        """
+        return cls(Schedules.load(schedules), **kwargs)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_Alarm__futures"] = deque(maxlen=HISTORY)
+        state["_Alarm__misfires"] = deque(maxlen=HISTORY)
+        state["_Alarm__lock"] = None
+        return state
+        # Futures and locks cannot be pickled, and the worker only reports to the lists of the main process
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__lock = Lock()
 
     def __str__(self) -> str:
-        return f"Class Alarm()\nVisibility: {self.visibility}\nSchedules: {self.args}\nKeep_schedules: {self.keep_schedules}\nProcess id: {self.__pid if self.status else None}"
+        return f"Class Alarm()\nVisibility: {self.visibility}\nSchedules: {self.args}\nKeep_schedules: {self.keep_schedules}\nProcess id: {self.pid if self.status else None}"
     
     def start(self) -> "Alarm":
         """
         Set up the alarm.
 
-        This method initializes and starts the alarm process. It checks if an alarm is already set and 
-        raises an error if so. Otherwise, it starts a new alarm process that runs in the background.
+        This method initializes and starts the alarm worker. It checks if an alarm is already set and 
+        raises an error if so. Otherwise, it starts a new alarm worker that runs in the background.
 
         Returns:
             Alarm: The current instance of the `Alarm` class.
@@ -93,120 +169,428 @@ class Alarm():
             ValueError: If an alarm is already set.
 
         Notes:
-            - This method uses `freeze_support()` to ensure compatibility with Windows.
-            - The alarm process is started as a daemon process.
+            - The alarm loop is launched by the backend: a daemon process, a daemon thread, or nothing for the inline backend.
+            - The schedules are loaded into a `ScheduleQueue`, a min-heap ordered by epoch time, before the worker starts.
+            A recurring schedule has a single entry, its next occurrence, and so do the sorted dates of `Schedules`, through a `Cursor`.
+            - A channel from the backend (a pipe for the process backend) carries the changes of `add_schedule()`,
+            `remove_schedule()` and `reschedule()` to the running loop.
+            - If `self.shared` is `True`, the schedules are submitted to the shared `Scheduler` instead.
         """
         from os import getpid
 
-        freeze_support()
-        # Freeze support for windows
-
         if self.status:
             raise RuntimeError("Alarm already set!")
+        elif self.shared:
+            if isinstance(self.schedules, Schedules):
+                first = self.schedules.pending(time() - 1)
+                schedules = self.schedules.epochs[first:].tolist() + self.schedules.rules
+            else:
+                schedules = [date if isinstance(date, Recurrence) else date.timestamp() for date in self.schedules]
+            self._register()
+            self.__handle = Scheduler.shared()._submit("alarm", schedules, self.target, self.args, self.visibility,
+                                                       self.dispatch, self.__key, self.misfire, self.grace)
+
+            print("Alarm started!") if self.visibility else None
+            return self
         else:
-            process = Process(target=self._alarm_loop, args=(getpid(),), daemon=True)
-            process.start()
-            self.__pid = process.pid
-            self.__process = process
+            self.__wakeup = self.__backend.event()
+            # Event identifying the run of the alarm loop (set to stop it)
+            self.__commands, self.__sender = self.__backend.channel()
+
+            now = time()
+            self.__queue = ScheduleQueue()
+            if isinstance(self.schedules, list) and not self.keep_schedules:
+                with self.__lock:
+                    self.schedules.sort(key=lambda date: (1, 0) if isinstance(date, Recurrence) else (0, date.timestamp()))
+            # The dates fire in order, so the one to remove is found first, the recurring schedules come last
+            if isinstance(self.schedules, Schedules):
+                position = self.schedules.pending(now - 1)
+                self.schedules.drop_until(position) if not self.keep_schedules else None
+                # The dates whose second has passed are never triggered
+                self.__queue.walk(Cursor(self.schedules.epochs[position:]))
+            for date in (self.schedules.rules if isinstance(self.schedules, Schedules) else list(self.schedules)):
+                epoch = self._first_epoch(date, now)
+                if epoch is not None:
+                    self.__queue.push(epoch, date)
+                elif not self.keep_schedules and not isinstance(date, Recurrence):
+                    self.schedules.remove(date)
+                # Like the sorted dates, a date whose second has passed is never triggered
+
+            self._register()
+            # The worker sends the key of the callbacks to the main process when the alarm is triggered
+
+            self.__backend.launch(self._alarm_loop, (getpid(), self.__wakeup, self.__queue, self.__commands))
             
             print("Alarm started!") if self.visibility else None
             return self
         
-    @staticmethod
-    def _run_function(target, args, visibility) -> any:
+    _run_function = staticmethod(run_function)
+    # Runs the function of the alarm, overridden by the async alarm to schedule coroutines
+        
+    def _alarm_loop(self, mainPid: int, wakeup, queue: ScheduleQueue, commands) -> None:
         """
-        Execute the stored function with its arguments.
+        Run the alarm loop.
+
+        This function sleeps until the earliest schedule of the heap is due and triggers the alarm
+        at the specified times.
 
-        This method attempts to run the function stored in `self.target` with the arguments stored in `self.args`.
-        If no arguments are provided, the function is called without arguments.
+        Args:
+            mainPid (int): The process ID of the main process to be monitored.
+            wakeup (Event): The wake-up event of the run, set to stop the loop.
+            queue (ScheduleQueue): The pending schedules of the run.
+            commands (Connection): The channel where the changes of the schedules are received.
 
         Returns:
-            any: The return value of the executed function, or `None` if no function is stored. If an exception occurs, 
-            it returns the exception message as a string.
+            None
 
         Raises:
-            Exception: If an error occurs during the function execution, the exception is caught and its message is printed
+            ValueError: If `mainPid` is not a valid process ID.
 
         Notes:
-            - If `self.target` is `None`, the method returns `None`.
-            - If `self.args` is `None`, the function is called without arguments.
-        """
-        try:
-            if target and args:
-                value = target(*args)
-            elif target and not args:
-                value = target()
-            else:
-                value = None
-        except Exception as e:
-            print(f"Error ocurred:\n{e}")
-            return str(e)
+            - The loop blocks on `commands.poll()` with a timeout equal to the time left until the
+            earliest schedule, so an idle alarm does not consume CPU and wakes up as soon as its schedules change.
+            A `halt` command, sent by `stop()`, ends the loop.
+            - The function stops running when there are no more schedules or if the main process no longer exists.
+        """
+        key = self.__key
+        while self.__wakeup is wakeup:
+            delay = self._fire_due(mainPid, queue)
+            if delay is None and not commands.poll(0):
+                self.__dispatcher.release(key)
+                break
+            if commands.poll(delay) and not self._apply(queue, commands):
+                break
+
+    def _apply(self, queue: ScheduleQueue, commands) -> bool:
+        """
+        Apply the pending changes of the schedules to the queue of the run.
+
+        Args:
+            queue (ScheduleQueue): The pending schedules of the run.
+            commands (Connection): The channel where the changes are received.
+
+        Returns:
+            bool: `False` if the loop must stop, `True` otherwise.
+
+        Notes:
+            - Each change is an `("edit", removed, added)` command, where either schedule may be `None`, applied
+            in O(log n): an added schedule is pushed into the heap and a removed one is cancelled.
+        """
+        while commands.poll(0):
+            command = commands.recv()
+            if command[0] == "halt":
+                return False
+            _, removed, added = command
+            queue.remove(removed) if removed is not None else None
+            epoch = self._first_epoch(added, time()) if added is not None else None
+            queue.push(epoch, added) if epoch is not None else None
+        return True
+
+    def _fire_due(self, mainPid: int, queue: ScheduleQueue) -> Optional[float]:
+        """
+        Trigger the alarm for every due schedule of the heap.
+
+        Args:
+            mainPid (int): The process ID of the main process.
+            queue (ScheduleQueue): The pending schedules.
+
+        Returns:
+            Optional[float]: The time in seconds until the earliest pending schedule, or `None` if there are no more schedules.
+
+        Notes:
+            - Every schedule at or before the current time is due. One late by more than `self.grace` seconds is
+            handled according to `self.misfire`, and reported to the main process by `_missed()`. The occurrences a
+            recurring schedule missed are reported once, with their count.
+            - The alarm function is run by `_fire()`, according to `self.dispatch`.
+            - If `self.keep_schedules` is `False`, a date is removed once due, whether it fired or not, by `_consume()`.
+            - A recurring schedule is pushed back into the heap at its next occurrence, and removed only once it has ended.
+            - If a `TraceRecorder` is started, the run of the function is recorded as a complete event.
+        """
+        while True:
+            now = time()
+            for epoch, date, fires, count in queue.due(now, self.misfire, self.grace):
+                if fires:
+                    print("Alarm triggered!") if self.visibility else None
+                    self._fire(mainPid)
+                if now - epoch > self.grace:
+                    self._missed(epoch, now - epoch, fires, count)
+
+                ended = not isinstance(date, Recurrence) or date not in queue.live
+                self._consume(date) if not self.keep_schedules and ended else None
+                # A recurring schedule is removed once it has ended
+
+            epoch = queue.peek()
+            if epoch is None:
+                return None
+            elif epoch > time():
+                return epoch - time()
+            # Schedules that became due while the function ran are handled at once
+
+    def _consume(self, date: Union[datetime, Recurrence]) -> None:
+        """
+        Remove a schedule that will not fire anymore from `self.schedules`.
+
+        Notes:
+            - The dates of `Schedules` and the sorted dates of a list fire in order, so the removed date is the first
+            one: `Schedules` only moves its start forward, a list finds it at once.
+            - Runs under the lock of `reschedule()`, and a schedule it removed meanwhile is skipped.
+        """
+        with self.__lock:
+            try:
+                self.schedules.remove(date)
+            except ValueError:
+                pass
+
+    def _missed(self, epoch: float, late: float, fired: bool, count: int = 1) -> None:
+        """
+        Report a schedule missed by more than the grace period.
+
+        Args:
+            epoch (float): The epoch timestamp of the schedule.
+            late (float): How late the loop reached it, in seconds.
+            fired (bool): Whether the alarm fired for it anyway (policies `"all"` and `"coalesce"`).
+            count (int): The number of occurrences of a recurring schedule missed from `epoch`. Defaults to 1.
+        """
+        print(f"Alarm missed {datetime.fromtimestamp(epoch)} by {late:.3f} seconds!") if self.visibility else None
+        self.__dispatcher.misfire(self.__key, (epoch, late, fired, count))
+
+    def _fire(self, mainPid: int) -> None:
+        """
+        Run the alarm function according to the dispatch policy.
+
+        Args:
+            mainPid (int): The process ID of the main process.
+
+        Notes:
+            - With the `"queue"` policy, the function is sent to the thread pool of the main process.
+            - With the `"suspend"` policy, if the backend runs the loop in another process, the main process is
+            suspended, the alarm function is executed, and then the main process is resumed.
+            - Otherwise the function runs in the current thread, without suspending anything.
+        """
+        if self.dispatch == "queue":
+            self.__dispatcher.queue(self.__key)
+        elif self.dispatch == "suspend" and self.__backend.suspends:
+            process = psProcess(mainPid)
+            process.suspend()
+            outcome = capture(self._dispatched)
+            process.resume()
+            self.__dispatcher.complete(self.__key, outcome)
         else:
-            return value
-        
-    def _alarm_loop(self, mainPid: int) -> None:
+            self.__dispatcher.complete(self.__key, capture(self._dispatched))
+        # The outcome of the function goes back to the futures of the main process
+
+    def _dispatched(self) -> Any:
         """
-        Run the alarm loop.
+        Run the alarm function.
 
-        This function monitors the schedules and triggers the alarm at the specified times.
-        It suspends and resumes the main process around the execution of the alarm function.
+        Returns:
+            any: The return value of the function.
+
+        Raises:
+            Exception: The exception raised by the function, once printed.
+
+        Notes:
+            - If a `TraceRecorder` is started, the run of the function is recorded as a complete event.
+        """
+        with traced(target_name("Alarm", self.target), "alarm"):
+            return self._run_function(self.target, self.args, True)
+
+    def _register(self) -> None:
+        """
+        Register the callbacks of the run in the `Dispatcher` of the main process.
+        """
+        self.__futures, self.__misfires = deque(maxlen=HISTORY), deque(maxlen=HISTORY)
+        self.__dispatcher = Dispatcher.shared()
+        self.__key = self.__dispatcher.register(self._dispatched, self._complete, self._misfired,
+                                                remote=self.__backend.suspends and not self.shared)
+        # A worker process gets a pipe of its own, the shared scheduler sends through its events pipe instead
+
+    def _complete(self, future: Future) -> None:
+        """
+        Store the future of a firing, in the main process, dropping the oldest one beyond `HISTORY`.
+        """
+        self.__futures.append(future)
+
+    def _misfired(self, report: Tuple[float, float, bool, int]) -> None:
+        """
+        Store the report of a missed schedule, in the main process, dropping the oldest one beyond `HISTORY`.
+        """
+        epoch, late, fired, count = report
+        self.__misfires.append((datetime.fromtimestamp(epoch), late, fired, count))
+
+    @property
+    def futures(self) -> List[Future]:
+        """
+        Return the futures of the firings of the last run.
+
+        Returns:
+            List[Future]: One `concurrent.futures.Future` per firing, in the order the main process learns about them,
+            with the return value or the exception of the function.
+
+        Notes:
+            - With the `"queue"` policy a future is added when the function is submitted to the thread pool, otherwise
+            once the function has returned. With the process backend, the return value or the exception is pickled
+            and sent to the main process, unless it is `None`.
+            - Only the latest `HISTORY` futures are kept, so a recurring alarm does not hold every result it produced.
+        """
+        return list(self.__futures)
+
+    @property
+    def misfires(self) -> List[Tuple[datetime, float, bool, int]]:
+        """
+        Return the schedules missed by more than the grace period during the last run.
+
+        Returns:
+            List[Tuple[datetime, float, bool, int]]: For each missed schedule, its date, how late the alarm loop reached
+            it in seconds, whether the alarm fired for it anyway, and the number of occurrences it stands for (the
+            occurrences a recurring schedule missed in a row are reported once, from the first one).
+
+        Notes:
+            - Only the latest `HISTORY` reports are kept.
+        """
+        return list(self.__misfires)
+
+    @staticmethod
+    def _first_epoch(date: Union[datetime, Recurrence], now: float) -> Optional[float]:
+        """
+        Return the epoch timestamp of the first occurrence of a schedule.
 
         Args:
-            mainPid (int): The process ID of the main process to be monitored.
+            date (Union[datetime, Recurrence]): The schedule.
+            now (float): The current epoch timestamp.
 
         Returns:
-            None
+            Optional[float]: The timestamp, or `None` if a recurring schedule has ended or a date has passed. An
+            occurrence inside the current second is kept.
+        """
+        if isinstance(date, Recurrence):
+            return date.next_after(now - 1)
+        epoch = date.timestamp()
+        return epoch if epoch > now - 1 else None
+
+    def poll(self) -> Optional[float]:
+        """
+        Drive an alarm that uses the inline backend.
+
+        This method triggers the alarm for every due schedule and returns how long the caller may sleep
+        before polling again.
+
+        Returns:
+            Optional[float]: The time in seconds until the next schedule, or `None` if the alarm is not set
+            (including when its last schedule was just triggered).
 
         Raises:
-            ValueError: If `mainPid` is not a valid process ID.
+            RuntimeError: If the alarm does not use the inline backend.
 
         Notes:
-            - The function continuously checks the current time against scheduled alarm times.
-            - When the current time matches a scheduled time, the main process is suspended, the alarm function is executed, and then the main process is resumed.
-            - If `self.keep_schedules` is `False`, the schedule is removed after the alarm is triggered.
-            - The function stops running when there are no more schedules or if the main process no longer exists.
+            - The alarm function runs in the thread that calls `poll()`.
         """
-        process = psProcess(mainPid)
-        lastIdx = None
+        from os import getpid
 
-        while len(self.schedules) > 0:
-            now = datetime.now().replace(microsecond=0)
-            try:
-                idx = self.schedules.index(now)
-            except:
-                continue # if the current time is not in the schedules, it continues the loop
-            else:
-                if idx != lastIdx: # this is due the speed of the loop, sometimes it triggers the same alarm twice (or much more)
-                    print("Alarm triggered!") if self.visibility else None
+        if self.backend != "inline":
+            raise RuntimeError(f"Only inline alarms can be polled! Got {self.backend!r} backend!")
+        elif not self.status:
+            return None
+        elif not self._apply(self.__queue, self.__commands):
+            return None
+        else:
+            delay = self._fire_due(getpid(), self.__queue)
+            if delay is None:
+                self.__backend.terminate()
+                self.__dispatcher.release(self.__key)
+            return delay
+
+    def add_schedule(self, schedule: Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]) -> None:
+        """
+        Add a schedule, to a running alarm too.
+
+        Args:
+            schedule (Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]): The schedule.
+
+        Raises:
+            TypeError: If `schedule` is not a valid date.
+
+        Notes:
+            - See `reschedule()`.
+        """
+        self.reschedule(None, schedule)
+
+    def remove_schedule(self, schedule: Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]) -> None:
+        """
+        Remove a schedule, from a running alarm too.
+
+        Args:
+            schedule (Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]): The schedule.
+
+        Raises:
+            TypeError: If `schedule` is not a valid date.
+            ValueError: If `schedule` is not in `self.schedules`.
+
+        Notes:
+            - See `reschedule()`.
+        """
+        self.reschedule(schedule, None)
+
+    def reschedule(self,
+                   old: Optional[Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]],
+                   new: Optional[Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]]) -> None:
+        """
+        Replace a schedule by another one, in a running alarm too.
+
+        Args:
+            old (Optional[Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]]): The schedule to remove, or `None`.
+            new (Optional[Union[datetime, str, Tuple[int, int, int, int, int, int, int], Recurrence]]): The schedule to add, or `None`.
 
-                    process.suspend()
-                    self._run_function(self.target, self.args, self.visibility)
-                    process.resume()
+        Raises:
+            TypeError: If a schedule is not a valid date.
+            ValueError: If `old` is not in `self.schedules`.
 
-                    lastIdx = idx
-                    if not self.keep_schedules:
-                        self.schedules.pop(idx)  
-        self.__pid = None
+        Notes:
+            - `self.schedules` is updated at once. If the alarm is running, the change is sent to its loop in a
+            single command, through the channel of its backend or through the shared `Scheduler`, and takes effect
+            in O(log n) without restarting the worker. A recurring schedule is matched by its definition.
+            - Removing a schedule that already fired and is only kept by `keep_schedules` does not affect the loop.
+        """
+        old = old if old is None or isinstance(old, Recurrence) else parse_date(old)
+        new = new if new is None or isinstance(new, Recurrence) else parse_date(new)
+        with self.__lock:
+            if old is not None and old not in self.schedules:
+                raise ValueError(f"{old} not in schedules")
+            self.schedules.remove(old) if old is not None else None
+            if new is not None:
+                self.schedules.add(new) if isinstance(self.schedules, Schedules) else self.schedules.append(new)
+        # Under the lock of `_consume()`, so the loop of the thread backend never removes a date in between
+
+        if self.status and self.shared:
+            self.__handle.edit(*(date if date is None or isinstance(date, Recurrence) else date.timestamp() for date in (old, new)))
+        elif self.status:
+            self.__sender.send(("edit", old, new))
+        print("Alarm rescheduled!") if self.visibility else None
     
     def stop(self) -> None:
         """
         Stop the alarm.
 
-        This method terminates the alarm process if it is currently running. If no alarm is set,
+        This method terminates the alarm worker if it is currently running. If no alarm is set,
         it raises an error.
 
         Raises:
             RuntimeError: If no alarm is currently set.
 
         Notes:
-            - The method checks if the alarm process exists and terminates it if so.
+            - The method sets the wake-up event of the alarm worker and sends it a `halt` command, which ends its loop,
+            and then terminates it.
             - If `self.visibility` is `True`, it prints a message indicating that the alarm has stopped.
         """
-        if self.status:
-            process = psProcess(self.__pid)
-            process.terminate()
-            self.__pid = None
-            self.__process = None
+        if self.status and self.shared:
+            self.__handle.cancel()
+            self.__handle = None
+            self.__dispatcher.release(self.__key)
+        elif self.status:
+            self.__wakeup.set()
+            self.__sender.send(("halt",))
+            self.__backend.terminate()
+            self.__dispatcher.release(self.__key)
         else:
             raise RuntimeError("Alarm not set!")
         
@@ -231,8 +615,10 @@ class Alarm():
         """
         if not self.status:
             raise AttributeError(f"There is no alarm running!")
+        elif self.shared:
+            return self.__handle.pid
         else:
-            return int(self.__pid)
+            return self.__backend.pid
 
     @property
     def status(self) -> bool:
@@ -246,28 +632,38 @@ class Alarm():
 
         Notes:
             - The method checks if the process ID is set and if the process exists.
+            - If the alarm is shared, it checks if its handle is still pending inside the `Scheduler`.
         """
-        if self.__pid and pid_exists(self.__pid):
-            return True
+        if self.shared:
+            return self.__handle is not None and self.__handle.active
         else:
-            return False
+            return self.__backend.alive
 
     def wait(self) -> None:
         """
         Wait for the alarm to finish.
 
-        This method waits for the alarm process to finish before returning.
+        This method waits for the alarm worker to finish before returning.
 
         Returns:
             None
 
         Notes:
-            - The method uses the `join()` method of the alarm process.
+            - The method uses the `join()` method of the alarm worker.
+            - If the alarm is shared, it waits for its handle inside the `Scheduler`.
+            - If the alarm uses the inline backend, it drives the alarm with `poll()` in the calling thread.
         """
-        if self.status:
-            self.__process.join()
-        else:
+        if not self.status:
             raise RuntimeError("Alarm not set!")
+        elif self.shared:
+            self.__handle.wait()
+        elif self.backend == "inline":
+            delay = self.poll()
+            while delay is not None and not self.__wakeup.is_set():
+                self.__commands.poll(delay)
+                delay = self.poll()
+        else:
+            self.__backend.join()
         
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,203 @@
+from typing import Callable, Optional, Union, Any
+from dataclasses import dataclass, field
+from asyncio import AbstractEventLoop, Future, Task, TimerHandle, get_running_loop, gather
+from concurrent.futures import Future as ConcurrentFuture
+from inspect import iscoroutine
+from ._dispatch import settle
+from ._hourglass import HourGlass
+from ._alarm import Alarm
+
+class _LoopDriver:
+    """
+    Drive an inline `HourGlass` or `Alarm` from the running asyncio event loop.
+
+    Notes:
+        - The owner uses the inline backend: no thread nor process is created, `poll()` is called
+        by the loop through `call_soon`/`call_later` at the next due time.
+        - If `target` is a coroutine function, its coroutine is scheduled as a task of the loop, and the future
+        of the firing holds the result or the exception of the coroutine, once the task is done.
+        - The owner uses the `"suspend"` dispatch policy, which runs the function inline, in the thread of the loop:
+        `create_task()` is not thread-safe, so the function is never handed to the thread pool of the `Dispatcher`.
+    """
+
+    def start(self) -> Any:
+        """
+        Start the timer on the running event loop.
+
+        Returns:
+            The current instance.
+
+        Raises:
+            RuntimeError: If there is no running event loop, or if the timer is already running.
+        """
+        loop = get_running_loop()
+        super().start()
+
+        self.__loop: AbstractEventLoop = loop
+        self.__done: Future = loop.create_future()
+        self.__callbacks: set = set()
+        self.__timer: TimerHandle = loop.call_soon(self._drive)
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the timer and cancel its next wake-up on the event loop.
+
+        Raises:
+            RuntimeError: If the timer is not running.
+        """
+        super().stop()
+        self.__timer.cancel()
+        self._settle()
+
+    async def wait(self) -> None:
+        """
+        Wait for the timer to finish, including the coroutines started by its function.
+
+        Raises:
+            RuntimeError: If the timer is not running.
+        """
+        if not self.status:
+            raise RuntimeError(f"{type(self).__name__} not set!")
+        else:
+            await self.__done
+            if self.__callbacks:
+                await gather(*self.__callbacks, return_exceptions=True)
+            # Their errors are held by the futures of the firings
+
+    def _drive(self) -> None:
+        """
+        Poll the timer and schedule the next poll at its next due time.
+        """
+        delay = self.poll()
+        if delay is None:
+            self._settle()
+        else:
+            self.__timer = self.__loop.call_later(delay, self._drive)
+
+    def _reschedule(self) -> None:
+        """
+        Poll the timer again as soon as possible, after its due time changed.
+
+        Notes:
+            - The due time may be changed from another thread, so the loop is woken up thread-safely, and the pending
+            wake-up is cancelled and replaced by the loop itself, never concurrently with `_drive()`.
+        """
+        self.__loop.call_soon_threadsafe(self._redrive)
+
+    def _redrive(self) -> None:
+        """
+        Cancel the pending wake-up and poll the timer, in the thread of the loop.
+        """
+        if not self.__done.done():
+            self.__timer.cancel()
+            self._drive()
+
+    def _settle(self) -> None:
+        """
+        Release the coroutines waiting for the timer.
+        """
+        if not self.__done.done():
+            self.__done.set_result(None)
+
+    def _run_function(self, target, args, raises: bool = False) -> Any:
+        """
+        Execute the stored function and schedule its coroutine, if it returns one.
+
+        Returns:
+            any: The return value of the function, or the scheduled `asyncio.Task` if it is a coroutine function.
+        """
+        value = super()._run_function(target, args, raises)
+        if iscoroutine(value):
+            value = self.__loop.create_task(self._await_function(value))
+            self.__callbacks.add(value)
+            value.add_done_callback(self.__callbacks.discard)
+        return value
+
+    def _complete(self, future: ConcurrentFuture) -> None:
+        """
+        Pass the future of a firing to the timer, or the future of its coroutine if it scheduled one.
+        """
+        value = future.result() if future.done() and not future.cancelled() and future.exception() is None else None
+        if not isinstance(value, Task) or value not in self.__callbacks:
+            super()._complete(future)
+            return
+
+        outcome = ConcurrentFuture()
+        def copy(task: Task) -> None:
+            if task.cancelled():
+                outcome.cancel()
+            else:
+                settle(outcome, (False, task.exception()) if task.exception() is not None else (True, task.result()))
+        value.add_done_callback(copy)
+        super()._complete(outcome)
+
+    @staticmethod
+    async def _await_function(coroutine) -> Any:
+        """
+        Await the coroutine of an async function.
+
+        Returns:
+            any: The return value of the coroutine.
+
+        Raises:
+            Exception: The exception raised by the coroutine, once printed.
+        """
+        try:
+            return await coroutine
+        except Exception as e:
+            print(f"Error ocurred:\n{e}")
+            raise
+
+
+class AsyncHourGlass(_LoopDriver, HourGlass):
+    def __init__(self,
+                 seconds: Union[int, float],
+                 target: Optional[Callable] = None,
+                 args: Optional[tuple] = None,
+                 visibility: bool = False) -> None:
+        """
+        Initialize an hourglass driven by the running asyncio event loop.
+
+        Args:
+            seconds (Union[int, float]): The duration of the timer in seconds. Must be a positive number, fractions of a second are allowed.
+            target (Optional[Callable]): A function or coroutine function to be executed when the timer ends. Default is None.
+            args (Optional[tuple]): A tuple of arguments to pass to the target function. Default is None.
+            visibility (bool): Determines if messages should be displayed. Default is False.
+
+        Raises:
+            TypeError: If `visibility` is not a boolean, if `seconds` is not numeric, if `target` is not a callable or if `args` is not a tuple.
+            ValueError: If `seconds` is not greater than 0, or if `args` are defined without a target function.
+
+        Notes:
+            - The validation, `remaining_time`, `remaining_seconds` and `status` are the ones of `HourGlass`,
+            with the inline backend.
+            - `start()` must be called from a coroutine, and `wait()` must be awaited.
+        """
+        super().__init__(seconds, target=target, args=args, visibility=visibility, backend="inline")
+
+    def _wake(self) -> None:
+        super()._wake()
+        self._reschedule()
+        # Wake up the loop at the new deadline
+
+
+@dataclass
+class AsyncAlarm(_LoopDriver, Alarm):
+    # Alarm driven by the running asyncio event loop: `start()` must be called from a coroutine,
+    # `wait()` must be awaited and `target` may be a coroutine function
+    shared: bool = field(default=False, init=False)
+    # an async alarm is never shared
+    backend: str = field(default="inline", init=False)
+    # an async alarm is driven by the event loop through the inline backend
+    dispatch: str = field(default="suspend", init=False)
+    # the function runs in the thread of the event loop, where its coroutine can be scheduled, never in the thread pool
+
+    def reschedule(self, old, new) -> None:
+        super().reschedule(old, new)
+        if self.status:
+            self._reschedule()
+        # Wake up the loop to apply the change
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,315 @@
+from typing import Any, Callable, Optional, Union, Dict, Tuple, Type
+from collections import deque
+from multiprocessing import Process, Value, Pipe, Event as ProcessEvent, freeze_support
+from multiprocessing.connection import Connection
+from threading import Thread, Condition, Event as ThreadEvent
+from psutil import Process as psProcess, NoSuchProcess, pid_exists
+
+class LocalValue:
+    def __init__(self, value: Union[int, float]) -> None:
+        """
+        Initialize a value shared by the threads of the current process.
+
+        Args:
+            value (Union[int, float]): The initial value.
+
+        Notes:
+            - Mirrors the `value` attribute of `multiprocessing.Value`, without shared memory nor lock,
+            since reading and writing a Python attribute is already atomic between threads.
+        """
+        self.value: Union[int, float] = value
+
+
+class LocalChannel:
+    def __init__(self) -> None:
+        """
+        Initialize a channel between the threads of the current process.
+
+        Notes:
+            - Mirrors `poll()`, `send()` and `recv()` of the two ends of a `multiprocessing.Pipe`, over a `deque`.
+            The same object is both ends.
+        """
+        self.__items: deque = deque()
+        self.__ready: Condition = Condition()
+
+    def send(self, item: Any) -> None:
+        """
+        Send an item to the other end.
+        """
+        with self.__ready:
+            self.__items.append(item)
+            self.__ready.notify()
+
+    def recv(self) -> Any:
+        """
+        Receive the oldest item sent.
+        """
+        return self.__items.popleft()
+
+    def poll(self, timeout: Optional[float] = 0) -> bool:
+        """
+        Wait until an item is available, or for `timeout` seconds (`None` waits forever).
+
+        Returns:
+            bool: `True` if an item is available.
+        """
+        if self.__items or timeout == 0:
+            return bool(self.__items)
+        with self.__ready:
+            return self.__ready.wait_for(lambda: self.__items, timeout)
+
+
+class ProcessBackend:
+    name: str = "process"
+    # name used to select the backend
+
+    suspends: bool = True
+    # the worker runs in another process, so it can suspend the main process around callbacks
+
+    def __init__(self) -> None:
+        """
+        Initialize the process backend.
+
+        Notes:
+            - The worker runs in a daemon `multiprocessing.Process`, isolated from the main process.
+            - Under the `spawn` start method the owner of the worker (including `target` and `args`) is pickled.
+        """
+        self.__pid: Optional[int] = None
+        self.__process: Optional[Process] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state[f"_{ProcessBackend.__name__}__process"] = None
+        return state
+        # A process object cannot be pickled, the child does not need it anyway
+
+    @staticmethod
+    def event() -> ProcessEvent:
+        """
+        Return an event shared with the worker.
+        """
+        return ProcessEvent()
+
+    @staticmethod
+    def value(typecode: str, value: Union[int, float]) -> Value:
+        """
+        Return a value shared with the worker.
+
+        Args:
+            typecode (str): The `ctypes` type code of the value.
+            value (Union[int, float]): The initial value.
+        """
+        return Value(typecode, value, lock=True)
+
+    @staticmethod
+    def channel() -> Tuple[Connection, Connection]:
+        """
+        Return the receiving and sending ends of a channel from the main process to the worker.
+        """
+        return Pipe(duplex=False)
+
+    def launch(self, target: Callable, args: tuple) -> None:
+        """
+        Start the worker.
+
+        Args:
+            target (Callable): The loop executed by the worker.
+            args (tuple): The arguments of the loop.
+
+        Notes:
+            - This method uses `freeze_support()` to ensure compatibility with Windows.
+        """
+        freeze_support()
+        # Freeze support for Windows
+
+        process = Process(target=target, args=args, daemon=True)
+        process.start()
+        self.__pid = process.pid
+        self.__process = process
+
+    def terminate(self) -> None:
+        """
+        Terminate the worker.
+        """
+        try:
+            psProcess(self.__pid).terminate()
+        except NoSuchProcess:
+            pass
+        # The worker may have already ended by itself
+        self.__pid = None
+        self.__process = None
+
+    def join(self) -> None:
+        """
+        Block until the worker ends.
+        """
+        self.__process.join()
+
+    @property
+    def alive(self) -> bool:
+        """
+        Check if the worker is running.
+        """
+        return bool(self.__pid and pid_exists(self.__pid))
+
+    @property
+    def pid(self) -> int:
+        """
+        Return the process ID of the worker.
+        """
+        return int(self.__pid)
+
+
+class ThreadBackend:
+    name: str = "thread"
+    # name used to select the backend
+
+    suspends: bool = False
+    # the worker is a thread of the main process, suspending it would suspend the worker too
+
+    def __init__(self) -> None:
+        """
+        Initialize the thread backend.
+
+        Notes:
+            - The worker runs in a daemon `threading.Thread` of the main process: it starts in microseconds,
+            nothing is pickled and the memory is shared for free.
+            - A thread cannot be killed, so `terminate()` only detaches it. The loop of the owner must
+            return when its wake-up event is set.
+        """
+        self.__thread: Optional[Thread] = None
+
+    @staticmethod
+    def event() -> ThreadEvent:
+        """
+        Return an event shared with the worker.
+        """
+        return ThreadEvent()
+
+    @staticmethod
+    def value(typecode: str, value: Union[int, float]) -> LocalValue:
+        """
+        Return a value shared with the worker.
+
+        Args:
+            typecode (str): Ignored, kept for compatibility with `ProcessBackend.value()`.
+            value (Union[int, float]): The initial value.
+        """
+        return LocalValue(value)
+
+    @staticmethod
+    def channel() -> Tuple[LocalChannel, LocalChannel]:
+        """
+        Return the receiving and sending ends of a channel to the worker, which are the same `LocalChannel`.
+        """
+        channel = LocalChannel()
+        return channel, channel
+
+    def launch(self, target: Callable, args: tuple) -> None:
+        """
+        Start the worker.
+
+        Args:
+            target (Callable): The loop executed by the worker.
+            args (tuple): The arguments of the loop.
+        """
+        thread = Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self.__thread = thread
+
+    def terminate(self) -> None:
+        """
+        Detach the worker, which ends by itself once its loop is woken up.
+        """
+        self.__thread = None
+
+    def join(self) -> None:
+        """
+        Block until the worker ends.
+        """
+        self.__thread.join()
+
+    @property
+    def alive(self) -> bool:
+        """
+        Check if the worker is running.
+        """
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def pid(self) -> int:
+        """
+        Return the process ID hosting the worker, which is the current process.
+        """
+        from os import getpid
+
+        return getpid()
+
+
+class InlineBackend(ThreadBackend):
+    name: str = "inline"
+    # name used to select the backend
+
+    def __init__(self) -> None:
+        """
+        Initialize the inline backend.
+
+        Notes:
+            - There is no worker: the owner is armed by `launch()` and driven by the caller, which calls
+            its `poll()` method from its own event loop.
+            - Callbacks run in the thread that calls `poll()`.
+        """
+        self.__armed: bool = False
+
+    def launch(self, target: Callable, args: tuple) -> None:
+        """
+        Arm the owner, `target` is not executed.
+        """
+        self.__armed = True
+
+    def terminate(self) -> None:
+        """
+        Disarm the owner.
+        """
+        self.__armed = False
+
+    def join(self) -> None:
+        """
+        Do nothing, the owner is driven by the caller.
+        """
+        pass
+
+    @property
+    def alive(self) -> bool:
+        """
+        Check if the owner is armed.
+        """
+        return self.__armed
+
+
+BACKENDS: Dict[str, Type[ProcessBackend]] = {backend.name: backend for backend in (ProcessBackend, ThreadBackend, InlineBackend)}
+# available backends, indexed by name
+
+def make_backend(name: str) -> Union[ProcessBackend, ThreadBackend, InlineBackend]:
+    """
+    Create the execution backend selected by `name`.
+
+    Args:
+        name (str): `"process"`, `"thread"` or `"inline"`.
+
+    Returns:
+        Union[ProcessBackend, ThreadBackend, InlineBackend]: A new backend instance.
+
+    Raises:
+        TypeError: If `name` is not a string.
+        ValueError: If `name` is not an available backend.
+    """
+    if not isinstance(name, str):
+        raise TypeError(f"Backend must be a string! Got {type(name)}!")
+    elif name not in BACKENDS:
+        raise ValueError(f"Backend must be one of {list(BACKENDS)}! Got {name!r}!")
+    else:
+        return BACKENDS[name]()
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,333 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection, wait
+from os import getpid
+from threading import Lock, Thread
+from pickle import PicklingError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+POLICIES: Tuple[str, ...] = ("suspend", "concurrent", "queue")
+# how the function of a timer is run when it fires:
+#   "suspend": in the worker, with the main process suspended (the worker of the process backend only)
+#   "concurrent": in the worker, while the main process keeps running
+#   "queue": in the main process, on the thread pool of its `Dispatcher`
+
+def check_policy(dispatch: str) -> str:
+    """
+    Validate a dispatch policy.
+
+    Args:
+        dispatch (str): The policy, one of `POLICIES`.
+
+    Returns:
+        str: The policy.
+
+    Raises:
+        TypeError: If `dispatch` is not a string.
+        ValueError: If `dispatch` is not a known policy.
+    """
+    if not isinstance(dispatch, str):
+        raise TypeError(f"Dispatch must be a string! Got {type(dispatch)}!")
+    elif dispatch not in POLICIES:
+        raise ValueError(f"Unknown dispatch policy {dispatch!r}! Choose one of {', '.join(POLICIES)}.")
+    else:
+        return dispatch
+
+
+def run_function(target: Optional[Callable[..., Any]], args: Optional[tuple], raises: bool = False) -> Any:
+    """
+    Run the function of a timer with its arguments.
+
+    Args:
+        target (Optional[Callable[..., Any]]): The function, or None.
+        args (Optional[tuple]): Its arguments, or None to call it without arguments.
+        raises (bool): If True, an exception is raised again once printed, so it reaches the future of the firing.
+            Defaults to False.
+
+    Returns:
+        Any: The return value of the function, `None` without function, or the message of its exception if it raised
+        one and `raises` is False.
+    """
+    try:
+        if target and args:
+            value = target(*args)
+        elif target and not args:
+            value = target()
+        else:
+            value = None
+    except Exception as e:
+        print(f"Error ocurred:\n{e}")
+        if raises:
+            raise
+        return str(e)
+    else:
+        return value
+
+def capture(function: Callable[..., Any], *args: Any) -> Optional[Tuple[bool, Any]]:
+    """
+    Run a function and return its outcome.
+
+    Args:
+        function (Callable[..., Any]): The function to run.
+        *args: Its arguments.
+
+    Returns:
+        Optional[Tuple[bool, Any]]: `None` if the function returned `None`, `(True, value)` if it returned a value,
+        or `(False, exception)` if it raised one. A `None` result is not pickled on its way to the main process.
+    """
+    try:
+        value = function(*args)
+    except Exception as e:
+        return (False, e)
+    return None if value is None else (True, value)
+
+def settle(future: Future, outcome: Optional[Tuple[bool, Any]]) -> None:
+    """
+    Set the result or the exception of a future from an outcome of `capture()`, unless it was cancelled.
+    """
+    if not future.set_running_or_notify_cancel():
+        return
+    elif outcome is None:
+        future.set_result(None)
+    elif outcome[0]:
+        future.set_result(outcome[1])
+    else:
+        future.set_exception(outcome[1])
+
+def chain(source: Future, target: Future) -> None:
+    """
+    Settle a future with the result or the exception of another one, once it is done.
+    """
+    def copy(done: Future) -> None:
+        if done.cancelled():
+            target.cancel()
+        elif done.exception() is not None:
+            settle(target, (False, done.exception()))
+        else:
+            settle(target, (True, done.result()))
+    source.add_done_callback(copy)
+
+
+class Dispatcher:
+    __shared: Dict[int, "Dispatcher"] = {}
+    # dispatcher of each main process, indexed by process id
+
+    __shared_lock: Lock = Lock()
+    # lock guarding the creation of the dispatchers
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Initialize the thread pool that runs the functions of the timers with the `queue` dispatch policy.
+
+        Args:
+            max_workers (Optional[int]): The number of threads of the pool. Defaults to None (the default of
+                `ThreadPoolExecutor`).
+
+        Notes:
+            - A timer registers its callbacks in the main process and gets a key. When it fires, its worker only sends
+            the key, through a pipe if it runs in another process, so the function is not pickled and the main
+            process is never suspended. The `__listener` thread receives the keys and submits the callbacks to the pool.
+            - The outcome of a function run by a worker comes back the same way. Either way, the timer receives one
+            `Future` per firing, which holds the result or the exception of its function.
+            - Each registration of a worker process gets a pipe of its own: an outcome can be larger than the atomic
+            write size of a pipe, and a worker can be terminated in the middle of a write, so the workers never share one.
+            - The pool starts with the first function it runs, and the listener with the first registration of a
+            worker process, so timers driven by their caller (the inline backend, asyncio) create no thread.
+        """
+        self.__pid: int = getpid()
+        self.__channels: Dict[int, Tuple[Connection, Connection]] = {}
+        # receiving and sending ends of the pipe of each key registered for a worker process
+        self.__closed: List[Connection] = []
+        # receiving ends of released keys, closed by the listener which may be waiting on them
+        self.__waker, self.__wake = Pipe(duplex=False)
+        # pipe that wakes the listener up when the channels change
+        self.__callbacks: Dict[int, Tuple[Callable[[], Any], Callable[[Future], None], Optional[Callable[[Any], None]]]] = {}
+        self.__keys = count(1)
+        self.__lock: Lock = Lock()
+        self.__max_workers: Optional[int] = max_workers
+        self.__pool: Optional[ThreadPoolExecutor] = None
+        self.__listener: Optional[Thread] = None
+        # Started when first needed
+
+    def __getstate__(self) -> dict:
+        with self.__lock:
+            senders = {key: (None, sender) for key, (_, sender) in self.__channels.items()}
+        return {"_Dispatcher__pid": self.__pid, "_Dispatcher__channels": senders}
+        # A worker process only sends keys, it needs neither the callbacks nor the pool
+
+    def __str__(self) -> str:
+        return f"Class Dispatcher()\nProcess id: {self.__pid}\nRegistered callbacks: {len(self.__callbacks)}\n"
+
+    @classmethod
+    def shared(cls) -> "Dispatcher":
+        """
+        Return the dispatcher of the current process, creating it if needed.
+
+        Returns:
+            Dispatcher: The dispatcher shared by every timer of the process.
+        """
+        with cls.__shared_lock:
+            dispatcher = cls.__shared.get(getpid())
+            if dispatcher is None:
+                dispatcher = cls.__shared[getpid()] = cls()
+            return dispatcher
+
+    def submit(self, callback: Callable[[], Any]) -> Future:
+        """
+        Run a callback on the thread pool.
+
+        Args:
+            callback (Callable[[], Any]): The function to run.
+
+        Returns:
+            Future: The future of the callback.
+        """
+        pool = self.__pool
+        if pool is None:
+            with self.__lock:
+                if self.__pool is None:
+                    self.__pool = ThreadPoolExecutor(self.__max_workers, thread_name_prefix="ptymer-dispatch")
+                pool = self.__pool
+        return pool.submit(callback)
+
+    def register(self,
+                 run: Callable[[], Any],
+                 complete: Callable[[Future], None],
+                 missed: Optional[Callable[[Any], None]] = None,
+                 remote: bool = False) -> int:
+        """
+        Register the callbacks of a timer.
+
+        Args:
+            run (Callable[[], Any]): The function of the timer, run on the pool with the `"queue"` policy.
+            complete (Callable[[Future], None]): The function that receives the future of each firing, in the main process.
+            missed (Optional[Callable[[Any], None]]): The function that receives the report of each missed firing,
+                in the main process. Defaults to None.
+            remote (bool): If True, the key is used by a worker process, which gets a pipe of its own. It must be
+                registered before the worker is started. Defaults to False.
+
+        Returns:
+            int: The key of the callbacks, given to `queue()`, `complete()`, `misfire()` and `release()`.
+        """
+        key = next(self.__keys)
+        with self.__lock:
+            self.__callbacks[key] = (run, complete, missed)
+            if remote:
+                self.__channels[key] = Pipe(duplex=False)
+            if remote and self.__listener is None:
+                self.__listener = Thread(target=self._listen, daemon=True)
+                self.__listener.start()
+        if remote:
+            self.__wake.send_bytes(b"")
+        return key
+
+    def queue(self, key: int, last: bool = False) -> None:
+        """
+        Run a registered function on the thread pool of the main process.
+
+        Args:
+            key (int): The key of the callbacks.
+            last (bool): If True, the callbacks are released after the function is submitted. Defaults to False.
+
+        Notes:
+            - Called by the worker of the timer, in any process. It never waits for the function.
+        """
+        self._send(key, "run", None, last)
+
+    def complete(self, key: int, outcome: Optional[Tuple[bool, Any]], last: bool = False) -> None:
+        """
+        Give the outcome of a function run by a worker to the main process.
+
+        Args:
+            key (int): The key of the callbacks.
+            outcome (Optional[Tuple[bool, Any]]): The outcome of `capture()`.
+            last (bool): If True, the callbacks are released afterwards. Defaults to False.
+
+        Notes:
+            - If the outcome cannot be pickled, the main process receives a `PicklingError` instead.
+        """
+        self._send(key, "result", outcome, last)
+
+    def misfire(self, key: int, report: Any) -> None:
+        """
+        Give the report of a missed firing to the main process.
+
+        Args:
+            key (int): The key of the callbacks.
+            report (Any): The report, passed to the `missed` callback.
+        """
+        self._send(key, "misfire", report, False)
+
+    def release(self, key: int) -> None:
+        """
+        Forget registered callbacks, whose timer will not fire anymore.
+
+        Args:
+            key (int): The key of the callbacks.
+        """
+        self._send(key, "release", None, True)
+
+    def _send(self, key: int, action: str, outcome: Optional[Tuple[bool, Any]], last: bool) -> None:
+        """
+        Apply an action to registered callbacks, or send it to the main process.
+        """
+        if getpid() == self.__pid:
+            self._apply(key, action, outcome, last)
+            return
+        sender = self.__channels[key][1]
+        try:
+            sender.send((key, action, outcome, last))
+        except (PicklingError, TypeError, AttributeError) as e:
+            sender.send((key, action, (False, PicklingError(f"The result could not be pickled: {e}")), last))
+        # The message is pickled before anything is written, so a failure leaves the pipe intact
+
+    def _apply(self, key: int, action: str, outcome: Optional[Tuple[bool, Any]], last: bool) -> None:
+        """
+        Run, complete and/or release registered callbacks, in the main process.
+        """
+        with self.__lock:
+            callbacks = self.__callbacks.pop(key, None) if last else self.__callbacks.get(key)
+            channel = self.__channels.pop(key, None) if last else None
+            if channel is not None:
+                self.__closed.extend(channel)
+        if channel is not None:
+            self.__wake.send_bytes(b"")
+        if callbacks is None or action == "release":
+            return
+        run, complete, missed = callbacks
+        if action == "misfire":
+            missed(outcome) if missed else None
+        elif action == "run":
+            complete(self.submit(run))
+        else:
+            future = Future()
+            settle(future, outcome)
+            complete(future)
+
+    def _listen(self) -> None:
+        """
+        Receive the keys sent by the worker processes.
+
+        Notes:
+            - Runs in a daemon thread of the main process. It waits on the pipe of every registered worker at once,
+            and closes the pipes of released keys, so none is closed while it waits on it.
+        """
+        while True:
+            with self.__lock:
+                closed, self.__closed = self.__closed, []
+                receivers = [receiver for receiver, _ in self.__channels.values()]
+            [connection.close() for connection in closed]
+            for connection in wait(receivers + [self.__waker]):
+                if connection is self.__waker:
+                    self.__waker.recv_bytes()
+                    continue
+                try:
+                    key, action, outcome, last = connection.recv()
+                except (EOFError, OSError):
+                    continue
+                # The pipe was closed meanwhile, its key is released
+                self._apply(key, action, outcome, last)
+
+if __name__ == "__main__":
+    pass
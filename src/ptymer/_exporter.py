@@ -0,0 +1,217 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from re import sub
+from threading import Thread
+from typing import Iterable, List, Optional, Tuple
+from ._stats import Registry, Metric, REGISTRY, TAG_KEY, bucket_bounds
+
+BOUNDARIES: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# upper bounds in seconds of the exported histogram buckets, `+Inf` is added
+
+CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# media type of the OpenMetrics text format
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value of the OpenMetrics text format.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_name(key: str) -> str:
+    """
+    Return a tag key as a label name of the OpenMetrics text format, its other characters replaced by underscores.
+    """
+    return key if TAG_KEY.fullmatch(key) else sub(r"[^a-zA-Z0-9_]", "_", key if key[:1].isalpha() else "_" + key)
+
+def _labels(metric: Metric, le: Optional[str] = None) -> str:
+    """
+    Return the label set of a sample: the name and the tags of the metric, and the `le` bound of a bucket.
+
+    Notes:
+        - `Timer` rejects invalid tag keys, those recorded straight in a `Registry` are sanitized by `_label_name()`.
+    """
+    labels = [f'name="{_escape(metric.name)}"']
+    labels += [f'{_label_name(key)}="{_escape(value)}"' for key, value in sorted(metric.tags.items()) if key not in ("name", "le")]
+    labels += [f'le="{le}"'] if le is not None else []
+    return "{" + ",".join(labels) + "}"
+
+def _render_metric(family: str, metric: Metric, boundaries: Iterable[float]) -> List[str]:
+    """
+    Return the sample lines of a metric.
+
+    Args:
+        family (str): The name of the metric family.
+        metric (Metric): A consistent copy of the metric.
+        boundaries (Iterable[float]): The sorted upper bounds of the buckets, in seconds.
+
+    Notes:
+        - A bucket of the histogram of the metric is counted under a bound if its highest value is below the bound, so
+        the values of the one bucket that straddles the bound are counted in the next one (an error below 1/32).
+    """
+    lines, counts, index, seen = [], metric._counts, 0, 0
+    for boundary in boundaries:
+        limit = int(boundary * 1_000_000_000)
+        while index < len(counts) and bucket_bounds(index)[1] <= limit:
+            seen += counts[index]
+            index += 1
+        lines.append(f"{family}_bucket{_labels(metric, f'{boundary:g}')} {seen}")
+    lines.append(f"{family}_bucket{_labels(metric, '+Inf')} {metric.count}")
+    lines.append(f"{family}_sum{_labels(metric)} {metric.total / 1_000_000_000}")
+    lines.append(f"{family}_count{_labels(metric)} {metric.count}")
+    return lines
+
+def render_metrics(registry: Registry = REGISTRY, family: str = "ptymer_timer_seconds", boundaries: Iterable[float] = BOUNDARIES) -> str:
+    """
+    Render the metrics of a registry in the OpenMetrics text format.
+
+    Args:
+        registry (Registry): The registry to export. Defaults to `REGISTRY`.
+        family (str): The name of the histogram family, which must end with the `_seconds` unit. Defaults to "ptymer_timer_seconds".
+        boundaries (Iterable[float]): The upper bounds of the buckets, in seconds. Defaults to `BOUNDARIES`.
+
+    Returns:
+        str: One histogram per metric, with its `_bucket`, `_sum` and `_count` samples, labelled with the name and
+        the tags of the metric, and the final `# EOF`.
+
+    Raises:
+        TypeError: If `registry` is not a `Registry`.
+        ValueError: If `family` does not end with `_seconds`.
+
+    Notes:
+        - Each metric is copied before it is rendered, which folds its pending durations. Recording threads never
+        wait for a scrape: they only append to the pending deque and skip the fold while the copy holds the lock.
+    """
+    if not isinstance(registry, Registry):
+        raise TypeError(f"Registry must be a Registry! Got {type(registry)}!")
+    elif not family.endswith("_seconds"):
+        raise ValueError(f"Family must end with the '_seconds' unit! Got {family!r}!")
+
+    boundaries = sorted(boundaries)
+    lines = [f"# TYPE {family} histogram", f"# UNIT {family} seconds", f"# HELP {family} Durations measured by ptymer timers."]
+    for metric in registry.metrics():
+        lines += _render_metric(family, metric.copy(), boundaries)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self,
+                 port: int = 9464,
+                 host: str = "127.0.0.1",
+                 registry: Registry = REGISTRY,
+                 visibility: bool = False) -> None:
+        """
+        Initialize an HTTP endpoint serving the metrics of a registry to Prometheus.
+
+        Args:
+            port (int): The port to listen on, 0 for any free port. Defaults to 9464.
+            host (str): The address to listen on. Defaults to "127.0.0.1".
+            registry (Registry): The registry to export. Defaults to `REGISTRY`.
+            visibility (bool): Determines if messages should be displayed. Defaults to False.
+
+        Raises:
+            TypeError: If `port` is not an integer, if `host` is not a string, if `registry` is not a `Registry` or if
+                `visibility` is not a boolean.
+
+        Notes:
+            - `GET /metrics` returns `render_metrics(registry)`. The standard library `ThreadingHTTPServer` runs in a daemon
+            thread, so scrapes are served concurrently and never block the main thread.
+        """
+        if not isinstance(port, int) or isinstance(port, bool):
+            raise TypeError(f"Port must be an integer! Got {type(port)}!")
+        else: self.port: int = port
+
+        if not isinstance(host, str):
+            raise TypeError(f"Host must be a string! Got {type(host)}!")
+        else: self.host: str = host
+
+        if not isinstance(registry, Registry):
+            raise TypeError(f"Registry must be a Registry! Got {type(registry)}!")
+        else: self.registry: Registry = registry
+
+        if not isinstance(visibility, bool):
+            raise TypeError("Visibility must be a boolean!")
+        else: self.visibility: bool = visibility
+
+        self.__server: Optional[ThreadingHTTPServer] = None
+        self.__thread: Optional[Thread] = None
+
+    def __str__(self) -> str:
+        return f"Class MetricsServer()\nAddress: {self.url if self.status else None}\nActive: {self.status}\n"
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> "MetricsServer":
+        """
+        Start serving the metrics.
+
+        Returns:
+            MetricsServer: The current instance.
+
+        Raises:
+            RuntimeError: If the server is already running.
+        """
+        if self.status:
+            raise RuntimeError("MetricsServer already running!")
+        else:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = render_metrics(registry).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args) -> None:
+                    pass
+                    # Scrapes are not logged to stderr
+
+            self.__server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.__server.daemon_threads = True
+            self.port = self.__server.server_address[1]
+            self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+            self.__thread.start()
+            print(f"Serving metrics at {self.url}!") if self.visibility else None
+            return self
+
+    def stop(self) -> None:
+        """
+        Stop serving the metrics.
+
+        Raises:
+            RuntimeError: If the server is not running.
+        """
+        if not self.status:
+            raise RuntimeError("MetricsServer not running!")
+        else:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__thread.join()
+            self.__server, self.__thread = None, None
+            print("Metrics server stopped!") if self.visibility else None
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the server is running.
+        """
+        return self.__server is not None
+
+    @property
+    def url(self) -> str:
+        """
+        Return the URL of the metrics endpoint.
+        """
+        return f"http://{self.host}:{self.port}/metrics"
+
+if __name__ == "__main__":
+    pass
@@ -1,52 +1,77 @@
-from typing import Callable, Optional, Union
-from multiprocessing import Process, Value, freeze_support
+from typing import Any, Callable, Optional, Union
+from concurrent.futures import Future
 from datetime import timedelta
+from math import ceil
+from time import monotonic
 from psutil import Process as psProcess, pid_exists
+from ._scheduler import Scheduler, Handle
+from ._backends import make_backend
+from ._trace import traced, target_name
+from ._dispatch import Dispatcher, check_policy, capture, chain, run_function
 
 class HourGlass:
     def __init__(self, 
                  seconds: Union[int, float], 
                  target: Optional[Callable] = None,
                  args: Optional[tuple] = None,
-                 visibility: bool = False) -> None:
+                 visibility: bool = False,
+                 shared: bool = False,
+                 backend: str = "process",
+                 dispatch: str = "suspend") -> None:
         """
         Initialize the hourglass timer.
 
         Args:
-            seconds (Union[int, float]): The duration of the timer in seconds. Must be a positive number.
+            seconds (Union[int, float]): The duration of the timer in seconds. Must be a positive number, fractions of a second are allowed.
             target (Optional[Callable]): A callable function to be executed when the timer ends. Default is None.
             args (Optional[tuple]): A tuple of arguments to pass to the target function. Default is None.
             visibility (bool): Determines if messages should be displayed. Default is False.
+            shared (bool): If True, the hourglass runs in the shared `Scheduler` worker instead of its own process. Default is False.
+            backend (str): Where the countdown runs: `"process"` (its own process), `"thread"` (a thread of the
+                main process) or `"inline"` (driven by the caller through `poll()`). Default is "process".
+            dispatch (str): How the function runs when the time is up: `"suspend"` (in the worker, with the main process
+                suspended), `"concurrent"` (in the worker, without suspending the main process) or `"queue"` (on the
+                thread pool of the main process). Default is "suspend".
 
         Raises:
-            TypeError: If `visibility` is not a boolean, if `seconds` is not numeric, if `target` is not a callable or if `args` is not a tuple.
-            ValueError: If `seconds` is less than 1, or if `args` are defined without a target function.
+            TypeError: If `visibility` or `shared` is not a boolean, if `seconds` is not numeric, if `target` is not a callable, if `args` is not a tuple or if `backend` or `dispatch` is not a string.
+            ValueError: If `seconds` is not greater than 0, if `args` are defined without a target function, if `backend` or `dispatch` is unknown or if a shared hourglass does not use the process backend.
 
         Notes:
             - The `visibility` attribute defines if the hourglass will show messages or not.
-            - The `seconds` attribute represents the total time of the hourglass.
-            - The `__pid` attribute stores the process ID of the hourglass.
-            - The `__process` attribute stores the process of the hourglass.
+            - The `__total_time` attribute stores the remaining time of the hourglass while it is not running.
+            - The `__deadline` attribute stores the `time.monotonic()` instant when the running hourglass ends, its remaining
+            time as a negative number while it is paused, or 0 if it is not armed.
+            - The `__wakeup` event interrupts the sleep of the hourglass process when the deadline changes.
+            - The `__backend` attribute stores the execution backend that hosts the countdown.
             - The `target` attribute is the function to be executed when the timer ends.
             - The `args` attribute contains the arguments for the `target` function.
+            - The `shared` attribute defines if the hourglass is hosted by the shared `Scheduler`.
+            - The `__handle` attribute stores the handle of the hourglass inside the shared `Scheduler`.
+            - The `dispatch` attribute defines how the function is run. Only the process backend can suspend the main
+            process, the other backends run it concurrently with `"suspend"` too.
         """
         if not isinstance(visibility, bool):
             raise TypeError(f"Visibility must be a boolean! Got {type(visibility)}!") 
         else: self.visibility: bool = visibility
         # Defines if the hourglass will show messages or not
 
+        self.__backend = make_backend(backend)
+        self.backend: str = backend
+        # Execution backend of the hourglass
+
         if not isinstance(seconds, (float, int)):
             raise TypeError(f"Seconds must be numeric! Got {type(seconds)}!")
-        elif seconds < 1:
-            raise ValueError(f"Seconds must be greater than 1!")
-        else: self.__total_time = Value('i', int(seconds), lock=True) if isinstance(seconds, int) else Value('d', float(seconds), lock=True)
-        # Total time of the hourglass
+        elif seconds <= 0:
+            raise ValueError(f"Seconds must be greater than 0!")
+        else: self.__total_time = self.__backend.value('d', float(seconds))
+        # Remaining time of the hourglass while it is not running
 
-        self.__pid: Optional[int] = None
-        # Process id of the hourglass
+        self.__deadline = self.__backend.value('d', 0.0)
+        # Monotonic deadline of the running hourglass (0 if not armed, minus the remaining time if paused)
 
-        self.__process: Optional[Process] = None
-        # Process of the hourglass
+        self.__wakeup = self.__backend.event()
+        # Event that interrupts the sleep of the hourglass worker
 
         if target and not isinstance(target, Callable):
             raise TypeError(f"Target must be a function! Got {type(target)}!")
@@ -60,44 +85,189 @@ class HourGlass:
         else: self.args: tuple = args
         # Arguments of the function
 
+        if not isinstance(shared, bool):
+            raise TypeError(f"Shared must be a boolean! Got {type(shared)}!")
+        elif shared and backend != "process":
+            raise ValueError(f"Only the process backend can be shared! Got {backend!r}!")
+        else: self.shared: bool = shared
+        # Defines if the hourglass is hosted by the shared scheduler
+
+        self.__handle: Optional[Handle] = None
+        # Handle of the hourglass inside the shared scheduler
+
+        self.dispatch: str = check_policy(dispatch)
+        # How the function is run when time is up
+
+        self.__dispatcher: Optional[Dispatcher] = None
+        self.__key: Optional[int] = None
+        # Dispatcher of the main process and key of the callbacks of the run
+
+        self.__future: Optional[Future] = None
+        # Future of the run, with the result or the exception of the function
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_HourGlass__future"] = None
+        return state
+        # A future cannot be pickled, the worker does not need it
+
     def __str__(self) -> str:
-        return f"Class HourGlass()\nVisibility: {self.visibility}\nRemaining time: {self.__total_time.value}\nProcess id: {self.__pid if self.status else None}\nFunction: {self.target}\nArguments: {self.args}\n"
+        return f"Class HourGlass()\nVisibility: {self.visibility}\nRemaining time: {self.remaining_seconds}\nProcess id: {self.pid if self.status else None}\nFunction: {self.target}\nArguments: {self.args}\n"
     
     def __eq__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value == other.__total_time.value
+            return self.remaining_seconds == other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __ne__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value != other.__total_time.value
+            return self.remaining_seconds != other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __lt__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value < other.__total_time.value
+            return self.remaining_seconds < other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
 
     def __le__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value <= other.__total_time.value
+            return self.remaining_seconds <= other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
 
     def __gt__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value > other.__total_time.value
+            return self.remaining_seconds > other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
 
     def __ge__(self, other: "HourGlass") -> bool:
         if isinstance(other, HourGlass):
-            return self.__total_time.value >= other.__total_time.value
+            return self.remaining_seconds >= other.remaining_seconds
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __call__(self, seconds: Union[int, float]) -> "HourGlass":
-        self.__total_time.value = seconds
-        # Change the total time of the hourglass
+        if self.status:
+            self._move(monotonic() + seconds)
+        else:
+            self.__total_time.value = seconds
+            self.__deadline.value = 0.0
+        # Change the remaining time of the hourglass
 
         return self
+
+    def pause(self) -> "HourGlass":
+        """
+        Pause the running hourglass, keeping its remaining time.
+
+        Returns:
+            HourGlass: The current instance of the `HourGlass` class.
+
+        Raises:
+            RuntimeError: If the hourglass is not running or is already paused.
+
+        Notes:
+            - The worker is not woken up: it finds the hourglass paused when its sleep ends, and then sleeps until `resume()`.
+        """
+        if not self.status:
+            raise RuntimeError(f"There is no hourglass running!")
+        elif self.paused:
+            raise RuntimeError(f"Hourglass already paused!")
+        else:
+            self._move(-max(self.__deadline.value - monotonic(), 1e-9))
+            # A paused deadline is never 0, which means stopped
+            print("Hourglass paused!") if self.visibility else None
+            return self
+
+    def resume(self) -> "HourGlass":
+        """
+        Resume the paused hourglass with the remaining time it had when paused.
+
+        Returns:
+            HourGlass: The current instance of the `HourGlass` class.
+
+        Raises:
+            RuntimeError: If the hourglass is not paused.
+        """
+        if not self.paused:
+            raise RuntimeError(f"Hourglass not paused!")
+        else:
+            self._move(monotonic() - self.__deadline.value)
+            print("Hourglass resumed!") if self.visibility else None
+            return self
+
+    def extend(self, seconds: Union[int, float]) -> "HourGlass":
+        """
+        Add time to the hourglass, running, paused or stopped.
+
+        Args:
+            seconds (Union[int, float]): The seconds to add, negative to shorten the countdown.
+
+        Returns:
+            HourGlass: The current instance of the `HourGlass` class.
+
+        Raises:
+            TypeError: If `seconds` is not numeric.
+            ValueError: If the hourglass is not running and its remaining time would not be greater than 0.
+
+        Notes:
+            - Extending a running countdown only writes its deadline, without waking up the worker, so a watchdog
+            can be kicked thousands of times per second. A shortened countdown that is already over ends at once.
+        """
+        if not isinstance(seconds, (float, int)):
+            raise TypeError(f"Seconds must be numeric! Got {type(seconds)}!")
+        elif self.status:
+            deadline = self.__deadline.value
+            self._move(min(deadline - seconds, -1e-9) if deadline < 0 else deadline + seconds)
+        elif self.__total_time.value + seconds <= 0:
+            raise ValueError(f"Seconds must leave a remaining time greater than 0!")
+        else:
+            self.__total_time.value += seconds
+        return self
+
+    def reset(self) -> "HourGlass":
+        """
+        Restart the countdown of the running hourglass from its full duration.
+
+        Returns:
+            HourGlass: The current instance of the `HourGlass` class.
+
+        Raises:
+            RuntimeError: If the hourglass is not running.
+
+        Notes:
+            - The full duration is the one the hourglass was started with. A paused hourglass stays paused.
+            - Like `extend()`, a reset that moves the deadline later does not wake up the worker.
+        """
+        if not self.status:
+            raise RuntimeError(f"There is no hourglass running!")
+        else:
+            seconds = self.__total_time.value
+            self._move(-seconds if self.__deadline.value < 0 else monotonic() + seconds)
+            return self
+
+    def _move(self, deadline: float) -> None:
+        """
+        Change the deadline of the running hourglass.
+
+        Args:
+            deadline (float): The new monotonic deadline, or minus the remaining time to pause the hourglass.
+
+        Notes:
+            - The worker sleeps until the deadline it read last and reads it again when it wakes up, so it is woken up
+            only if the deadline moves earlier or the hourglass resumes. The shared `Scheduler` has its own deadline,
+            so it always receives the change.
+        """
+        previous = self.__deadline.value
+        self.__deadline.value = deadline
+        if self.shared:
+            self.__handle.pause() if deadline < 0 else self.__handle.reschedule(deadline - monotonic())
+        elif deadline > 0 and (previous <= 0 or deadline < previous):
+            self._wake()
+
+    def _wake(self) -> None:
+        """
+        Wake up the worker so it reads the deadline again.
+        """
+        self.__wakeup.set()
     
     @staticmethod
     def _time_format(secs: Union[int, float]) -> timedelta:
@@ -127,79 +297,133 @@ class HourGlass:
  
         return timedelta(days=days, hours=hours, minutes=mins, seconds=secs)
     
-    @staticmethod
-    def _run_function(target, args, visibility) -> any:
+    _run_function = staticmethod(run_function)
+    # Runs the function of the hourglass, overridden by the async hourglass to schedule coroutines
+    
+    def _countdown(self, mainPid: int, wakeup) -> None:
         """
-        Execute the stored function with its arguments.
+        Sleep until the deadline of the hourglass.
 
-        This method attempts to run the function stored in `self.target` with the arguments stored in `self.args`.
-        If no arguments are provided, the function is called without arguments.
+        This method sleeps once until `self.__deadline` or until the main process (identified by `mainPid`)
+        wakes it up because the deadline changed. When the deadline is reached, it runs the specified
+        function.
 
-        Returns:
-            any: The return value of the executed function, or `None` if no function is stored. If an exception occurs, 
-            it returns the exception message as a string.
+        Args:
+            mainPid (int): The process ID of the main process.
+            wakeup (Event): The wake-up event of the run, used to detect a stop or a restart.
 
         Raises:
-            Exception: If an error occurs during the function execution, the exception is caught and its message is printed
-            if `self.visibility` is `True`.
+            Exception: If any error occurs during the process.
 
         Notes:
-            - If `target` is `None`, the method returns `None`.
-            - If `args` is `None`, the function is called without arguments.
+            - The deadline is measured on `time.monotonic()`, so the countdown does not drift and fractions of a second are honored.
+            - The sleep is interrupted by `self.__wakeup`, which is set when the deadline moves earlier or the hourglass
+            resumes, and by `stop()`, which also disarms the deadline. A paused hourglass sleeps until it is woken up.
+            - The loop returns without running the function if the deadline was disarmed or if the hourglass
+            was restarted with a new wake-up event, which is how the thread backend ends a stopped worker.
         """
         try:
-            if target and args:
-                value = target(*args)
-            elif target and not args:
-                value = target()
-            else:
-                value = None
+            while True:
+                deadline = self.__deadline.value
+                if not deadline or self.__wakeup is not wakeup:
+                    return
+                remaining = deadline - monotonic() if deadline > 0 else None
+                # Paused, sleep until resumed
+                if remaining is not None and remaining <= 0:
+                    break
+                if wakeup.wait(remaining):
+                    wakeup.clear()
+            # Sleep until the deadline, recomputing it when woken up (main 
+            # process is not interrupted)
+
+            self._fire(mainPid)
         except Exception as e:
-            print(f"Error ocurred:\n{e}")
-            return str(e)
-        else:
-            return value
-    
-    def _decrease_time(self, mainPid: int) -> None:
-        """
-        Decrease the timer by 1 second increments.
+            print(e) if self.visibility else None
+            raise e
 
-        This method decreases the timer by 1 second at a time until the timer reaches zero or 
-        the main process (identified by `mainPid`) is no longer running. When the timer ends 
-        or the main process is interrupted, it runs the specified function and resumes the 
-        main process.
+    def _fire(self, mainPid: int) -> None:
+        """
+        Run the function of an hourglass whose time is up.
 
         Args:
             mainPid (int): The process ID of the main process.
 
-        Raises:
-            Exception: If any error occurs during the process.
-
         Notes:
-            - This method uses `sleep(1)` to wait for 1 second intervals between decreases.
-            - If the timer runs out or the main process is interrupted, it prints a message if 
-            `self.visibility` is `True`.
-            - The method suspends the main process, runs the target function, and then resumes the main process.
+            - With the `"queue"` policy, the function is sent to the thread pool of the main process.
+            - With the `"suspend"` policy, if the backend runs the countdown in another process, the method suspends
+            the main process, runs the target function, and then resumes the main process.
+            - Otherwise the function runs in the current thread, without suspending anything.
         """
-        from time import sleep
-        try:
-            process = psProcess(mainPid)
+        print("Time is up!" if pid_exists(mainPid) else "Main process interrupted!") if self.visibility else None 
 
-            while self.__total_time.value > 0:
-                self.__total_time.value-=1
-                sleep(1)
-            # Decrease time in 1 second and sleep for 1 second (main 
-            # process is not interrupted)
-
-            print("Time is up!" if pid_exists(mainPid) else "Main process interrupted!") if self.visibility else None 
-            
+        if self.dispatch == "queue":
+            self.__dispatcher.queue(self.__key, last=True)
+        elif self.dispatch == "suspend" and self.__backend.suspends:
+            process = psProcess(mainPid)
             process.suspend()
-            self._run_function(self.target, self.args, self.visibility)
+            outcome = capture(self._dispatched)
             process.resume()
             # Stop main process, run the function and resume the main process
-        except Exception as e:
-            print(e) if self.visibility else None
-            raise e
+            self.__dispatcher.complete(self.__key, outcome, last=True)
+        else:
+            self.__dispatcher.complete(self.__key, capture(self._dispatched), last=True)
+        # The outcome of the function goes back to the future of the main process
+
+    def _dispatched(self) -> Any:
+        """
+        Run the function of the hourglass.
+
+        Returns:
+            any: The return value of the function.
+
+        Raises:
+            Exception: The exception raised by the function, once printed.
+
+        Notes:
+            - If a `TraceRecorder` is started, the run of the function is recorded as a complete event.
+        """
+        with traced(target_name("HourGlass", self.target), "hourglass"):
+            return self._run_function(self.target, self.args, True)
+
+    def _complete(self, future: Future) -> None:
+        """
+        Settle the future of the run with the future of the firing, in the main process.
+        """
+        chain(future, self.__future)
+
+    def poll(self) -> Optional[float]:
+        """
+        Drive an hourglass that uses the inline backend.
+
+        This method runs the function if the time is up and returns how long the caller may sleep
+        before polling again.
+
+        Returns:
+            Optional[float]: The remaining time in seconds, or `None` if the hourglass is not running
+            (including when its time was just up). A paused hourglass returns its remaining time.
+
+        Raises:
+            RuntimeError: If the hourglass does not use the inline backend.
+
+        Notes:
+            - The function runs in the thread that calls `poll()`.
+        """
+        from os import getpid
+
+        if self.backend != "inline":
+            raise RuntimeError(f"Only inline hourglasses can be polled! Got {self.backend!r} backend!")
+        elif not self.status:
+            return None
+        else:
+            deadline = self.__deadline.value
+            if deadline < 0:
+                return -deadline
+            remaining = deadline - monotonic()
+            if remaining > 0:
+                return remaining
+            self.__backend.terminate()
+            self._fire(getpid())
+            return None
     
     def start(self) -> "HourGlass":
         """
@@ -216,26 +440,37 @@ class HourGlass:
             RuntimeError: If the hourglass is already running.
 
         Notes:
-            - This method uses `freeze_support()` to ensure compatibility with Windows.
-            - The hourglass process is started as a daemon process.
+            - The countdown is launched by the backend: a daemon process, a daemon thread, or nothing for the inline backend.
             - If `self.visibility` is `True`, it prints a message indicating that the hourglass has started.
+            - If `self.shared` is `True`, the hourglass is submitted to the shared `Scheduler` instead.
         """
         from os import getpid
 
-        freeze_support()
-        # Freeze support for Windows
-
         if self.status:
             raise RuntimeError(f"Hourglass already running!")
+        elif self.shared:
+            print("Starting hourglass!") if self.visibility else None
+
+            seconds = self.__total_time.value
+            self.__deadline.value = monotonic() + seconds
+            self._register()
+            self.__handle = Scheduler.shared()._submit("hourglass", seconds, self.target, self.args, self.visibility,
+                                                       self.dispatch, self.__key)
+            # Submit the countdown to the shared scheduler
+
+            return self
         else:
             print("Starting hourglass!") if self.visibility else None
 
-            process = Process(target=self._decrease_time, args=(getpid(),), daemon=True)
-            process.start()
-            # Start the parallel process
+            self.__wakeup = self.__backend.event()
+            self.__deadline.value = monotonic() + self.__total_time.value
+            # Arm the deadline before starting the worker
+
+            self._register()
+            # The worker sends the key of the callbacks to the main process when time is up
 
-            self.__pid = process.pid
-            self.__process = process
+            self.__backend.launch(self._countdown, (getpid(), self.__wakeup))
+            # Start the parallel worker
 
             return self
         
@@ -243,7 +478,7 @@ class HourGlass:
         """
         Stop the hourglass.
 
-        This method terminates the running hourglass process. If no hourglass process is running,
+        This method terminates the running hourglass worker. If no hourglass is running,
         it raises an error.
 
         Raises:
@@ -255,14 +490,45 @@ class HourGlass:
         """
         if not self.status:
             raise RuntimeError(f"There is no hourglass running!")
+        elif self.shared:
+            self.__handle.cancel()
+            self.__handle = None
+            self._freeze()
+            self._release()
+            if self.visibility:
+                print("Hourglass stopped!")
         else:
-            process = psProcess(self.__pid)
-            process.terminate()
-            self.__pid = None
-            self.__process = None
+            self._freeze()
+            self.__wakeup.set()
+            # Disarm the deadline and wake up the worker, which returns without running the function
+            self.__backend.terminate()
+            self._release()
             if self.visibility:
                 print("Hourglass stopped!")
     
+    def _register(self) -> None:
+        """
+        Create the future of the run and register its callbacks in the `Dispatcher` of the main process.
+        """
+        self.__future = Future()
+        self.__dispatcher = Dispatcher.shared()
+        self.__key = self.__dispatcher.register(self._dispatched, self._complete, remote=self.__backend.suspends and not self.shared)
+        # A worker process gets a pipe of its own, the shared scheduler sends through its events pipe instead
+
+    def _release(self) -> None:
+        """
+        Cancel the future of a stopped run and forget its callbacks.
+        """
+        self.__future.cancel()
+        self.__dispatcher.release(self.__key)
+
+    def _freeze(self) -> None:
+        """
+        Keep the remaining time of a stopped hourglass and disarm its deadline.
+        """
+        self.__total_time.value = self.remaining_seconds
+        self.__deadline.value = 0.0
+
     @property
     def remaining_time(self) -> timedelta:
         """
@@ -276,7 +542,7 @@ class HourGlass:
         Notes:
             - The remaining time is formatted as a `timedelta` object.
         """
-        val = self._time_format(self.__total_time.value) 
+        val = self._time_format(self.remaining_seconds) 
         return val
     
     @property
@@ -288,8 +554,43 @@ class HourGlass:
 
         Returns:
             int | float: The remaining time in seconds.
+
+        Notes:
+            - While the hourglass is armed, the remaining time is computed from its deadline when read.
+            - The value is rounded up to the millisecond.
+        """
+        deadline = self.__deadline.value
+        if deadline < 0:
+            return ceil(-deadline * 1000) / 1000
+        elif deadline:
+            return ceil(max(deadline - monotonic(), 0) * 1000) / 1000
+        else:
+            return self.__total_time.value
+
+    @property
+    def future(self) -> Optional[Future]:
+        """
+        Return the future of the last run.
+
+        Returns:
+            Optional[Future]: A `concurrent.futures.Future` that holds the return value or the exception of the function
+            once the time is up, or is cancelled if the hourglass is stopped. `None` if the hourglass never started.
+
+        Notes:
+            - With the process backend, the return value or the exception is pickled and sent to the main process,
+            unless it is `None`.
         """
-        return self.__total_time.value
+        return self.__future
+
+    @property
+    def paused(self) -> bool:
+        """
+        Check if the hourglass is paused.
+
+        Returns:
+            bool: `True` if the hourglass is running and paused, `False` otherwise.
+        """
+        return self.__deadline.value < 0 and self.status
 
     @property
     def pid(self) -> int:
@@ -307,8 +608,10 @@ class HourGlass:
         """
         if not self.status:
             raise AttributeError(f"There is no hourglass running!")
+        elif self.shared:
+            return self.__handle.pid
         else:
-            return int(self.__pid)
+            return self.__backend.pid
     
     @property
     def status(self) -> bool:
@@ -321,27 +624,37 @@ class HourGlass:
         Returns:
             bool: `True` if the hourglass process is active, `False` otherwise.
         """
-        if self.__pid and pid_exists(self.__pid):
-            return True
+        if self.shared:
+            return self.__handle is not None and self.__handle.active
         else:
-            return False
+            return self.__backend.alive
     
     def wait(self) -> None:
         """
         Wait for the hourglass to finish.
 
-        This method waits for the hourglass process to finish before returning.
+        This method waits for the hourglass worker to finish before returning.
 
         Returns:
             None
 
         Notes:
-            - The method uses the `join()` method of the HourGlass process.
+            - The method uses the `join()` method of the HourGlass worker.
+            - If the hourglass is shared, it waits for its handle inside the `Scheduler`.
+            - If the hourglass uses the inline backend, it drives the countdown with `poll()` in the calling thread.
         """
-        if self.status:
-            self.__process.join()
-        else:
+        if not self.status:
             raise RuntimeError("HourGlass not set!")
+        elif self.shared:
+            self.__handle.wait()
+        elif self.backend == "inline":
+            remaining = self.poll()
+            while remaining is not None:
+                if self.__wakeup.wait(remaining):
+                    self.__wakeup.clear()
+                remaining = self.poll()
+        else:
+            self.__backend.join()
         
 if __name__ == "__main__":
     pass
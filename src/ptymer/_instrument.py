@@ -0,0 +1,312 @@
+from fnmatch import fnmatchcase
+from inspect import CO_ASYNC_GENERATOR, CO_COROUTINE, CO_GENERATOR, CO_ITERABLE_COROUTINE, unwrap
+from threading import get_ident
+from time import perf_counter_ns
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import sys
+import threading
+from ._stats import Registry, Metric, REGISTRY
+
+TOOL_IDS: Tuple[int, ...] = (2, 3, 4)
+# `sys.monitoring` tool ids tried in order: the one of profilers, then the two left free by CPython
+
+SUSPENDABLE: int = CO_GENERATOR | CO_COROUTINE | CO_ASYNC_GENERATOR | CO_ITERABLE_COROUTINE
+# flags of the functions that can be suspended, which are not instrumented
+
+def _patterns(patterns: Optional[Union[str, Iterable[str]]], kind: str) -> Optional[Tuple[str, ...]]:
+    """
+    Validate the glob patterns of `include` or `exclude`.
+    """
+    if patterns is None:
+        return None
+    elif isinstance(patterns, str):
+        return (patterns,)
+    patterns = tuple(patterns)
+    if not all(isinstance(pattern, str) for pattern in patterns):
+        raise TypeError(f"{kind} must be a string or an iterable of strings! Got {patterns!r}!")
+    return patterns
+
+def _functions(namespace: Any, module: str, seen: Set[int]) -> Iterable[FunctionType]:
+    """
+    Yield the functions defined by a module in a namespace, and in the classes it defines, recursively.
+    """
+    for value in list(vars(namespace).values()):
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        if isinstance(value, property):
+            yield from (function for function in (value.fget, value.fset, value.fdel) if isinstance(function, FunctionType))
+        elif isinstance(value, type) and value.__module__ == module and id(value) not in seen:
+            seen.add(id(value))
+            yield from _functions(value, module, seen)
+        elif callable(value):
+            try:
+                function = unwrap(value)
+            except ValueError:
+                continue
+            # The function under a decorator that uses `functools.wraps()`, such as `Timer`
+            if isinstance(function, FunctionType) and function.__module__ == module:
+                yield function
+
+
+class Instrumenter:
+    def __init__(self,
+                 target: Union[ModuleType, str, Iterable[Union[ModuleType, str]]],
+                 include: Optional[Union[str, Iterable[str]]] = None,
+                 exclude: Optional[Union[str, Iterable[str]]] = None,
+                 registry: Optional[Registry] = None) -> None:
+        """
+        Initialize the instrumentation of the functions of modules or packages, without decorating them.
+
+        Args:
+            target (Union[ModuleType, str, Iterable[Union[ModuleType, str]]]): The module or package to instrument, or
+                its name, or an iterable of them.
+            include (Optional[Union[str, Iterable[str]]], optional): Glob patterns of the functions to instrument,
+                matched against their qualified name prefixed by their module (e.g. `"app.db.*"`). Defaults to None
+                (every function).
+            exclude (Optional[Union[str, Iterable[str]]], optional): Glob patterns of the functions left out, matched
+                the same way. Defaults to None.
+            registry (Optional[Registry], optional): The registry where the durations are recorded. Defaults to `REGISTRY`.
+
+        Raises:
+            TypeError: If target is neither a module nor a string, if include or exclude are neither strings nor
+                iterables of strings, or if registry is not a `Registry`.
+
+        Notes:
+            - Every call of an instrumented function records its duration, callees included, in the metric named by its
+            module and qualified name (e.g. `app.db.Session.query`), the same way as a decorated `Timer`.
+            - On Python 3.12 and later, the instrumenter listens to `sys.monitoring` events of the code of the
+            instrumented functions only, so the rest of the program runs at full speed and an instrumented call costs
+            about as much as a decorated `Timer`. On older versions, it falls back to `sys.setprofile()`, which runs on
+            every call of the process: the overhead is then spread over the whole program, much like `cProfile`.
+            - The functions are looked up by `start()`, in the modules already imported: a package brings its
+            imported submodules. Methods, static and class methods, properties and functions under `functools.wraps()`
+            decorators are found, generator and coroutine functions are left out, use a `Timer` for them.
+            - Only one instrumenter can be started at a time. With `sys.setprofile()`, the threads running before
+            `start()` other than the calling one are not instrumented.
+        """
+        targets = [target] if isinstance(target, (ModuleType, str)) else list(target)
+        if not all(isinstance(module, (ModuleType, str)) for module in targets):
+            raise TypeError(f"Target must be a module, a module name or an iterable of them! Got {target!r}!")
+        else: self.targets: List[Union[ModuleType, str]] = targets
+        # Modules and packages to instrument, imported by `start()` if given by name
+
+        self.include: Optional[Tuple[str, ...]] = _patterns(include, "Include")
+        self.exclude: Optional[Tuple[str, ...]] = _patterns(exclude, "Exclude")
+        # Glob patterns of the qualified names of the functions
+
+        if registry is not None and not isinstance(registry, Registry):
+            raise TypeError(f"Registry must be a Registry! Got {type(registry)}!")
+        else: self.__registry: Registry = REGISTRY if registry is None else registry
+        # Registry of the metrics of the functions
+
+        self.__metrics: Optional[Dict[CodeType, Metric]] = None
+        # Metric of the code of each instrumented function, `None` while stopped
+        self.__tool: Optional[int] = None
+        # `sys.monitoring` tool id in use, `None` with `sys.setprofile()`
+
+    def __str__(self) -> str:
+        return f"Class Instrumenter()\nTargets: {self.targets}\nActive: {self.status}\nFunctions: {len(self.__metrics or ())}\n"
+
+    def __enter__(self) -> "Instrumenter":
+        return self if self.status else self.start()
+        # `instrument()` returns a started instrumenter, which can be used as a context manager too
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> "Instrumenter":
+        """
+        Look up the functions to instrument and start recording their calls.
+
+        Returns:
+            Instrumenter: The current instance.
+
+        Raises:
+            RuntimeError: If the instrumenter is already started, or if another profiler or `sys.monitoring` tool
+                holds the hooks.
+            ImportError: If a target given by name cannot be imported.
+        """
+        if self.status:
+            raise RuntimeError("Instrumenter already started!")
+
+        metrics = self._lookup()
+        if hasattr(sys, "monitoring"):
+            self._monitor(metrics)
+        elif sys.getprofile() is not None:
+            raise RuntimeError("Another profiler is already set!")
+        else:
+            profile = self._profiler(metrics)
+            threading.setprofile(profile)
+            sys.setprofile(profile)
+        self.__metrics = metrics
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop recording the calls of the instrumented functions.
+
+        Raises:
+            RuntimeError: If the instrumenter is not started.
+
+        Notes:
+            - The calls running meanwhile are not recorded. The instrumented functions are not modified, so nothing is
+            left behind.
+        """
+        if not self.status:
+            raise RuntimeError("Instrumenter not started!")
+
+        metrics, self.__metrics = self.__metrics, None
+        if self.__tool is not None:
+            monitoring = sys.monitoring
+            [monitoring.set_local_events(self.__tool, code, 0) for code in metrics]
+            monitoring.set_events(self.__tool, 0)
+            [monitoring.register_callback(self.__tool, event, None) for event in (monitoring.events.PY_START, monitoring.events.PY_RETURN, monitoring.events.PY_UNWIND)]
+            monitoring.free_tool_id(self.__tool)
+            self.__tool = None
+        else:
+            threading.setprofile(None)
+            sys.setprofile(None)
+            metrics.clear()
+            # The profiler of the threads started meanwhile removes itself on its next call
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the instrumenter is started.
+        """
+        return self.__metrics is not None
+
+    @property
+    def functions(self) -> List[str]:
+        """
+        Return the names of the instrumented functions.
+
+        Returns:
+            List[str]: The metric names of the functions, sorted, or an empty list while stopped.
+        """
+        return sorted(metric.name for metric in (self.__metrics or {}).values())
+
+    def _lookup(self) -> Dict[CodeType, Metric]:
+        """
+        Return the metric of the code of each function matching the patterns, in the target modules and their submodules.
+        """
+        modules: Dict[str, ModuleType] = {}
+        for target in self.targets:
+            module = __import__(target, fromlist=["_"]) if isinstance(target, str) else target
+            modules[module.__name__] = module
+            if hasattr(module, "__path__"):
+                prefix = module.__name__ + "."
+                modules.update({name: submodule for name, submodule in list(sys.modules.items())
+                                if name.startswith(prefix) and isinstance(submodule, ModuleType)})
+            # Submodules that are not imported yet are not imported here
+
+        metrics: Dict[CodeType, Metric] = {}
+        for name, module in modules.items():
+            for function in _functions(module, name, set()):
+                code = function.__code__
+                qualified = f"{name}.{function.__qualname__}"
+                if code in metrics or code.co_flags & SUSPENDABLE:
+                    continue
+                elif self.include is not None and not any(fnmatchcase(qualified, pattern) for pattern in self.include):
+                    continue
+                elif self.exclude is not None and any(fnmatchcase(qualified, pattern) for pattern in self.exclude):
+                    continue
+                metrics[code] = self.__registry.metric(qualified)
+        return metrics
+
+    def _monitor(self, metrics: Dict[CodeType, Metric]) -> None:
+        """
+        Record the calls of the instrumented code with `sys.monitoring` (Python 3.12 and later).
+
+        Notes:
+            - Start and return events are enabled on the instrumented code only. Unwinding events cannot be, they are
+            enabled for the whole program but only happen when an exception leaves a function.
+            - The start times are kept on a stack per thread, since the events do not give the frame.
+        """
+        monitoring = sys.monitoring
+        if any(monitoring.get_tool(tool) == "ptymer" for tool in TOOL_IDS):
+            raise RuntimeError("Another Instrumenter is already started!")
+        for tool in TOOL_IDS:
+            if monitoring.get_tool(tool) is None:
+                monitoring.use_tool_id(tool, "ptymer")
+                break
+        else:
+            raise RuntimeError("Every sys.monitoring tool id of profilers is in use!")
+
+        stacks: Dict[int, List[Tuple[CodeType, int]]] = {}
+
+        def started(code: CodeType, offset: int) -> None:
+            stack = stacks.get(get_ident())
+            if stack is None:
+                stack = stacks[get_ident()] = []
+            stack.append((code, perf_counter_ns()))
+
+        def returned(code: CodeType, offset: int, value: Any) -> None:
+            stack = stacks.get(get_ident())
+            if stack and stack[-1][0] is code:
+                metrics[code].record(perf_counter_ns() - stack.pop()[1])
+            # A call running before `start()` has no start time
+
+        def unwound(code: CodeType, offset: int, exception: BaseException) -> None:
+            returned(code, offset, None) if code in metrics else None
+
+        events = monitoring.events
+        monitoring.register_callback(tool, events.PY_START, started)
+        monitoring.register_callback(tool, events.PY_RETURN, returned)
+        monitoring.register_callback(tool, events.PY_UNWIND, unwound)
+        monitoring.set_events(tool, events.PY_UNWIND)
+        [monitoring.set_local_events(tool, code, events.PY_START | events.PY_RETURN) for code in metrics]
+        self.__tool = tool
+
+    @staticmethod
+    def _profiler(metrics: Dict[CodeType, Metric]) -> Callable[[Any, str, Any], None]:
+        """
+        Return the `sys.setprofile()` function recording the calls of the instrumented code.
+
+        Notes:
+            - The start times are indexed by frame, so threads and recursive calls need no bookkeeping. An exception
+            leaving a function is reported as a return too.
+            - `stop()` empties `metrics`, which tells the profiler to remove itself from threads it cannot reach. Calls
+            still running in these threads are not recorded.
+        """
+        starts: Dict[Any, int] = {}
+        setprofile = sys.setprofile
+
+        def profile(frame: Any, event: str, arg: Any) -> None:
+            if event == "call":
+                if frame.f_code in metrics:
+                    starts[frame] = perf_counter_ns()
+                elif not metrics:
+                    setprofile(None)
+            elif event == "return" and starts:
+                started = starts.pop(frame, None)
+                metric = metrics.get(frame.f_code) if started is not None else None
+                if metric is not None:
+                    metric.record(perf_counter_ns() - started)
+                # A thread returning after `stop()` finds `metrics` empty, and records nothing
+        return profile
+
+
+def instrument(target: Union[ModuleType, str, Iterable[Union[ModuleType, str]]],
+               include: Optional[Union[str, Iterable[str]]] = None,
+               exclude: Optional[Union[str, Iterable[str]]] = None,
+               registry: Optional[Registry] = None) -> Instrumenter:
+    """
+    Start timing every call of the functions of modules or packages, in the registry of the timers.
+
+    Args:
+        target (Union[ModuleType, str, Iterable[Union[ModuleType, str]]]): The module or package to instrument, or its
+            name, or an iterable of them.
+        include (Optional[Union[str, Iterable[str]]], optional): Glob patterns of the functions to instrument. Defaults
+            to None (every function).
+        exclude (Optional[Union[str, Iterable[str]]], optional): Glob patterns of the functions left out. Defaults to None.
+        registry (Optional[Registry], optional): The registry where the durations are recorded. Defaults to `REGISTRY`.
+
+    Returns:
+        Instrumenter: The started instrumenter, call `stop()` to switch it off (see `Instrumenter`).
+    """
+    return Instrumenter(target, include, exclude, registry).start()
+
+if __name__ == "__main__":
+    pass
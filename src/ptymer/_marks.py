@@ -0,0 +1,105 @@
+from array import array
+from threading import Lock
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+class Marks:
+    __slots__ = ("offsets", "label_ids", "labels", "_ids", "_lock")
+
+    def __init__(self) -> None:
+        """
+        Initialize the storage of the marks of a timer.
+
+        Notes:
+            - The offsets from the start of the timer are stored in an `array('q')` of nanoseconds, and the
+            labels in an `array('I')` of indexes into `self.labels`, where each distinct label is kept once.
+            A mark takes 12 bytes instead of a list, an integer and a string.
+            - A timer can be shared by threads, so a mark is appended under a lock, and its label index is appended
+            last: `len()` counts the label indexes, so readers never see an offset without its label.
+        """
+        self.offsets: array = array('q')
+        self.label_ids: array = array('I')
+        self.labels: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.label_ids)
+
+    def append(self, nanoseconds: int, label: str) -> None:
+        """
+        Store a mark.
+
+        Args:
+            nanoseconds (int): The offset of the mark from the start of the timer, in nanoseconds.
+            label (str): The observation of the mark.
+        """
+        with self._lock:
+            label_id = self._ids.get(label)
+            if label_id is None:
+                label_id = self._ids[label] = len(self.labels)
+                self.labels.append(label)
+            self.offsets.append(nanoseconds)
+            self.label_ids.append(label_id)
+
+
+class MarksView(Sequence):
+    __slots__ = ("_marks", "_range")
+
+    def __init__(self, marks: Marks, indexes: Optional[range] = None) -> None:
+        """
+        Initialize a read-only view of the marks of a timer.
+
+        Args:
+            marks (Marks): The storage of the marks.
+            indexes (Optional[range]): The marks seen by the view. Defaults to None (every mark, including the ones added later).
+
+        Notes:
+            - Nothing is copied: indexing, slicing, iteration and `len()` read the arrays of the storage, and
+            each mark is returned as a `(timedelta, str)` tuple built on access.
+            - Slices are views too.
+        """
+        self._marks: Marks = marks
+        self._range: Optional[range] = indexes
+
+    def __str__(self) -> str:
+        return f"Class MarksView()\nQuantity of marks: {len(self)}\n"
+
+    def __len__(self) -> int:
+        return len(self._marks) if self._range is None else len(self._range)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tuple[timedelta, str], "MarksView"]:
+        indexes = range(len(self._marks)) if self._range is None else self._range
+        if isinstance(index, slice):
+            return MarksView(self._marks, indexes[index])
+        else:
+            position = indexes[index]
+            return timedelta(microseconds=self._marks.offsets[position] / 1000), self._marks.labels[self._marks.label_ids[position]]
+
+    def __iter__(self) -> Iterator[Tuple[timedelta, str]]:
+        marks = self._marks
+        offsets, label_ids, labels = marks.offsets, marks.label_ids, marks.labels
+        for position in (range(len(marks)) if self._range is None else self._range):
+            yield timedelta(microseconds=offsets[position] / 1000), labels[label_ids[position]]
+
+    def nanoseconds(self, index: int) -> int:
+        """
+        Return the offset of a mark from the start of the timer, without building a `timedelta`.
+
+        Args:
+            index (int): The index of the mark in the view.
+
+        Returns:
+            int: The offset in nanoseconds.
+        """
+        return self._marks.offsets[range(len(self._marks))[index] if self._range is None else self._range[index]]
+
+    def items(self) -> Iterator[Tuple[int, Tuple[timedelta, str]]]:
+        """
+        Iterate over the `(index, mark)` pairs, like the dictionary that `Timer.marks` used to return.
+        """
+        return enumerate(self)
+
+if __name__ == "__main__":
+    pass
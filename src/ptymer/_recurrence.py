@@ -0,0 +1,308 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from math import floor
+from time import time
+from typing import Optional, Tuple, Union
+from dateutil import parser
+
+MONTHS: Tuple[str, ...] = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+# month names accepted by the cron expressions, from 1
+
+WEEKDAYS: Tuple[str, ...] = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+# weekday names accepted by the cron expressions, from 0 (Sunday)
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# cron shortcuts and their expressions
+
+def _epoch(value: Union[datetime, str, int, float], name: str) -> float:
+    """
+    Convert a date to an epoch timestamp.
+
+    Args:
+        value (Union[datetime, str, int, float]): A `datetime`, a date string or an epoch timestamp.
+        name (str): The name of the argument, for the error message.
+
+    Raises:
+        TypeError: If `value` is not a valid date.
+    """
+    try:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        elif isinstance(value, str):
+            return parser.parse(value).timestamp()
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        else:
+            raise TypeError
+    except (TypeError, ValueError, OverflowError):
+        raise TypeError(f"{name} must be a datetime, a date string or an epoch timestamp! Got {value!r}!")
+
+
+class Recurrence(ABC):
+    def __init__(self, until: Optional[Union[datetime, str, int, float]] = None) -> None:
+        """
+        Initialize a recurring schedule of an `Alarm`.
+
+        Args:
+            until (Optional[Union[datetime, str, int, float]]): The date after which the schedule stops. Defaults to None (never).
+
+        Notes:
+            - A recurrence is never expanded into a list of dates: `next_after()` computes the next occurrence when
+            the previous one fires, so a schedule of years costs constant memory.
+        """
+        self.until: Optional[float] = None if until is None else _epoch(until, "Until")
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self._key())
+
+    def _key(self) -> tuple:
+        """
+        Return the values that define the schedule, so copies sent to a worker process are equal to the original.
+        """
+        return (self.until,)
+
+    @abstractmethod
+    def next_after(self, epoch: float) -> Optional[float]:
+        """
+        Return the first occurrence strictly after a time.
+
+        Args:
+            epoch (float): The epoch timestamp.
+
+        Returns:
+            Optional[float]: The epoch timestamp of the occurrence, or `None` if the schedule has ended.
+        """
+
+    def occurrences(self, epoch: float, until: float) -> Tuple[int, Optional[float]]:
+        """
+        Count the occurrences strictly after a time and up to another.
+
+        Args:
+            epoch (float): The epoch timestamp after which occurrences are counted.
+            until (float): The epoch timestamp up to which occurrences are counted.
+
+        Returns:
+            Tuple[int, Optional[float]]: The number of occurrences and the latest of them, `None` if there are none.
+
+        Notes:
+            - Walks the occurrences with `next_after()`, subclasses with a closed form override it.
+        """
+        count, latest = 0, None
+        following = self.next_after(epoch)
+        while following is not None and following <= until:
+            count, latest = count + 1, following
+            following = self.next_after(following)
+        return count, latest
+
+    def _bounded(self, epoch: Optional[float]) -> Optional[float]:
+        """
+        Return the occurrence, or `None` if it is after `self.until`.
+        """
+        return None if epoch is None or (self.until is not None and epoch > self.until) else epoch
+
+
+class Every(Recurrence):
+    def __init__(self,
+                 seconds: Union[int, float],
+                 start: Optional[Union[datetime, str, int, float]] = None,
+                 until: Optional[Union[datetime, str, int, float]] = None) -> None:
+        """
+        Initialize a schedule that occurs every `seconds`, from `start`.
+
+        Args:
+            seconds (Union[int, float]): The interval in seconds. Must be a positive number.
+            start (Optional[Union[datetime, str, int, float]]): The first occurrence. Defaults to None (now).
+            until (Optional[Union[datetime, str, int, float]]): The date after which the schedule stops. Defaults to None (never).
+
+        Raises:
+            TypeError: If `seconds` is not numeric, or if `start` or `until` is not a valid date.
+            ValueError: If `seconds` is not greater than 0.
+
+        Notes:
+            - The next occurrence is `start + k * seconds` for the smallest suitable `k`, computed in O(1).
+        """
+        if not isinstance(seconds, (int, float)) or isinstance(seconds, bool):
+            raise TypeError(f"Seconds must be a number! Got {type(seconds)}!")
+        elif seconds <= 0:
+            raise ValueError(f"Seconds must be greater than 0! Got {seconds}!")
+        else: self.seconds: Union[int, float] = seconds
+
+        self.start: float = time() if start is None else _epoch(start, "Start")
+        super().__init__(until)
+
+    def _key(self) -> tuple:
+        return (self.seconds, self.start, self.until)
+
+    def __repr__(self) -> str:
+        return f"Every({self.seconds!r}, start={datetime.fromtimestamp(self.start)!s})"
+
+    def next_after(self, epoch: float) -> Optional[float]:
+        return self._bounded(self.start + self._index_after(epoch) * self.seconds)
+
+    def occurrences(self, epoch: float, until: float) -> Tuple[int, Optional[float]]:
+        first = self._index_after(epoch)
+        until = until if self.until is None else min(until, self.until)
+        last = self._index_after(until) - 1
+        # Indexes of the first and last occurrences, found like `next_after()` so both agree, in O(1)
+        if last < first:
+            return 0, None
+        return last - first + 1, self.start + last * self.seconds
+
+    def _index_after(self, epoch: float) -> int:
+        """
+        Return the index `k` of the first occurrence `start + k * seconds` strictly after a time.
+
+        Notes:
+            - The division may round an occurrence just below its own index, so the index is corrected against
+            the occurrence itself: an occurrence is never returned twice.
+        """
+        if epoch < self.start:
+            return 0
+        index = floor((epoch - self.start) / self.seconds) + 1
+        while self.start + index * self.seconds <= epoch:
+            index += 1
+        while index > 0 and self.start + (index - 1) * self.seconds > epoch:
+            index -= 1
+        return index
+
+
+class Cron(Recurrence):
+    def __init__(self, expression: str, until: Optional[Union[datetime, str, int, float]] = None) -> None:
+        """
+        Initialize a schedule from a cron expression, in local time.
+
+        Args:
+            expression (str): Five fields (`minute hour day-of-month month day-of-week`), or six with the seconds first,
+                or one of the `@hourly`, `@daily`, `@weekly`, `@monthly` and `@yearly` shortcuts.
+            until (Optional[Union[datetime, str, int, float]]): The date after which the schedule stops. Defaults to None (never).
+
+        Raises:
+            TypeError: If `expression` is not a string, or if `until` is not a valid date.
+            ValueError: If `expression` is not a valid cron expression.
+
+        Notes:
+            - Each field accepts `*`, numbers, `a-b` ranges, `/step` steps and comma-separated lists. Months and weekdays
+            accept their three-letter English names, and Sunday is 0 or 7.
+            - Like cron, when both the day of the month and the day of the week are restricted, a day matching either one
+            matches. As in Vixie cron, a field starting with `*`, such as `*/2`, is not restricted: the days must then
+            match both fields.
+            - Each field is kept as a sorted tuple of values: the next occurrence is found by jumping from field to field
+            with a binary search, in a few steps whatever the expression.
+        """
+        if not isinstance(expression, str):
+            raise TypeError(f"Expression must be a string! Got {type(expression)}!")
+        self.expression: str = expression
+
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) == 5:
+            fields = ["0"] + fields
+        elif len(fields) != 6:
+            raise ValueError(f"Cron expression must have 5 or 6 fields! Got {expression!r}!")
+
+        self.seconds: Tuple[int, ...] = self._parse(fields[0], 0, 59)
+        self.minutes: Tuple[int, ...] = self._parse(fields[1], 0, 59)
+        self.hours: Tuple[int, ...] = self._parse(fields[2], 0, 23)
+        self.days: Tuple[int, ...] = self._parse(fields[3], 1, 31)
+        self.months: Tuple[int, ...] = self._parse(fields[4], 1, 12, MONTHS, 1)
+        self.weekdays: Tuple[int, ...] = tuple(sorted({day % 7 for day in self._parse(fields[5], 0, 7, WEEKDAYS, 0)}))
+        self.__any_day: bool = fields[3].startswith("*")
+        self.__any_weekday: bool = fields[5].startswith("*")
+        super().__init__(until)
+
+    def _key(self) -> tuple:
+        return (self.expression, self.until)
+
+    def __repr__(self) -> str:
+        return f"Cron({self.expression!r})"
+
+    def _parse(self, field: str, lowest: int, highest: int, names: Tuple[str, ...] = (), offset: int = 0) -> Tuple[int, ...]:
+        """
+        Return the sorted values of a field.
+
+        Raises:
+            ValueError: If the field is not valid.
+        """
+        def value(text: str) -> int:
+            text = text.lower()
+            number = names.index(text) + offset if text in names else int(text)
+            if not lowest <= number <= highest:
+                raise ValueError
+            return number
+
+        values = set()
+        try:
+            for part in field.split(","):
+                span, _, step = part.partition("/")
+                step = int(step) if step else 1
+                if step <= 0:
+                    raise ValueError
+                if span == "*":
+                    first, last = lowest, highest
+                elif "-" in span:
+                    first, last = (value(bound) for bound in span.split("-", 1))
+                else:
+                    first = value(span)
+                    last = highest if step > 1 or "/" in part else first
+                values.update(range(first, last + 1, step))
+        except ValueError:
+            raise ValueError(f"Invalid cron field {field!r} in {self.expression!r}!")
+        if not values:
+            raise ValueError(f"Invalid cron field {field!r} in {self.expression!r}!")
+        return tuple(sorted(values))
+
+    def _day_matches(self, date: datetime) -> bool:
+        """
+        Check the day of the month and the day of the week of a date.
+        """
+        day = date.day in self.days
+        weekday = (date.isoweekday() % 7) in self.weekdays
+        if self.__any_day or self.__any_weekday:
+            return day and weekday
+        return day or weekday
+
+    @staticmethod
+    def _following(values: Tuple[int, ...], current: int) -> Optional[int]:
+        """
+        Return the first value greater than `current`, or `None`.
+        """
+        index = bisect_left(values, current + 1)
+        return values[index] if index < len(values) else None
+
+    def next_after(self, epoch: float) -> Optional[float]:
+        date = datetime.fromtimestamp(floor(epoch) + 1)
+        limit = date.year + 28
+        # The calendar repeats every 28 years, an expression without occurrence until then has none (e.g. February 30)
+
+        while date.year <= limit:
+            if date.month not in self.months:
+                month = self._following(self.months, date.month)
+                date = datetime(date.year, month, 1) if month else datetime(date.year + 1, self.months[0], 1)
+            elif not self._day_matches(date):
+                date = datetime(date.year, date.month, date.day) + timedelta(days=1)
+            elif date.hour not in self.hours:
+                hour = self._following(self.hours, date.hour)
+                date = date.replace(hour=hour, minute=0, second=0) if hour is not None else datetime(date.year, date.month, date.day) + timedelta(days=1)
+            elif date.minute not in self.minutes:
+                minute = self._following(self.minutes, date.minute)
+                date = date.replace(minute=minute, second=0) if minute is not None else date.replace(minute=0, second=0) + timedelta(hours=1)
+            elif date.second not in self.seconds:
+                second = self._following(self.seconds, date.second)
+                date = date.replace(second=second) if second is not None else date.replace(second=0) + timedelta(minutes=1)
+            else:
+                return self._bounded(date.timestamp())
+        return None
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,537 @@
+from typing import Callable, Optional, Dict, List, Union, Any
+from multiprocessing import Process, Pipe, freeze_support
+from threading import Thread, Event, Lock
+from itertools import count
+from heapq import heappush, heappop
+from time import monotonic, time
+from psutil import Process as psProcess, pid_exists
+from ._trace import traced, target_name
+from ._recurrence import Recurrence
+from ._schedules import ScheduleQueue
+from ._dispatch import Dispatcher, capture, run_function
+from pickle import PicklingError
+
+class Handle:
+    def __init__(self, scheduler: "Scheduler", key: int, dispatch_key: Optional[int] = None) -> None:
+        """
+        Initialize a handle for a timer hosted by a `Scheduler`.
+
+        Args:
+            scheduler (Scheduler): The scheduler that hosts the timer.
+            key (int): The identifier of the timer inside the scheduler worker.
+            dispatch_key (Optional[int]): The key of the callbacks of the timer in the `Dispatcher` of the main process,
+                which receives its firings. Default is None.
+
+        Notes:
+            - Handles are created by `Scheduler._submit()`, they are not meant to be instantiated directly.
+            - The `__done` event is set by the scheduler when the timer finishes or is cancelled.
+        """
+        self.__scheduler: "Scheduler" = scheduler
+        self.__key: int = key
+        self.__done: Event = Event()
+        self.dispatch_key: Optional[int] = dispatch_key
+
+    def __str__(self) -> str:
+        return f"Class Handle()\nKey: {self.__key}\nActive: {self.active}\nProcess id: {self.pid if self.active else None}\n"
+
+    @property
+    def key(self) -> int:
+        """
+        Return the identifier of the timer inside the scheduler worker.
+
+        Returns:
+            int: The timer identifier.
+        """
+        return self.__key
+
+    @property
+    def pid(self) -> int:
+        """
+        Return the process ID of the scheduler worker hosting the timer.
+
+        Returns:
+            int: The process ID of the scheduler worker.
+
+        Raises:
+            AttributeError: If the scheduler is not running.
+        """
+        return self.__scheduler.pid
+
+    @property
+    def active(self) -> bool:
+        """
+        Check if the timer is still pending inside the scheduler.
+
+        Returns:
+            bool: `True` if the timer has neither finished nor been cancelled and the worker is alive, `False` otherwise.
+        """
+        return not self.__done.is_set() and self.__scheduler.status
+
+    def reschedule(self, seconds: Union[int, float]) -> None:
+        """
+        Move the deadline of a countdown timer to `seconds` from now.
+
+        Args:
+            seconds (Union[int, float]): The new remaining time in seconds.
+
+        Raises:
+            RuntimeError: If the timer is not active.
+        """
+        if not self.active:
+            raise RuntimeError("Handle is not active!")
+        else:
+            self.__scheduler._send(("reschedule", self.__key, float(seconds)))
+
+    def pause(self) -> None:
+        """
+        Suspend a countdown timer until `reschedule()`.
+
+        Raises:
+            RuntimeError: If the timer is not active.
+        """
+        if not self.active:
+            raise RuntimeError("Handle is not active!")
+        else:
+            self.__scheduler._send(("pause", self.__key))
+
+    def edit(self, removed: Optional[Union[float, Recurrence]], added: Optional[Union[float, Recurrence]]) -> None:
+        """
+        Replace a schedule of an alarm by another one.
+
+        Args:
+            removed (Optional[Union[float, Recurrence]]): The epoch timestamp or recurring schedule to remove, or `None`.
+            added (Optional[Union[float, Recurrence]]): The epoch timestamp or recurring schedule to add, or `None`.
+
+        Raises:
+            RuntimeError: If the timer is not active.
+        """
+        if not self.active:
+            raise RuntimeError("Handle is not active!")
+        else:
+            self.__scheduler._send(("edit", self.__key, removed, added))
+
+    def cancel(self) -> None:
+        """
+        Cancel the timer.
+
+        Raises:
+            RuntimeError: If the timer is not active.
+
+        Notes:
+            - The handle is marked as done immediately, the worker drops the timer when it receives the command.
+        """
+        if not self.active:
+            raise RuntimeError("Handle is not active!")
+        else:
+            self.__scheduler._cancel(self.__key)
+            self._finish()
+
+    def wait(self) -> None:
+        """
+        Block until the timer finishes or is cancelled.
+        """
+        self.__done.wait()
+
+    def _finish(self) -> None:
+        """
+        Mark the timer as done and release the threads waiting on it.
+        """
+        self.__done.set()
+
+
+class Scheduler:
+    __shared: Dict[int, "Scheduler"] = {}
+    # shared scheduler of each parent process, indexed by process id
+
+    __shared_lock: Lock = Lock()
+    # lock guarding the creation of the shared schedulers
+
+    def __init__(self, visibility: bool = False) -> None:
+        """
+        Initialize a scheduler that hosts many timers in a single background process.
+
+        Args:
+            visibility (bool): Determines if messages should be displayed. Default is False.
+
+        Raises:
+            TypeError: If `visibility` is not a boolean.
+
+        Notes:
+            - Every `HourGlass` and `Alarm` submitted to the scheduler runs in the same worker process, on one timer queue.
+            - The `__commands` connection sends commands to the worker and `__events` receives its notifications.
+            - The `__handles` dictionary stores the handles of the timers that are still pending.
+            - The `__listener` thread receives the notifications of the worker and finishes the respective handles.
+        """
+        if not isinstance(visibility, bool):
+            raise TypeError(f"Visibility must be a boolean! Got {type(visibility)}!")
+        else: self.visibility: bool = visibility
+
+        self.__pid: Optional[int] = None
+        self.__process: Optional[Process] = None
+        self.__commands = None
+        self.__events = None
+        self.__listener: Optional[Thread] = None
+        self.__handles: Dict[int, Handle] = {}
+        self.__keys = count(1)
+        self.__lock: Lock = Lock()
+
+    def __str__(self) -> str:
+        return f"Class Scheduler()\nVisibility: {self.visibility}\nPending timers: {len(self.__handles)}\nProcess id: {self.__pid if self.status else None}\n"
+
+    @classmethod
+    def shared(cls) -> "Scheduler":
+        """
+        Return the shared scheduler of the current process, creating it if needed.
+
+        Returns:
+            Scheduler: The scheduler shared by every `HourGlass` and `Alarm` created with `shared=True`.
+
+        Notes:
+            - There is one shared scheduler per parent process, a forked child gets its own.
+            - The worker process is started lazily, on the first submitted timer.
+        """
+        from os import getpid
+
+        with cls.__shared_lock:
+            scheduler = cls.__shared.get(getpid())
+            if scheduler is None:
+                scheduler = cls.__shared[getpid()] = cls()
+            return scheduler
+
+    def start(self) -> "Scheduler":
+        """
+        Start the scheduler worker process.
+
+        Returns:
+            Scheduler: The current instance of the `Scheduler` class.
+
+        Raises:
+            RuntimeError: If the scheduler is already running.
+
+        Notes:
+            - This method uses `freeze_support()` to ensure compatibility with Windows.
+            - The worker process is started as a daemon process.
+        """
+        from os import getpid
+
+        freeze_support()
+        # Freeze support for Windows
+
+        if self.status:
+            raise RuntimeError("Scheduler already running!")
+        else:
+            commands_reader, commands_writer = Pipe(duplex=False)
+            events_reader, events_writer = Pipe(duplex=False)
+
+            process = Process(target=self._serve, args=(commands_reader, events_writer, getpid()), daemon=True)
+            process.start()
+            commands_reader.close()
+            events_writer.close()
+            # The worker ends are only used by the child process
+
+            self.__commands = commands_writer
+            self.__events = events_reader
+            self.__pid = process.pid
+            self.__process = process
+
+            self.__listener = Thread(target=self._listen, args=(events_reader,), daemon=True)
+            self.__listener.start()
+
+            print("Scheduler started!") if self.visibility else None
+            return self
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler and cancel every pending timer.
+
+        Raises:
+            RuntimeError: If the scheduler is not running.
+        """
+        if not self.status:
+            raise RuntimeError("There is no scheduler running!")
+        else:
+            try:
+                self._send(("halt",))
+            except OSError:
+                pass
+            process = psProcess(self.__pid)
+            process.terminate()
+            self.__process.join()
+            self.__commands.close()
+            self.__pid = None
+            self.__process = None
+            self.__commands = None
+            self._finish_all()
+
+            print("Scheduler stopped!") if self.visibility else None
+
+    @property
+    def pid(self) -> int:
+        """
+        Return the process ID of the scheduler worker.
+
+        Returns:
+            int: The process ID of the scheduler worker.
+
+        Raises:
+            AttributeError: If the scheduler is not running.
+        """
+        if not self.status:
+            raise AttributeError("There is no scheduler running!")
+        else:
+            return int(self.__pid)
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the scheduler worker is running.
+
+        Returns:
+            bool: `True` if the worker process is active, `False` otherwise.
+        """
+        if self.__pid and pid_exists(self.__pid):
+            return True
+        else:
+            return False
+
+    def _send(self, command: tuple) -> None:
+        """
+        Send a command to the worker process.
+
+        Args:
+            command (tuple): The command, its first element is the command name.
+        """
+        with self.__lock:
+            self.__commands.send(command)
+
+    def _submit(self,
+                kind: str,
+                when: Union[float, List[Union[float, Recurrence]]],
+                target: Optional[Callable],
+                args: Optional[tuple],
+                visibility: bool,
+                dispatch: str = "suspend",
+                dispatch_key: Optional[int] = None,
+                misfire: str = "coalesce",
+                grace: Union[int, float] = 1) -> Handle:
+        """
+        Submit a timer to the worker and return its handle.
+
+        Args:
+            kind (str): `"hourglass"` for a countdown or `"alarm"` for a list of schedules.
+            when (Union[float, List[Union[float, Recurrence]]]): The countdown in seconds, or the schedules as epoch
+                timestamps and recurring schedules.
+            target (Optional[Callable]): The function to be executed when the timer fires.
+            args (Optional[tuple]): The arguments of the function.
+            visibility (bool): Determines if the worker shows messages for this timer.
+            dispatch (str): The dispatch policy of the timer (see `Dispatcher`). Default is "suspend".
+            dispatch_key (Optional[int]): The key of the callbacks of the timer in the `Dispatcher`, which receives
+                the outcome of each firing, or runs the function with the `"queue"` policy. Default is None.
+            misfire (str): The misfire policy of an alarm (see `ScheduleQueue.due()`). Default is "coalesce".
+            grace (Union[int, float]): The lateness in seconds up to which a schedule of an alarm fires as usual. Default is 1.
+
+        Returns:
+            Handle: The handle of the submitted timer.
+
+        Notes:
+            - The worker is started if it is not running yet.
+            - `target` and `args` are pickled to be sent to the worker, so they must be picklable, except with the
+            `"queue"` policy: the worker only notifies the firing, and the function runs on the `Dispatcher` pool.
+        """
+        if not self.status:
+            self.start()
+
+        key = next(self.__keys)
+        handle = Handle(self, key, dispatch_key)
+        if dispatch == "queue":
+            target, args = None, None
+        with self.__lock:
+            self.__handles[key] = handle
+            self.__commands.send(("add", key, kind, when, target, args, visibility, dispatch, misfire, grace))
+        return handle
+
+    def _cancel(self, key: int) -> None:
+        """
+        Drop a pending timer from the worker.
+
+        Args:
+            key (int): The identifier of the timer.
+        """
+        with self.__lock:
+            self.__handles.pop(key, None)
+            self.__commands.send(("cancel", key))
+
+    def _listen(self, events) -> None:
+        """
+        Receive the notifications of the worker process.
+
+        Args:
+            events (Connection): The connection where the worker sends its notifications.
+
+        Notes:
+            - Runs in a daemon thread of the parent process until the worker ends.
+            - `fire`, `result` and `misfire` events are passed to the `Dispatcher`, under the key of the callbacks of the handle,
+            and a `done` event finishes the handle.
+            - When the worker ends, every pending handle is finished.
+        """
+        while True:
+            try:
+                message = events.recv()
+                event, key = message[0], message[1]
+            except (EOFError, OSError):
+                break
+            handle = self.__handles.get(key)
+            dispatch_key = handle.dispatch_key if handle else None
+            if event == "fire" and dispatch_key:
+                Dispatcher.shared().queue(dispatch_key)
+            elif event == "result" and dispatch_key:
+                Dispatcher.shared().complete(dispatch_key, message[2])
+            elif event == "misfire" and dispatch_key:
+                Dispatcher.shared().misfire(dispatch_key, message[2])
+            elif event == "done":
+                with self.__lock:
+                    handle = self.__handles.pop(key, None)
+                handle._finish() if handle else None
+                Dispatcher.shared().release(dispatch_key) if dispatch_key else None
+        events.close()
+        self._finish_all()
+
+    def _finish_all(self) -> None:
+        """
+        Finish every pending handle.
+        """
+        with self.__lock:
+            handles, self.__handles = list(self.__handles.values()), {}
+        [handle._finish() for handle in handles]
+
+    @staticmethod
+    def _serve(commands, events, mainPid: int) -> None:
+        """
+        Run the timer queue of the worker process.
+
+        Args:
+            commands (Connection): The connection where the parent sends its commands.
+            events (Connection): The connection where the worker notifies finished timers.
+            mainPid (int): The process ID of the main process.
+
+        Notes:
+            - Every timer is kept in a single min-heap ordered by its deadline on `time.monotonic()`.
+            - The worker blocks on `commands.poll()` with a timeout equal to the time left until the earliest deadline,
+            so it wakes up either on a new command or when a timer is due.
+            - Alarm schedules are converted from epoch to monotonic time and checked against the wall clock again when due.
+            Every schedule at or before the wall clock is due, and those missed by more than the grace period follow
+            the misfire policy of the alarm and are reported with a `misfire` event.
+            The schedules of an alarm are kept in their own `ScheduleQueue`, where a recurring schedule is pushed back at its
+            next occurrence after it fires, and where `edit` commands add and remove schedules in O(log n).
+            - A rescheduled or cancelled timer leaves a stale entry in the heap, which is skipped when popped.
+            - With the `"suspend"` dispatch policy, the main process is suspended while a callback is executed, like a
+            dedicated `HourGlass` or `Alarm` process. With `"queue"`, the worker sends a `fire` event instead.
+        """
+        process = psProcess(mainPid)
+        queue: list = []
+        # (monotonic deadline, sequence, key)
+
+        timers: Dict[int, list] = {}
+        # key -> [sequence, kind, when, target, args, visibility, dispatch, misfire, grace], alarm schedules are a `ScheduleQueue` of epochs and recurrences
+
+        sequence = count()
+
+        def push(key: int, delay: float) -> None:
+            seq = next(sequence)
+            timers[key][0] = seq
+            heappush(queue, (monotonic() + delay, seq, key))
+
+        def first_epoch(entry: Union[float, Recurrence], now: float) -> Optional[float]:
+            if isinstance(entry, Recurrence):
+                return entry.next_after(now - 1)
+            return entry if entry > now - 1 else None
+        # A date whose second has passed is never triggered
+
+        def fire(key: int, kind: str, target: Optional[Callable], args: Optional[tuple], visibility: bool, dispatch: str) -> None:
+            if dispatch == "queue":
+                events.send(("fire", key))
+                return
+            process.suspend() if dispatch == "suspend" else None
+            with traced(target_name(kind, target), kind.lower()):
+                outcome = capture(run_function, target, args, True)
+            process.resume() if dispatch == "suspend" else None
+            try:
+                events.send(("result", key, outcome))
+            except (PicklingError, TypeError, AttributeError) as e:
+                events.send(("result", key, (False, PicklingError(f"The result could not be pickled: {e}"))))
+
+        while True:
+            timeout = max(queue[0][0] - monotonic(), 0) if queue else None
+            try:
+                if commands.poll(timeout):
+                    command = commands.recv()
+                    if command[0] == "add":
+                        _, key, kind, when, target, args, visibility, dispatch, misfire, grace = command
+                        if kind == "alarm":
+                            now, schedules, when = time(), when, ScheduleQueue()
+                            for entry in schedules:
+                                epoch = first_epoch(entry, now)
+                                when.push(epoch, entry) if epoch is not None else None
+                            if when.peek() is None:
+                                events.send(("done", key))
+                                continue
+                        timers[key] = [None, kind, when, target, args, visibility, dispatch, misfire, grace]
+                        push(key, when.peek() - time() if kind == "alarm" else when)
+                    elif command[0] == "reschedule" and command[1] in timers:
+                        push(command[1], command[2])
+                    elif command[0] == "pause" and command[1] in timers:
+                        timers[command[1]][0] = None
+                        # Its entry in the heap becomes stale until it is rescheduled
+                    elif command[0] == "edit" and command[1] in timers and timers[command[1]][1] == "alarm":
+                        _, key, removed, added = command
+                        when = timers[key][2]
+                        when.remove(removed) if removed is not None else None
+                        epoch = first_epoch(added, time()) if added is not None else None
+                        when.push(epoch, added) if epoch is not None else None
+                        if when.peek() is None:
+                            del timers[key]
+                            events.send(("done", key))
+                        else:
+                            push(key, when.peek() - time())
+                    elif command[0] == "cancel":
+                        timers.pop(command[1], None)
+                    elif command[0] == "halt":
+                        break
+                    continue
+            except (EOFError, OSError):
+                break
+            # Commands are handled before the due timers
+
+            _, seq, key = heappop(queue)
+            timer = timers.get(key)
+            if timer is None or timer[0] != seq:
+                continue
+            # Stale entry of a cancelled or rescheduled timer
+
+            _, kind, when, target, args, visibility, dispatch, misfire, grace = timer
+            if kind == "alarm":
+                now = time()
+                if when.peek() > now:
+                    push(key, when.peek() - now)
+                    continue
+                # The wall clock is behind the monotonic estimate
+
+                for epoch, schedule, fires, missed in when.due(now, misfire, grace):
+                    if fires:
+                        print("Alarm triggered!") if visibility else None
+                        fire(key, "Alarm", target, args, visibility, dispatch)
+                    if now - epoch > grace:
+                        events.send(("misfire", key, (epoch, now - epoch, fires, missed)))
+
+                if when.peek() is not None:
+                    push(key, when.peek() - time())
+                    continue
+            else:
+                print("Time is up!" if pid_exists(mainPid) else "Main process interrupted!") if visibility else None
+                fire(key, "HourGlass", target, args, visibility, dispatch)
+
+            del timers[key]
+            events.send(("done", key))
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,425 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
+from datetime import datetime
+from heapq import heappop, heappush
+from math import floor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from dateutil import parser
+from ._recurrence import Recurrence
+
+MISFIRES: Tuple[str, ...] = ("all", "coalesce", "skip")
+# what an alarm does with the occurrences it missed by more than its grace period:
+#   "all": each one fires, late
+#   "coalesce": they fire once, at the latest of them
+#   "skip": none of them fires
+
+def check_misfire(misfire: str) -> str:
+    """
+    Validate a misfire policy.
+
+    Args:
+        misfire (str): The policy, one of `MISFIRES`.
+
+    Returns:
+        str: The policy.
+
+    Raises:
+        TypeError: If `misfire` is not a string.
+        ValueError: If `misfire` is not a known policy.
+    """
+    if not isinstance(misfire, str):
+        raise TypeError(f"Misfire must be a string! Got {type(misfire)}!")
+    elif misfire not in MISFIRES:
+        raise ValueError(f"Unknown misfire policy {misfire!r}! Choose one of {', '.join(MISFIRES)}.")
+    else:
+        return misfire
+
+def parse_date(value: Union[datetime, str, int, float, Tuple[int, ...]], cache: Optional[Dict[str, datetime]] = None) -> datetime:
+    """
+    Convert a schedule to a `datetime` truncated to the second.
+
+    Args:
+        value (Union[datetime, str, int, float, Tuple[int, ...]]): A `datetime`, a date string, an epoch timestamp or
+            a tuple of `datetime` arguments.
+        cache (Optional[Dict[str, datetime]]): The dates of the strings already parsed. Defaults to None.
+
+    Returns:
+        datetime: The date of the schedule.
+
+    Raises:
+        TypeError: If `value` is not a valid date.
+
+    Notes:
+        - Strings go through `datetime.fromisoformat()` first, and through `dateutil.parser.parse()` only if it
+        fails. Repeated strings are parsed once thanks to `cache`.
+    """
+    try:
+        if isinstance(value, datetime):
+            return value.replace(microsecond=0)
+        elif isinstance(value, str):
+            date = cache.get(value) if cache is not None else None
+            if date is None:
+                try:
+                    date = datetime.fromisoformat(value)
+                except ValueError:
+                    date = parser.parse(value)
+                date = date.replace(microsecond=0)
+                if cache is not None:
+                    cache[value] = date
+            return date
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(floor(value))
+        elif isinstance(value, tuple):
+            return datetime(*value)
+            # converting tuple(d, h, m, s) to datetime object
+        else:
+            raise TypeError
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise TypeError(f"Invalid datetime object: {value}")
+
+
+class Schedules(Sequence):
+    __slots__ = ("epochs", "rules", "first")
+
+    def __init__(self, epochs: array, rules: List[Recurrence]) -> None:
+        """
+        Initialize the compact schedules of an alarm.
+
+        Args:
+            epochs (array): The dates as a sorted `array('d')` of epoch timestamps.
+            rules (List[Recurrence]): The recurring schedules.
+
+        Notes:
+            - Built by `Schedules.load()` for `Alarm.bulk()`: a date takes 8 bytes instead of a `datetime` object and
+            a heap entry, and the alarm loop walks the sorted array with a cursor.
+            - As a sequence it shows the pending dates as `datetime` objects, then the recurring schedules. The fired
+            dates are dropped by moving `first` forward.
+        """
+        self.epochs: array = epochs
+        self.rules: List[Recurrence] = rules
+        self.first: int = 0
+
+    @classmethod
+    def load(cls, schedules: Iterable[Union[datetime, str, int, float, Tuple[int, ...], Recurrence]]) -> "Schedules":
+        """
+        Load schedules from any iterable, including a generator.
+
+        Args:
+            schedules (Iterable[Union[datetime, str, int, float, Tuple[int, ...], Recurrence]]): The schedules.
+
+        Returns:
+            Schedules: The schedules, sorted.
+
+        Raises:
+            TypeError: If `schedules` is not iterable or if one of them is not a valid date.
+        """
+        if isinstance(schedules, (str, bytes)) or not isinstance(schedules, Iterable):
+            raise TypeError(f"Schedules must be an iterable! Got {type(schedules)}!")
+
+        cache: Dict[str, float] = {}
+        epochs, rules = array('d'), []
+        for value in schedules:
+            if isinstance(value, Recurrence):
+                rules.append(value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                epochs.append(floor(value))
+            elif isinstance(value, str) and value in cache:
+                epochs.append(cache[value])
+            else:
+                epoch = parse_date(value).timestamp()
+                if isinstance(value, str):
+                    cache[value] = epoch
+                epochs.append(epoch)
+        return cls(array('d', sorted(epochs)), rules)
+
+    def __str__(self) -> str:
+        return f"Class Schedules()\nDates: {len(self.epochs) - self.first}\nRecurring: {len(self.rules)}\n"
+
+    def __len__(self) -> int:
+        return len(self.epochs) - self.first + len(self.rules)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[datetime, Recurrence, List[Union[datetime, Recurrence]]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(len(self))[index]]
+        # A slice is a list, like the slice of the list of schedules it stands for
+        index = range(len(self))[index]
+        dates = len(self.epochs) - self.first
+        return datetime.fromtimestamp(self.epochs[self.first + index]) if index < dates else self.rules[index - dates]
+
+    def __iter__(self) -> Iterator[Union[datetime, Recurrence]]:
+        epochs = self.epochs
+        for position in range(self.first, len(epochs)):
+            yield datetime.fromtimestamp(epochs[position])
+        yield from list(self.rules)
+
+    def __contains__(self, value: Any) -> bool:
+        if isinstance(value, Recurrence):
+            return value in self.rules
+        elif not isinstance(value, datetime):
+            return False
+        epoch = value.timestamp()
+        position = self.pending(epoch)
+        return position < len(self.epochs) and self.epochs[position] == epoch
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, Schedules)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def pending(self, epoch: float) -> int:
+        """
+        Return the position of the first date at or after a time.
+
+        Args:
+            epoch (float): The epoch timestamp.
+        """
+        return max(bisect_left(self.epochs, epoch), self.first)
+
+    def add(self, value: Union[datetime, Recurrence]) -> None:
+        """
+        Add a schedule.
+
+        Args:
+            value (Union[datetime, Recurrence]): The schedule.
+
+        Notes:
+            - A date is inserted in order with a binary search.
+        """
+        if isinstance(value, Recurrence):
+            self.rules.append(value)
+        else:
+            insort(self.epochs, value.timestamp(), self.first)
+
+    def remove(self, value: Union[datetime, Recurrence]) -> None:
+        """
+        Remove a schedule.
+
+        Args:
+            value (Union[datetime, Recurrence]): The schedule.
+
+        Raises:
+            ValueError: If the schedule is not found.
+
+        Notes:
+            - Removing the earliest date, which is what a firing does, is O(1).
+        """
+        if isinstance(value, Recurrence):
+            self.rules.remove(value)
+            return
+        epoch = value.timestamp()
+        position = self.pending(epoch)
+        if position >= len(self.epochs) or self.epochs[position] != epoch:
+            raise ValueError(f"{value} not in schedules")
+        elif position == self.first:
+            self.first += 1
+        else:
+            del self.epochs[position]
+
+    def drop_until(self, position: int) -> None:
+        """
+        Remove the dates before a position.
+        """
+        self.first = max(self.first, position)
+
+
+class Cursor:
+    __slots__ = ("epochs", "position")
+
+    def __init__(self, epochs: array, position: int = 0) -> None:
+        """
+        Initialize the position of an alarm run in the sorted dates of its `Schedules`.
+
+        Args:
+            epochs (array): A copy of the pending dates, so the schedules can change while the alarm runs.
+            position (int): The position of the next date. Defaults to 0.
+
+        Notes:
+            - The cursor has a single entry in the heap of the alarm, at the date of its position.
+        """
+        self.epochs: array = epochs
+        self.position: int = position
+
+    @property
+    def epoch(self) -> Optional[float]:
+        """
+        Return the date at the position, or `None` past the last date.
+        """
+        return self.epochs[self.position] if self.position < len(self.epochs) else None
+
+    def count(self, epoch: float) -> int:
+        """
+        Return how many times a date is pending.
+        """
+        return bisect_right(self.epochs, epoch, self.position) - bisect_left(self.epochs, epoch, self.position)
+
+
+class ScheduleQueue:
+    __slots__ = ("heap", "cursor", "live", "cancelled", "pending", "sequence")
+
+    def __init__(self) -> None:
+        """
+        Initialize the pending schedules of an alarm run.
+
+        Notes:
+            - The schedules are a min-heap of `(epoch, sequence, schedule)`, where the sequence breaks ties between
+            equal epochs. A recurring schedule has a single entry, its next occurrence, and so do the sorted dates
+            of `Schedules`, through a `Cursor`.
+            - Removing a schedule is O(1): it is counted in `cancelled`, and its entry is dropped when it reaches
+            the top of the heap. Dates are identified by their epoch, so copies sent to a worker process match.
+        """
+        self.heap: list = []
+        self.cursor: Optional[Cursor] = None
+        self.live: Dict[Any, int] = {}
+        # number of entries of each schedule in the heap
+        self.cancelled: Dict[Any, int] = {}
+        # number of entries of each schedule to drop
+        self.pending: int = 0
+        self.sequence: int = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of pending occurrences, a recurring schedule counting once.
+        """
+        return self.pending
+
+    @staticmethod
+    def _key(schedule: Any) -> Any:
+        """
+        Return the identity of a schedule: the epoch of a date, or the recurring schedule itself.
+        """
+        return schedule.timestamp() if isinstance(schedule, datetime) else schedule
+
+    def push(self, epoch: float, schedule: Union[datetime, float, Recurrence]) -> None:
+        """
+        Add an occurrence of a schedule, in O(log n).
+
+        Args:
+            epoch (float): The epoch timestamp of the occurrence.
+            schedule (Union[datetime, float, Recurrence]): The schedule.
+        """
+        heappush(self.heap, (epoch, self.sequence, schedule))
+        self.sequence += 1
+        key = self._key(schedule)
+        self.live[key] = self.live.get(key, 0) + 1
+        self.pending += 1
+
+    def walk(self, cursor: Cursor) -> None:
+        """
+        Add the sorted dates of a cursor, with a single heap entry.
+        """
+        if cursor.epoch is not None:
+            self.cursor = cursor
+            heappush(self.heap, (cursor.epoch, self.sequence, cursor))
+            self.sequence += 1
+            self.pending += len(cursor.epochs) - cursor.position
+
+    def remove(self, schedule: Union[datetime, float, Recurrence]) -> bool:
+        """
+        Remove a pending occurrence of a schedule, in O(1) (O(log n) for the dates of a cursor).
+
+        Returns:
+            bool: `True` if an occurrence was pending, `False` otherwise.
+        """
+        key = self._key(schedule)
+        left = self.live.get(key, 0) - self.cancelled.get(key, 0)
+        if self.cursor is not None and isinstance(key, float):
+            left += self.cursor.count(key)
+        if left <= 0:
+            return False
+        self.cancelled[key] = self.cancelled.get(key, 0) + 1
+        self.pending -= 1
+        return True
+
+    def peek(self) -> Optional[float]:
+        """
+        Return the epoch timestamp of the earliest pending occurrence, or `None` if there is none.
+        """
+        heap, cancelled = self.heap, self.cancelled
+        while heap:
+            epoch, _, schedule = heap[0]
+            key = epoch if isinstance(schedule, Cursor) else self._key(schedule)
+            if not cancelled.get(key):
+                return epoch
+            cancelled[key] -= 1
+            self._pop()
+        return None
+
+    def pop(self) -> Tuple[float, Union[datetime, float, Recurrence]]:
+        """
+        Remove the earliest pending occurrence, after `peek()`.
+
+        Returns:
+            Tuple[float, Union[datetime, float, Recurrence]]: The epoch timestamp and the schedule, a `datetime`
+            for the dates of a cursor.
+        """
+        self.pending -= 1
+        return self._pop()
+
+    def due(self,
+            now: float,
+            misfire: str = "coalesce",
+            grace: Union[int, float] = 1) -> List[Tuple[float, Union[datetime, float, Recurrence], bool, int]]:
+        """
+        Remove every occurrence due at a time, and decide which ones fire.
+
+        Args:
+            now (float): The epoch timestamp.
+            misfire (str): What to do with the occurrences late by more than `grace` seconds, one of `MISFIRES`.
+                Defaults to "coalesce".
+            grace (Union[int, float]): The lateness in seconds up to which an occurrence fires as usual. Defaults to 1.
+
+        Returns:
+            List[Tuple[float, Union[datetime, float, Recurrence], bool, int]]: The epoch timestamp, the schedule, whether
+            it fires and the number of occurrences it stands for, for each due occurrence in order.
+
+        Notes:
+            - Any occurrence at or before `now` is due, however late: nothing stays in the heap because its second
+            has passed while the worker was descheduled or running a long function.
+            - A recurring schedule late by more than `grace` seconds stands for all its occurrences up to `now`, counted
+            in O(1) for `Every`, and is pushed back at its first occurrence after `now`. A short interval missed during
+            a long stall is one entry, so one report, instead of one per occurrence. It fires if its latest occurrence
+            is within `grace`, or for the coalesced entry.
+            - With the policy "all", each missed occurrence of a recurring schedule is due and fires.
+        """
+        due, coalesced = [], None
+        while True:
+            epoch = self.peek()
+            if epoch is None or epoch > now:
+                break
+            epoch, schedule = self.pop()
+            count, latest = 1, epoch
+            if isinstance(schedule, Recurrence):
+                if now - epoch > grace and misfire != "all":
+                    missed, last = schedule.occurrences(epoch, now)
+                    count, latest = count + missed, last if missed else epoch
+                following = schedule.next_after(latest)
+                self.push(following, schedule) if following is not None else None
+            fires = now - latest <= grace or misfire == "all"
+            coalesced = len(due) if not fires and misfire == "coalesce" else coalesced
+            due.append((epoch, schedule, fires, count))
+        if coalesced is not None:
+            due[coalesced] = due[coalesced][:2] + (True,) + due[coalesced][3:]
+        # The latest missed occurrence fires for all of them
+        return due
+
+    def _pop(self) -> Tuple[float, Union[datetime, float, Recurrence]]:
+        """
+        Remove the top entry of the heap, and push the cursor back at its next date.
+        """
+        epoch, _, schedule = heappop(self.heap)
+        if isinstance(schedule, Cursor):
+            schedule.position += 1
+            if schedule.epoch is not None:
+                heappush(self.heap, (schedule.epoch, self.sequence, schedule))
+                self.sequence += 1
+            return epoch, datetime.fromtimestamp(epoch)
+
+        key = self._key(schedule)
+        self.live[key] -= 1
+        if not self.live[key]:
+            del self.live[key]
+        return epoch, schedule
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,154 @@
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Iterator, Optional, Tuple
+
+class Span:
+    __slots__ = ("name", "parent", "children", "count", "total", "_lock")
+
+    def __init__(self, name: str, parent: Optional["Span"], lock: Lock) -> None:
+        """
+        Initialize a node of a span tree.
+
+        Args:
+            name (str): The name of the timer of the node.
+            parent (Optional[Span]): The parent node, `None` for the root of the tree.
+            lock (Lock): The lock of the tree.
+
+        Notes:
+            - A node aggregates every run of the timers of the same name under the same path of parents:
+            `count` runs and a `total` time in nanoseconds, children included.
+        """
+        self.name: str = name
+        self.parent: Optional[Span] = parent
+        self.children: Dict[str, Span] = {}
+        self.count: int = 0
+        self.total: int = 0
+        self._lock: Lock = lock
+
+    def __str__(self) -> str:
+        return f"Class Span()\nName: {self.name}\nCount: {self.count}\nTotal time (ns): {self.total}\nSelf time (ns): {self.self_time}\n"
+
+    def child(self, name: str) -> "Span":
+        """
+        Return the child node of a name, creating it if needed.
+
+        Args:
+            name (str): The name of the timer of the child.
+
+        Returns:
+            Span: The child node.
+        """
+        node = self.children.get(name)
+        if node is None:
+            with self._lock:
+                node = self.children.setdefault(name, Span(name, self, self._lock))
+        return node
+
+    def add(self, nanoseconds: int, weight: int = 1) -> None:
+        """
+        Add a run to the node.
+
+        Args:
+            nanoseconds (int): The duration of the run in nanoseconds.
+            weight (int): How many runs the duration stands for. Defaults to 1.
+        """
+        with self._lock:
+            self.count += weight
+            self.total += nanoseconds * weight
+
+    @property
+    def self_time(self) -> int:
+        """
+        Return the time spent in the node itself, outside of its children, in nanoseconds.
+        """
+        return max(self.total - sum(child.total for child in list(self.children.values())), 0)
+
+
+class SpanTree:
+    def __init__(self) -> None:
+        """
+        Initialize a tree of spans.
+
+        Notes:
+            - A `Timer` created with `spans=` opens a span when it starts. Every `Timer` started in the same
+            thread or asyncio task while a span is open becomes its child, whatever its own `spans`, so a
+            multi-stage handler shows which stage its time went to.
+            - The open span is kept in the `CURRENT` context variable. Nodes are aggregated by path: the
+            runs of the same stage under the same parents share one node.
+        """
+        self.__lock: Lock = Lock()
+        self.root: Span = Span("root", None, self.__lock)
+
+    def __str__(self) -> str:
+        return f"Class SpanTree()\nSpans: {sum(1 for _ in self.walk())}\n"
+
+    def walk(self) -> Iterator[Tuple[Tuple[str, ...], Span]]:
+        """
+        Iterate over the nodes of the tree, depth first, the longest children first.
+
+        Returns:
+            Iterator[Tuple[Tuple[str, ...], Span]]: The path of names of each node and the node.
+        """
+        stack = [((child.name,), child) for child in self._sorted(self.root)]
+        while stack:
+            path, node = stack.pop()
+            yield path, node
+            stack.extend((path + (child.name,), child) for child in self._sorted(node))
+
+    @staticmethod
+    def _sorted(node: Span) -> list:
+        """
+        Return the children of a node, in the reverse order of the walk (the longest last).
+        """
+        return sorted(list(node.children.values()), key=lambda child: child.total)
+
+    def collapsed(self) -> str:
+        """
+        Export the tree in the collapsed-stack format of flame graphs.
+
+        Returns:
+            str: One `parent;child;grandchild <self time in nanoseconds>` line per node, ready for `flamegraph.pl`
+            or speedscope.
+
+        Notes:
+            - Semicolons and line breaks in the names are replaced, since they separate the frames and the lines.
+        """
+        return "".join(
+            ";".join(name.replace(";", ":").replace("\n", " ") for name in path) + f" {node.self_time}\n"
+            for path, node in self.walk()
+        )
+
+    def report(self) -> str:
+        """
+        Return an aggregated report of the tree.
+
+        Returns:
+            str: One line per node, indented by depth, with its count, total and self time in milliseconds and its share
+            of the time of the top-level spans.
+        """
+        overall = sum(child.total for child in list(self.root.children.values())) or 1
+        return "".join(
+            f"{'  ' * (len(path) - 1)}{node.name}: count={node.count} total={node.total / 1e6:.3f} ms "
+            f"self={node.self_time / 1e6:.3f} ms ({100 * node.total / overall:.1f}%)\n"
+            for path, node in self.walk()
+        )
+
+    def reset(self) -> None:
+        """
+        Remove every span of the tree.
+
+        Notes:
+            - The spans open meanwhile still record their run, in their detached nodes.
+        """
+        with self.__lock:
+            self.root.children = {}
+
+
+CURRENT: ContextVar = ContextVar("ptymer-span", default=None)
+# span open in the current thread or asyncio task, `None` if there is none
+
+SPANS: SpanTree = SpanTree()
+# default span tree of the timers created with `spans=True`
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,322 @@
+from collections import deque
+from re import compile
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union, Iterable
+
+SUB_BITS: int = 5
+# each power of two is split in 2**SUB_BITS linear sub-buckets (relative error below 1/32)
+
+SUB_BUCKETS: int = 1 << SUB_BITS
+# number of sub-buckets per power of two
+
+BUCKETS: int = (64 - SUB_BITS) << SUB_BITS
+# number of buckets covering every non-negative 63-bit value
+
+PERCENTILES: Tuple[float, ...] = (50, 90, 99, 99.9)
+# percentiles reported by default in the snapshots
+
+FOLD_SIZE: int = 256
+# number of pending recordings that triggers their folding into the histogram
+
+TAG_KEY = compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+# valid tag keys, the label names of the OpenMetrics text format
+
+def metric_key(name: str, tags: Optional[Dict[str, str]] = None) -> str:
+    """
+    Return the key of a metric inside a registry.
+
+    Args:
+        name (str): The name of the measurement.
+        tags (Optional[Dict[str, str]]): The tags of the measurement. Defaults to None.
+
+    Returns:
+        str: `name` alone, or followed by the tags sorted by key, like `name{key="value",...}`.
+    """
+    if not tags:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in sorted(tags.items())) + "}"
+
+def bucket_index(value: int) -> int:
+    """
+    Return the histogram bucket of a non-negative integer value.
+
+    Args:
+        value (int): The value, in nanoseconds.
+
+    Returns:
+        int: The index of the bucket.
+
+    Notes:
+        - Values below `2 * SUB_BUCKETS` have their own bucket, larger values share a bucket with
+        the values that have the same `SUB_BITS + 1` most significant bits (log-linear layout).
+    """
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return ((shift + 1) << SUB_BITS) + (value >> shift) - SUB_BUCKETS
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """
+    Return the lowest and highest values of a histogram bucket.
+
+    Args:
+        index (int): The index of the bucket.
+
+    Returns:
+        Tuple[int, int]: The inclusive bounds of the bucket.
+    """
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = (index >> SUB_BITS) - 1
+    lowest = ((index & (SUB_BUCKETS - 1)) + SUB_BUCKETS) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class Metric:
+    __slots__ = ("name", "tags", "count", "total", "min", "max", "_counts", "_pending", "_lock")
+
+    def __init__(self, name: str, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Initialize the statistics of a named measurement.
+
+        Args:
+            name (str): The name of the measurement.
+            tags (Optional[Dict[str, str]]): The tags of the measurement, exported as labels. Defaults to None.
+
+        Notes:
+            - Keeps the count, sum, minimum and maximum of the recorded durations, and a log-linear
+            (HDR-style) histogram of `BUCKETS` counters, so the memory of a metric is fixed whatever
+            the number of recordings.
+            - `record()` is O(1) and never takes a lock: the duration is appended to the `_pending` deque
+            (an atomic operation) and the pending durations are folded into the statistics in batches
+            of `FOLD_SIZE`, by the recording thread that gets the lock, or before a snapshot.
+        """
+        self.name: str = name
+        self.tags: Dict[str, str] = dict(tags) if tags else {}
+        self.count: int = 0
+        self.total: int = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self._counts: List[int] = [0] * BUCKETS
+        self._pending: deque = deque()
+        self._lock: Lock = Lock()
+
+    def __str__(self) -> str:
+        return f"Class Metric()\nName: {self.name}\nCount: {self.count}\nMean (ns): {self.total / self.count if self.count else None}\n"
+
+    def record(self, nanoseconds: int, weight: int = 1) -> None:
+        """
+        Record a duration.
+
+        Args:
+            nanoseconds (int): The duration in nanoseconds.
+            weight (int): How many occurrences the duration stands for. Defaults to 1.
+        """
+        pending = self._pending
+        pending.append((nanoseconds, weight))
+        if len(pending) >= FOLD_SIZE and self._lock.acquire(blocking=False):
+            try:
+                self._fold()
+            finally:
+                self._lock.release()
+
+    def _fold(self) -> None:
+        """
+        Add the pending durations to the statistics, the lock of the metric must be held.
+
+        Notes:
+            - Only the durations pending when the fold starts are taken, the sums are kept in local
+            variables and `bucket_index()` is inlined, since this loop is where recording costs.
+        """
+        pending, counts = self._pending, self._counts
+        batch = [pending.popleft() for _ in range(len(pending))]
+        if not batch:
+            return
+
+        count, total = self.count, self.total
+        for nanoseconds, weight in batch:
+            count += weight
+            total += nanoseconds * weight
+            if nanoseconds < SUB_BUCKETS:
+                counts[nanoseconds if nanoseconds > 0 else 0] += weight
+            else:
+                shift = nanoseconds.bit_length() - SUB_BITS - 1
+                counts[((shift + 1) << SUB_BITS) + (nanoseconds >> shift) - SUB_BUCKETS] += weight
+        self.count, self.total = count, total
+
+        lowest, highest = min(batch)[0], max(batch)[0]
+        self.min = lowest if self.min is None or lowest < self.min else self.min
+        self.max = highest if self.max is None or highest > self.max else self.max
+
+    def copy(self) -> "Metric":
+        """
+        Return a consistent copy of the metric.
+
+        Notes:
+            - The pending durations are folded first. Recording threads are never blocked meanwhile,
+            what they record during the copy is left pending for the next one.
+        """
+        metric = Metric(self.name, self.tags)
+        with self._lock:
+            self._fold()
+            metric.count, metric.total, metric.min, metric.max = self.count, self.total, self.min, self.max
+            metric._counts = self._counts.copy()
+        return metric
+
+    def reset(self) -> None:
+        """
+        Clear the statistics of the metric.
+        """
+        with self._lock:
+            self._pending.clear()
+            self.count, self.total, self.min, self.max = 0, 0, None, None
+            self._counts = [0] * BUCKETS
+
+    def percentile(self, percentile: Union[int, float]) -> Optional[int]:
+        """
+        Return an estimate of a percentile of the recorded durations.
+
+        Args:
+            percentile (Union[int, float]): The percentile, between 0 and 100.
+
+        Returns:
+            Optional[int]: The duration in nanoseconds, or `None` if nothing was recorded.
+
+        Raises:
+            ValueError: If `percentile` is not between 0 and 100.
+
+        Notes:
+            - The estimate is the middle of the bucket holding the percentile, clamped to the recorded minimum and maximum.
+            - Call it on a `copy()` when the metric is being recorded concurrently.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100! Got {percentile}!")
+        elif not self.count:
+            return None
+
+        rank = max(self.count * percentile / 100, 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                lowest, highest = bucket_bounds(index)
+                return min(max((lowest + highest) // 2, self.min), self.max)
+        return self.max
+
+    def snapshot(self, percentiles: Iterable[Union[int, float]] = PERCENTILES) -> Dict[str, Optional[Union[int, float]]]:
+        """
+        Return the statistics of the metric.
+
+        Args:
+            percentiles (Iterable[Union[int, float]]): The percentiles to report. Defaults to `PERCENTILES`.
+
+        Returns:
+            Dict[str, Optional[Union[int, float]]]: The `count`, `sum`, `min`, `max` and `mean` of the durations, and one
+            `p<percentile>` entry per percentile (e.g. `p99`, `p99.9`), all in nanoseconds.
+        """
+        metric = self.copy()
+        stats = {
+            "count": metric.count,
+            "sum": metric.total,
+            "min": metric.min,
+            "max": metric.max,
+            "mean": metric.total / metric.count if metric.count else None,
+        }
+        stats.update({f"p{percentile:g}": metric.percentile(percentile) for percentile in percentiles})
+        return stats
+
+
+class Registry:
+    def __init__(self) -> None:
+        """
+        Initialize a registry of named metrics.
+
+        Notes:
+            - `Timer` instances with a name (explicit, or the one of the decorated function) record
+            their durations in a registry, `REGISTRY` by default.
+        """
+        self.__metrics: Dict[str, Metric] = {}
+        self.__lock: Lock = Lock()
+
+    def __str__(self) -> str:
+        return f"Class Registry()\nMetrics: {list(self.__metrics)}\n"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__metrics
+
+    def __len__(self) -> int:
+        return len(self.__metrics)
+
+    def metric(self, name: str, tags: Optional[Dict[str, str]] = None) -> Metric:
+        """
+        Return the metric of a name and tags, creating it if needed.
+
+        Args:
+            name (str): The name of the measurement.
+            tags (Optional[Dict[str, str]]): The tags of the measurement. Defaults to None.
+
+        Returns:
+            Metric: The metric of the name and tags.
+
+        Raises:
+            TypeError: If `name` is not a string.
+        """
+        key = metric_key(name, tags) if tags else name
+        metric = self.__metrics.get(key)
+        if metric is None:
+            if not isinstance(name, str):
+                raise TypeError(f"Name must be a string! Got {type(name)}!")
+            with self.__lock:
+                metric = self.__metrics.setdefault(key, Metric(name, tags))
+        return metric
+
+    def metrics(self) -> List[Metric]:
+        """
+        Return the metrics of the registry.
+
+        Returns:
+            List[Metric]: The live metrics, call `copy()` on them to read consistent statistics.
+        """
+        return list(self.__metrics.values())
+
+    def record(self, name: str, nanoseconds: int, weight: int = 1, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a duration in the metric of a name and tags.
+
+        Args:
+            name (str): The name of the measurement.
+            nanoseconds (int): The duration in nanoseconds.
+            weight (int): How many occurrences the duration stands for. Defaults to 1.
+            tags (Optional[Dict[str, str]]): The tags of the measurement. Defaults to None.
+        """
+        self.metric(name, tags).record(nanoseconds, weight)
+
+    def snapshot(self, percentiles: Iterable[Union[int, float]] = PERCENTILES) -> Dict[str, Dict[str, Optional[Union[int, float]]]]:
+        """
+        Return the statistics of every metric, without stopping the recording.
+
+        Args:
+            percentiles (Iterable[Union[int, float]]): The percentiles to report. Defaults to `PERCENTILES`.
+
+        Returns:
+            Dict[str, Dict[str, Optional[Union[int, float]]]]: The statistics of each metric, indexed by name, followed
+            by the tags if any (see `metric_key()` and `Metric.snapshot()`).
+        """
+        percentiles = tuple(percentiles)
+        return {name: metric.snapshot(percentiles) for name, metric in list(self.__metrics.items())}
+
+    def reset(self) -> None:
+        """
+        Clear the statistics of every metric of the registry.
+
+        Notes:
+            - The metrics are cleared in place, so the timers that hold them keep recording in the registry.
+        """
+        [metric.reset() for metric in list(self.__metrics.values())]
+
+
+REGISTRY: Registry = Registry()
+# default registry of the timers
+
+if __name__ == "__main__":
+    pass
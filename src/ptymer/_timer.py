@@ -1,34 +1,191 @@
 from datetime import datetime, timedelta
-from contextlib import ContextDecorator
-from typing import Optional, Dict, Tuple
-
-class Timer(ContextDecorator):
-    def __init__(self, visibility: bool = False) -> None:
+from contextvars import ContextVar
+from inspect import iscoroutinefunction
+from functools import wraps
+from threading import get_ident
+from time import perf_counter_ns, monotonic_ns, process_time_ns, thread_time_ns
+from traceback import StackSummary, extract_stack, format_list
+from typing import Any, Optional, Dict, Tuple, Union, Callable
+import sys
+from ._stats import Registry, Metric, REGISTRY, TAG_KEY
+from ._marks import Marks, MarksView
+from ._spans import Span, SpanTree, SPANS, CURRENT
+from ._trace import ACTIVE
+from ._wheel import TimeoutWheel
+
+CLOCKS: Dict[str, Callable[[], int]] = {
+    "perf_counter_ns": perf_counter_ns,
+    "monotonic_ns": monotonic_ns,
+    "process_time_ns": process_time_ns,
+    "thread_time_ns": thread_time_ns,
+}
+# clock sources available by name, all of them return integer nanoseconds
+
+IDLE: Tuple[Optional[int], int, bool, Optional[Span]] = (None, 0, False, None)
+# state of a timer in a thread or task where it is not running: start time, depth, skipped flag and open span
+
+STATES: ContextVar = ContextVar("ptymer-timers", default={})
+# values of the running timers of the current thread or task (state, budget timeout, trace start), keyed by the tokens
+# of each timer. The dictionary is never modified in place but replaced, so the contexts copied by tasks stay apart,
+# and a value is dropped when its run stops: the context holds one entry, whatever the number of timers
+
+def _store(key: object, value: Any) -> None:
+    """
+    Set the value of a key of `STATES` in the current thread or task, `IDLE` or `None` dropping the key.
+    """
+    states = STATES.get().copy()
+    if value is IDLE or value is None:
+        states.pop(key, None)
+    else:
+        states[key] = value
+    STATES.set(states)
+
+class Timer:
+    __slots__ = ("visibility", "name", "sample_rate", "__state", "__marks", "__clock",
+                 "__registry", "__metric", "__sample_every", "__countdown", "__spans", "tags",
+                 "budget", "on_overrun", "__watch", "__traced", "__weakref__")
+    # No `__dict__`: `ContextDecorator` is not a base class, since `__call__()` replaces all it provides
+
+    def __init__(self,
+                 visibility: bool = False,
+                 clock: Union[str, Callable[[], int]] = "perf_counter_ns",
+                 name: Optional[str] = None,
+                 registry: Optional[Registry] = None,
+                 sample_rate: Union[int, float] = 1,
+                 spans: Union[bool, SpanTree] = False,
+                 tags: Optional[Dict[str, str]] = None,
+                 budget: Optional[Union[int, float]] = None,
+                 on_overrun: Optional[Callable[[timedelta, StackSummary], Any]] = None) -> None:
         """
         Initialize a Timer instance.
 
         Args:
             visibility (bool, optional): Determines if messages will be displayed. Defaults to False.
+            clock (Union[str, Callable[[], int]], optional): The clock source, one of `"perf_counter_ns"`, `"monotonic_ns"`,
+                `"process_time_ns"` and `"thread_time_ns"`, or a function returning integer nanoseconds. Defaults to "perf_counter_ns".
+            name (Optional[str], optional): The name under which the durations are recorded. Defaults to the qualified
+                name of the decorated function, or to None (nothing is recorded) for other timers.
+            registry (Optional[Registry], optional): The registry where the durations are recorded. Defaults to `REGISTRY`.
+            sample_rate (Union[int, float], optional): The fraction of the decorated calls and `with` blocks that are timed,
+                between 0 (excluded) and 1. Defaults to 1 (every call is timed).
+            spans (Union[bool, SpanTree], optional): The span tree where the timer opens a span when it starts, `True` for `SPANS`.
+                Defaults to False (the timer only joins the span open by another timer, if any).
+            tags (Optional[Dict[str, str]], optional): Tags of the durations, recorded in a metric of their own and exported
+                as labels. Defaults to None.
+            budget (Optional[Union[int, float]], optional): The latency budget of each timed run in seconds. Defaults to
+                None (no budget).
+            on_overrun (Optional[Callable[[timedelta, StackSummary], Any]], optional): The function called when a run
+                exceeds its budget, while it is still running, with the elapsed time and the stack of the thread that
+                runs it. Defaults to None (a message and the stack are printed).
 
         Raises:
-            TypeError: If visibility is not a boolean.
+            TypeError: If visibility is not a boolean, if clock is neither a string nor a callable, if name is not
+                a string, if registry is not a `Registry`, if sample_rate is not numeric or if spans is neither a boolean
+                nor a `SpanTree`, if tags is not a dictionary of strings, if budget is not numeric or if on_overrun is
+                not a callable.
+            ValueError: If clock is not an available clock name, if sample_rate is not greater than 0 and at most 1,
+                if a tag key is not a valid label name (`[a-zA-Z_][a-zA-Z0-9_]*`), if budget is not greater than 0, or if
+                on_overrun is defined without a budget.
 
         Notes:
-            - Initializes `self.__start_time` as `None`.
-            - Initializes `self.__marks` as an empty list of lists.
-            - Initializes `self.__depth_meter` as 0.
+            - Initializes `self.__state` as the key of the timer in `STATES`, where it is `IDLE` by default. The start
+            time (the raw reading of the clock in nanoseconds), the depth of the recursion and whether the current block
+            is sampled are kept per thread and per asyncio task, so one instance can time concurrent calls without any
+            lock. Stopping drops them, so finished timers leave nothing in the context.
+            - Initializes `self.__marks` as an empty `Marks` storage (typed arrays of offsets and label indexes),
+            shared by every thread and task.
             - Raises an error if `visibility` is not a boolean.
+            - `timedelta` objects are only built when a duration is returned or displayed.
+            - Every stop of a named timer records its duration in the registry, so the count, mean and
+            percentiles of a decorated function can be read with `REGISTRY.snapshot()`.
+            - With a `sample_rate` below 1, one call out of `round(1 / sample_rate)` is timed and recorded with that
+            weight, so the count and sum of the metric still estimate every call. The other calls only decrement
+            a counter, no clock is read. `start()` and `stop()` always measure.
+            - Any timer started while a span is open in the same thread or task opens a child span, named after
+            the timer, so the tree shows the total and self time of each stage (see `SpanTree`).
+            - While a `TraceRecorder` is started, each run is written as a complete event placed on the wall clock.
+            With another clock than `perf_counter_ns`, the elapsed time on that clock is added to the event.
+            - With a `budget`, each timed run arms a timeout in the shared `TimeoutWheel`, and stopping cancels it,
+            both in O(1). The budget is measured on the wall clock, whatever `clock` is. `on_overrun` runs in the
+            driver thread of the wheel, so it should be short.
         """
-        self.__start_time: Optional[datetime] = None
-        self.__marks: list[list[timedelta, Optional[str]]] = []
-        self.__depth_meter: int = 0
+        self.__state: object = object()
+        self.__marks: Marks = Marks()
 
         if not isinstance(visibility, bool):
             raise TypeError("Visibility must be a boolean!")
         else: self.visibility: bool = visibility
 
+        if isinstance(clock, str) and clock not in CLOCKS:
+            raise ValueError(f"Clock must be one of {list(CLOCKS)}! Got {clock!r}!")
+        elif isinstance(clock, str):
+            self.__clock: Callable[[], int] = CLOCKS[clock]
+        elif callable(clock):
+            self.__clock: Callable[[], int] = clock
+        else:
+            raise TypeError(f"Clock must be a string or a function! Got {type(clock)}!")
+
+        if name is not None and not isinstance(name, str):
+            raise TypeError(f"Name must be a string! Got {type(name)}!")
+        else: self.name: Optional[str] = name
+        # Name of the metric fed by the timer
+
+        if registry is not None and not isinstance(registry, Registry):
+            raise TypeError(f"Registry must be a Registry! Got {type(registry)}!")
+        else: self.__registry: Registry = REGISTRY if registry is None else registry
+        # Registry of the metric fed by the timer
+
+        self.__metric: Optional[Metric] = None
+        # Metric of the name inside the registry, resolved on the first recording
+
+        if not isinstance(sample_rate, (int, float)) or isinstance(sample_rate, bool):
+            raise TypeError(f"Sample rate must be a number! Got {type(sample_rate)}!")
+        elif not 0 < sample_rate <= 1:
+            raise ValueError(f"Sample rate must be greater than 0 and at most 1! Got {sample_rate}!")
+        else: self.sample_rate: Union[int, float] = sample_rate
+
+        self.__sample_every: int = max(round(1 / sample_rate), 1)
+        # Only one call out of `self.__sample_every` is timed, and recorded with this weight
+
+        self.__countdown: int = 1
+        # Calls left before the next timed one, the first call is always timed. It is shared by the threads,
+        # so under contention the sampling is only approximately 1 in `self.__sample_every`
+
+        if not isinstance(spans, (bool, SpanTree)):
+            raise TypeError(f"Spans must be a boolean or a SpanTree! Got {type(spans)}!")
+        else: self.__spans: Optional[SpanTree] = SPANS if spans is True else (spans or None)
+        # Tree where the timer opens a span when no span is open
+
+        if tags is not None and (not isinstance(tags, dict) or not all(isinstance(item, str) for pair in tags.items() for item in pair)):
+            raise TypeError(f"Tags must be a dictionary of strings! Got {tags!r}!")
+        elif tags is not None and not all(TAG_KEY.fullmatch(key) for key in tags):
+            raise ValueError(f"Tag keys must be letters, digits and underscores, not starting with a digit! Got {list(tags)}!")
+        else: self.tags: Dict[str, str] = dict(tags) if tags else {}
+        # Tags of the metric fed by the timer
+
+        if budget is not None and (not isinstance(budget, (int, float)) or isinstance(budget, bool)):
+            raise TypeError(f"Budget must be a number! Got {type(budget)}!")
+        elif budget is not None and budget <= 0:
+            raise ValueError(f"Budget must be greater than 0! Got {budget}!")
+        else: self.budget: Optional[Union[int, float]] = budget
+        # Latency budget of each run in seconds
+
+        if on_overrun is not None and not callable(on_overrun):
+            raise TypeError(f"On overrun must be a function! Got {type(on_overrun)}!")
+        elif on_overrun is not None and budget is None:
+            raise ValueError(f"On overrun cannot be defined without a budget!")
+        else: self.on_overrun: Optional[Callable[[timedelta, StackSummary], Any]] = on_overrun
+        # Function called when a run exceeds its budget
+
+        self.__watch: Optional[object] = object() if budget is not None else None
+        # Token of the timeout of the budget of the run of each thread or task
+
+        self.__traced: Optional[object] = object() if self.__clock is not perf_counter_ns else None
+        # Token of the reading of `perf_counter_ns()` when the run of each thread or task started, if a `TraceRecorder` was
+        # started then. With the default clock, the start time is already that reading
+
     def __str__(self) -> str:
-        return f"Class Timer()\nVisibility: {self.visibility}\nActive: {self.status}\nStart time: {str(self.__start_time)}\nTime since start: {str(self.current_time)}\nQuantity of marks: {len(self.__marks)}\n"
+        return f"Class Timer()\nVisibility: {self.visibility}\nActive: {self.status}\nStart time (ns): {str(STATES.get().get(self.__state, IDLE)[0])}\nTime since start: {str(self.current_time) if self.status else None}\nQuantity of marks: {len(self.__marks)}\n"
     
     def __enter__(self) -> "Timer":
         """
@@ -39,10 +196,26 @@ class Timer(ContextDecorator):
         
         Notes:
             - Checks the depth of the recursion and starts the timer if it is the first call.
+            - Blocks that are not sampled (see `sample_rate`) do not start the timer.
         """
-        if self.__depth_meter == 0:
-            self.start()
-        self.__depth_meter += 1
+        start_time, depth, skipped, span = STATES.get().get(self.__state, IDLE)
+        if depth == 0:
+            countdown = self.__countdown - 1
+            if countdown:
+                self.__countdown = countdown
+                skipped = True
+            # Call not sampled, the clock is not read
+            else:
+                self.__countdown = self.__sample_every
+                if start_time is None and not self.visibility:
+                    span = self._open_span()
+                    self._arm() if self.__watch is not None else None
+                    _store(self.__traced, perf_counter_ns()) if self.__traced is not None and ACTIVE else None
+                    start_time = self.__clock()
+                else:
+                    start_time, _, _, span = STATES.get()[self.start().__state]
+            # Fast path of `start()`, which is still called to raise or display messages
+        _store(self.__state, (start_time, depth + 1, skipped, span))
         return self
 
     def __exit__(self, exc_type: Optional[Exception], exc_value: Optional[str], traceback: str) -> None:
@@ -61,45 +234,103 @@ class Timer(ContextDecorator):
         Notes:
             - If no exception occurred (`exc_type` is `None`), the timer is stopped.
         """
-        self.__depth_meter -= 1
-        if self.__depth_meter == 0:
-            if not self.status:
+        start_time, depth, skipped, span = STATES.get().get(self.__state, IDLE)
+        depth -= 1
+        if depth == 0:
+            if skipped:
+                _store(self.__state, IDLE if start_time is None else (start_time, 0, False, span))
+            elif start_time is None:
                 raise AttributeError("There is no timer executing!")
             else:
-                self.stop()
-        elif self.__depth_meter < 0 and self.visibility:
-            print('Warning: Timer was stopped more times than it was started!')
+                self._stop(self.__sample_every)
+        elif depth < 0:
+            print('Warning: Timer was stopped more times than it was started!') if self.visibility else None
+        else:
+            _store(self.__state, (start_time, depth, skipped, span))
         if exc_type:
             raise exc_type(exc_value).with_traceback(traceback)
+
+    def __call__(self, func: Callable) -> Callable:
+        """
+        Decorate a function so each call is timed.
+
+        Args:
+            func (Callable): The function to be timed.
+
+        Returns:
+            Callable: The decorated function.
+
+        Notes:
+            - Equivalent to `ContextDecorator.__call__`, without recreating the context manager on every call.
+            - The outermost call takes the fast path: two readings of the clock and no `timedelta`. Nested calls
+            and visible timers go through the context manager.
+            - If the timer has no name, it takes the qualified name of the function.
+            - Calls that are not sampled (see `sample_rate`) cost one decrement of a counter and call `func` directly.
+            - Coroutine functions are timed until their coroutine returns, through the context manager. Each asyncio
+            task has its own start time, but a task created inside a timed call inherits it and counts as nested.
+        """
+        if self.name is None:
+            self.name = f"{func.__module__}.{func.__qualname__}"
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def timed_coroutine(*args, **kwargs):
+                with self:
+                    return await func(*args, **kwargs)
+            return timed_coroutine
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            countdown = self.__countdown - 1
+            if countdown:
+                self.__countdown = countdown
+                return func(*args, **kwargs)
+            key = self.__state
+            if key in STATES.get() or self.visibility:
+                with self:
+                    return func(*args, **kwargs)
+            self.__countdown = self.__sample_every
+            span = None if self.__spans is None and CURRENT.get() is None else self._open_span()
+            self._arm() if self.__watch is not None else None
+            _store(self.__traced, perf_counter_ns()) if self.__traced is not None and ACTIVE else None
+            _store(key, (self.__clock(), 1, False, span))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if STATES.get().get(key, IDLE)[0] is None:
+                    _store(key, IDLE)
+                    raise AttributeError("There is no timer executing!")
+                self._stop(self.__sample_every)
+        return timed
         
     def __eq__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return abs(other.__start_time - self.__start_time) < timedelta(microseconds=100000)
+            return abs(STATES.get().get(other.__state, IDLE)[0] - STATES.get().get(self.__state, IDLE)[0]) < 100_000_000
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
 
     def __ne__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return self.__start_time != other.__start_time
+            return STATES.get().get(self.__state, IDLE)[0] != STATES.get().get(other.__state, IDLE)[0]
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __lt__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return self.__start_time < other.__start_time
+            return STATES.get().get(self.__state, IDLE)[0] < STATES.get().get(other.__state, IDLE)[0]
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __le__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return self.__start_time <= other.__start_time
+            return STATES.get().get(self.__state, IDLE)[0] <= STATES.get().get(other.__state, IDLE)[0]
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __gt__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return self.__start_time > other.__start_time
+            return STATES.get().get(self.__state, IDLE)[0] > STATES.get().get(other.__state, IDLE)[0]
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
     
     def __ge__(self, other: "Timer") -> bool:
         if isinstance(other, Timer):
-            return self.__start_time >= other.__start_time
+            return STATES.get().get(self.__state, IDLE)[0] >= STATES.get().get(other.__state, IDLE)[0]
         else: raise TypeError(f"Cannot compare HourGlass with {type(other)}!")
         
     def start(self) -> "Timer":
@@ -113,13 +344,18 @@ class Timer(ContextDecorator):
             RuntimeError: If the timer is already executing.
 
         Notes:
-            - Sets `self.__start_time` to the current timestamp using `datetime.now()`.
+            - Sets the start time to the current reading of the clock, in nanoseconds, for the current thread or task.
+            - Opens a span if the timer has a span tree or if a span is already open.
         """
-        if self.status:
+        start_time, depth, skipped, span = STATES.get().get(self.__state, IDLE)
+        if start_time is not None:
             raise RuntimeError(f"Timer already executing!")
         else:
-            self.__start_time = datetime.now()
-            print(f"Starting timer at {str(self.__start_time)}!") if self.visibility else None
+            span = self._open_span()
+            self._arm() if self.__watch is not None else None
+            _store(self.__traced, perf_counter_ns()) if self.__traced is not None and ACTIVE else None
+            _store(self.__state, (self.__clock(), depth, skipped, span))
+            print(f"Starting timer at {str(datetime.now())}!") if self.visibility else None
             return self
     
     def stop(self) -> timedelta:
@@ -133,24 +369,136 @@ class Timer(ContextDecorator):
             AttributeError: If there is no timer currently executing.
 
         Notes:
-            - Calculates the end time using the difference between the current time and `self.__start_time`.
-            - Resets `self.__start_time` to `None` after stopping the timer.
+            - Calculates the end time using the difference between the current reading of the clock and the start time.
+            - Resets the state of the current thread or task to `IDLE` after stopping the timer.
             - If `self.visibility` is `True`, prints the formatted end time and lists any recorded marks.
+            - A run started with `start()` is always measured, so it is recorded with a weight of 1. Inside a
+            sampled `with` block, the weight of the sample is kept.
         """
-        if not self.status:
+        start_time, depth, _, _ = STATES.get().get(self.__state, IDLE)
+        if start_time is None:
             raise RuntimeError(f"There is no timer executing!")
         else:
-            end_time = datetime.now() - self.__start_time
-            self.__start_time = None
+            return self._to_timedelta(self._stop(self.__sample_every if depth else 1))
 
-            if self.visibility:
-                print(f"Total elapsed time: {str(end_time)}")
-                if len(self.__marks) > 0:
-                    print("Marks:")
-                    [print(f"{x+1}: {mark[0]}"  + "\t" + f"{mark[1]}") for x, mark in enumerate(self.__marks)]
+    def _stop(self, weight: int = 1) -> int:
+        """
+        Stop the timer and return the elapsed time in nanoseconds.
 
-            self.__depth_meter = 0 # Reset the depth meter, for the case of using the timer as a context manager and it was stopped before the end of the block for some dark reason
-            return end_time
+        Args:
+            weight (int): The number of calls the run stands for, `self.__sample_every` for sampled runs and
+            1 for runs that did not go through the sampling countdown.
+
+        Returns:
+            int: The elapsed time in nanoseconds.
+
+        Notes:
+            - This is the fast path used by the context manager and the decorator, no `timedelta` is built
+            unless `self.visibility` is `True`.
+            - If the timer has a name, the duration is recorded in its registry.
+            - If the timer opened a span, the duration is added to it.
+            - If a `TraceRecorder` is started, the run is recorded as a complete event, unless the timer has
+            another clock than `perf_counter_ns` and the recorder was started after the run.
+        """
+        now = self.__clock()
+        states = STATES.get()
+        start_time, _, _, span = states.get(self.__state, IDLE)
+        timeout, traced = states.get(self.__watch), states.get(self.__traced)
+        elapsed = now - start_time
+        states = states.copy()
+        states.pop(self.__state, None)
+        states.pop(self.__watch, None) if timeout is not None else None
+        states.pop(self.__traced, None) if traced is not None else None
+        STATES.set(states)
+        timeout.cancel() if timeout is not None else None
+        # Disarm the budget of the run
+        # Also resets the depth, for the case of using the timer as a context manager and it was stopped before the end of the block for some dark reason
+
+        if self.name is not None:
+            metric = self.__metric
+            if metric is None or metric.name != self.name:
+                metric = self.__metric = self.__registry.metric(self.name, self.tags)
+            metric.record(elapsed, weight)
+
+        if span is not None:
+            span.add(elapsed, weight)
+            CURRENT.set(None if span.parent.parent is None else span.parent)
+        # Close the span, the parent span is open again
+
+        if self.__traced is None:
+            started, args = start_time, None
+        else:
+            started, args = traced, {"elapsed_ns": elapsed}
+        if ACTIVE and started is not None:
+            name = self.name if self.name is not None else "Timer"
+            [recorder.complete(name, "timer", started, args) for recorder in list(ACTIVE)]
+        # The event is placed with `perf_counter_ns()`, the clock of the other events, whatever the clock of the
+        # timer is. With another clock, runs started before the recorder are not traced
+
+        if self.visibility:
+            print(f"Total elapsed time: {str(self._to_timedelta(elapsed))}")
+            if len(self.__marks) > 0:
+                print("Marks:")
+                [print(f"{x+1}: {mark[0]}"  + "\t" + f"{mark[1]}") for x, mark in enumerate(MarksView(self.__marks))]
+        return elapsed
+
+    def _arm(self) -> None:
+        """
+        Arm the budget of a run of the current thread or task in the shared `TimeoutWheel`.
+        """
+        timeout = STATES.get().get(self.__watch)
+        timeout.cancel() if timeout is not None else None
+        _store(self.__watch, TimeoutWheel.shared().arm(self.budget, self._overrun, (get_ident(), perf_counter_ns())))
+
+    def _overrun(self, thread: int, started: int) -> None:
+        """
+        Report a run that exceeds its budget, from the driver of the `TimeoutWheel`.
+
+        Args:
+            thread (int): The identifier of the thread that runs the timed block.
+            started (int): The `perf_counter_ns()` reading when the budget was armed.
+
+        Notes:
+            - The stack is a snapshot of the thread when the budget runs out, taken with `sys._current_frames()`. For a
+            coroutine, it is the stack of the thread of the event loop, which may be running another task.
+        """
+        elapsed = self._to_timedelta(perf_counter_ns() - started)
+        frame = sys._current_frames().get(thread)
+        stack = extract_stack(frame) if frame is not None else StackSummary()
+        if self.on_overrun is not None:
+            self.on_overrun(elapsed, stack)
+        else:
+            print(f"Timer {self.name or 'anonymous'} exceeded its budget of {self.budget} seconds: {elapsed} elapsed!")
+            print("".join(format_list(stack)), end="")
+
+    def _open_span(self) -> Optional[Span]:
+        """
+        Open the span of the timer, as a child of the span open in the current thread or task.
+
+        Returns:
+            Optional[Span]: The node of the span, or `None` if no span is open and the timer has no span tree.
+        """
+        parent = CURRENT.get()
+        if parent is None:
+            if self.__spans is None:
+                return None
+            parent = self.__spans.root
+        span = parent.child(self.name if self.name is not None else "anonymous")
+        CURRENT.set(span)
+        return span
+
+    @staticmethod
+    def _to_timedelta(nanoseconds: int) -> timedelta:
+        """
+        Convert nanoseconds to a `timedelta` object.
+
+        Args:
+            nanoseconds (int): The duration in nanoseconds.
+
+        Returns:
+            timedelta: The duration, rounded to the microsecond.
+        """
+        return timedelta(microseconds=nanoseconds / 1000)
         
     def restart(self) -> None:
         """
@@ -160,18 +508,22 @@ class Timer(ContextDecorator):
             RuntimeError: If there is no timer currently running.
 
         Notes:
-            - Updates `self.__start_time` to the current timestamp using `datetime.now()`.
-            - Resets `self.__marks` to an empty list.
+            - Updates the start time to the current reading of the clock.
+            - Resets `self.__marks` to an empty storage, the views of the previous marks keep them.
+            - The budget of the run, if any, is armed again.
             - If `self.visibility` is `True`, prints the restart message.
         """
         if not self.status:
             raise RuntimeError(f"There is no timer executing!")
         else:
-            now = datetime.now()
+            now = self.__clock()
             if self.visibility:
                 print(f"Restarting timer!")
-            self.__start_time = now
-            self.__marks = []
+            _, depth, skipped, span = STATES.get().get(self.__state, IDLE)
+            self._arm() if self.__watch is not None else None
+            _store(self.__traced, perf_counter_ns()) if self.__traced is not None and ACTIVE else None
+            _store(self.__state, (now, depth, skipped, span))
+            self.__marks = Marks()
     
     @property
     def current_time(self) -> timedelta:
@@ -185,13 +537,13 @@ class Timer(ContextDecorator):
             RuntimeError: If there is no timer currently executing.
 
         Notes:
-            - Calculates the elapsed time from `self.__start_time` to the current time.
+            - Calculates the elapsed time from the start time to the current time.
             - Returns the formatted time using `_time_format` method.
         """
         if not self.status:
             raise RuntimeError(f"There is no timer executing!")
         else:
-            return datetime.now() - self.__start_time
+            return self._to_timedelta(self.__clock() - STATES.get().get(self.__state, IDLE)[0])
     
     def mark(self, observ: Optional[str] = None) -> None:
         """
@@ -204,35 +556,41 @@ class Timer(ContextDecorator):
             RuntimeError: If there is no timer currently executing.
 
         Notes:
-            - Adds a new mark to `self.__marks` consisting of the current time and the observation.
+            - Adds a new mark to `self.__marks` consisting of the elapsed nanoseconds and the observation,
+            which is stored once however many marks share it.
+            - If a `TraceRecorder` is started, the mark is recorded as an instant event.
             - If `self.visibility` is `True`, prints the mark number, current time, and observation.
         """
         if not self.status:
             raise RuntimeError(f"There is no timer executing!")
         else:
+            elapsed = self.__clock() - STATES.get().get(self.__state, IDLE)[0]
             if self.visibility:
-                print(f"Mark {len(self.__marks)+1}! \nCurrent time: {str(self.current_time)} \nTime since the beginning: \t{str(self.current_time)}" + (f"\nTime since previous mark: \t{self.current_time-self.__marks[-1][0]}" if len(self.__marks) > 0 else "") + (f"\nObs: {observ}" if observ else ""))
-            self.__marks.append([self.current_time, observ if observ else ""])
+                current_time = self._to_timedelta(elapsed)
+                print(f"Mark {len(self.__marks)+1}! \nCurrent time: {str(current_time)} \nTime since the beginning: \t{str(current_time)}" + (f"\nTime since previous mark: \t{self._to_timedelta(elapsed-self.__marks.offsets[-1])}" if len(self.__marks) > 0 else "") + (f"\nObs: {observ}" if observ else ""))
+            self.__marks.append(elapsed, observ if observ else "")
+            if ACTIVE:
+                [recorder.instant(observ if observ else "mark", "mark", {"timer": self.name, "elapsed_ns": elapsed}) for recorder in list(ACTIVE)]
 
     @property
-    def marks(self) -> Dict[int, Tuple[str, timedelta]]:
+    def marks(self) -> MarksView:
         """
-        Return a dictionary with the marks and their respective times.
+        Return a view of the marks and their respective times.
 
         Returns:
-            Dict[int, Tuple[str, timedelta]]: A dictionary where keys are mark indices 
-            and values are tuples containing the observation (if any) and the mark time.
+            MarksView: A sequence where each mark is a tuple of the mark time and the observation (or empty string),
+            indexed like the mark numbers minus one.
 
         Raises:
             AttributeError: If there are no marks to show.
 
         Notes:
-            - Returns a dictionary representation of `self.__marks` where each entry contains the 
-            mark index as key and a tuple of mark time and observation (or empty string).
+            - The view reads the arrays of `self.__marks` on access, so getting it is O(1) and copies nothing.
+            Its `items()` iterates over `(index, mark)` pairs.
         """
-        if self.__marks == []:
+        if len(self.__marks) == 0:
             raise AttributeError(f"There are no marks to show!")
-        return {idx: [sublist[0], sublist[1]] for idx, sublist in enumerate(self.__marks)}
+        return MarksView(self.__marks)
 
     @property
     def status(self) -> bool:
@@ -240,12 +598,12 @@ class Timer(ContextDecorator):
         Check if the timer is active.
 
         This method returns a boolean indicating whether the timer is currently 
-        running.
+        running in the current thread or asyncio task.
 
         Returns:
             bool: `True` if the timer is active, `False` otherwise.
         """
-        return self.__start_time is not None
+        return STATES.get().get(self.__state, IDLE)[0] is not None
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,196 @@
+from collections import deque
+from contextlib import contextmanager
+from json import dumps
+from os import O_APPEND, O_CREAT, O_TRUNC, O_WRONLY, close, getpid, open as os_open, write
+from threading import Lock, current_thread, get_native_id
+from time import perf_counter_ns
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+class TraceRecorder:
+    def __init__(self, path: str, buffer_size: int = 1000) -> None:
+        """
+        Initialize a recorder of Chrome Trace Event JSON files, which open in Perfetto or `chrome://tracing`.
+
+        Args:
+            path (str): The path of the trace file, overwritten by `start()`.
+            buffer_size (int): The number of events kept in memory before they are written. Defaults to 1000.
+
+        Raises:
+            TypeError: If `path` is not a string or if `buffer_size` is not an integer.
+            ValueError: If `buffer_size` is not greater than 0.
+
+        Notes:
+            - While a recorder is started, `Timer` stops are written as complete events, `Timer.mark()` calls as
+            instant events, and the functions run by `HourGlass`, `Alarm` and `Scheduler` as complete events,
+            each with the process and thread IDs. Thread names are written as metadata events.
+            - Events are buffered and appended to the file in batches, so the trace never sits in memory. The file
+            is opened with `O_APPEND`, and worker processes forked meanwhile write their events straight away,
+            since they may be terminated at any time. Under the `spawn` start method, worker processes do not
+            inherit the recorder and their events are not traced.
+            - The file is a JSON array without its closing bracket, which the trace viewers accept, so events
+            of other processes can still be appended after `stop()`.
+        """
+        if not isinstance(path, str):
+            raise TypeError(f"Path must be a string! Got {type(path)}!")
+        else: self.path: str = path
+
+        if not isinstance(buffer_size, int) or isinstance(buffer_size, bool):
+            raise TypeError(f"Buffer size must be an integer! Got {type(buffer_size)}!")
+        elif buffer_size <= 0:
+            raise ValueError(f"Buffer size must be greater than 0! Got {buffer_size}!")
+        else: self.buffer_size: int = buffer_size
+
+        self.__fd: Optional[int] = None
+        self.__owner: Optional[int] = None
+        # Process that started the recorder
+
+        self.__pid: Optional[int] = None
+        # Process whose events are in the buffer
+
+        self.__buffer: deque = deque()
+        self.__threads: Set[Tuple[int, int]] = set()
+        self.__lock: Lock = Lock()
+
+    def __str__(self) -> str:
+        return f"Class TraceRecorder()\nPath: {self.path}\nActive: {self.status}\nPending events: {len(self.__buffer)}\n"
+
+    def __enter__(self) -> "TraceRecorder":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> "TraceRecorder":
+        """
+        Create the trace file and start recording.
+
+        Returns:
+            TraceRecorder: The current instance.
+
+        Raises:
+            RuntimeError: If the recorder is already started.
+        """
+        if self.status:
+            raise RuntimeError("TraceRecorder already started!")
+        else:
+            self.__fd = os_open(self.path, O_WRONLY | O_CREAT | O_TRUNC | O_APPEND, 0o644)
+            self.__owner = self.__pid = getpid()
+            self.__threads = set()
+            write(self.__fd, b"[\n")
+            ACTIVE.append(self)
+            return self
+
+    def stop(self) -> None:
+        """
+        Write the pending events, stop recording and close the trace file.
+
+        Raises:
+            RuntimeError: If the recorder is not started.
+        """
+        if not self.status:
+            raise RuntimeError("TraceRecorder not started!")
+        else:
+            ACTIVE.remove(self)
+            self.flush()
+            close(self.__fd)
+            self.__fd = None
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the recorder is started.
+        """
+        return self.__fd is not None
+
+    def flush(self) -> None:
+        """
+        Append the pending events to the trace file.
+        """
+        with self.__lock:
+            buffer = self.__buffer
+            events = [buffer.popleft() for _ in range(len(buffer))]
+            if events and self.__fd is not None:
+                write(self.__fd, "".join(events).encode())
+
+    def complete(self, name: str, category: str, started: int, args: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a complete event that ends now.
+
+        Args:
+            name (str): The name of the event.
+            category (str): The category of the event.
+            started (int): The reading of `perf_counter_ns()` when the event started.
+            args (Optional[Dict[str, Any]]): Extra information shown with the event. Default is None.
+        """
+        end = perf_counter_ns()
+        self._emit(f'"name":{dumps(name)},"cat":"{category}","ph":"X","ts":{started / 1000:.3f},"dur":{(end - started) / 1000:.3f}', args)
+
+    def instant(self, name: str, category: str, args: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record an instant event of the current thread.
+
+        Args:
+            name (str): The name of the event.
+            category (str): The category of the event.
+            args (Optional[Dict[str, Any]]): Extra information shown with the event. Default is None.
+        """
+        self._emit(f'"name":{dumps(name)},"cat":"{category}","ph":"i","s":"t","ts":{perf_counter_ns() / 1000:.3f}', args)
+
+    def _emit(self, fields: str, args: Optional[Dict[str, Any]]) -> None:
+        """
+        Add the process and thread IDs to the fields of an event and buffer it.
+
+        Notes:
+            - The timestamps come from `perf_counter_ns()`, a system-wide monotonic clock on Linux, so the events
+            of different processes line up.
+        """
+        pid, tid = getpid(), get_native_id()
+        if pid != self.__pid:
+            self.__buffer = deque()
+            self.__threads = set()
+            self.__lock = Lock()
+            self.__pid = pid
+        # The events buffered before the fork belong to the parent process, and its lock may have been held
+
+        if (pid, tid) not in self.__threads:
+            self.__threads.add((pid, tid))
+            self.__buffer.append(f'{{"name":"thread_name","ph":"M","pid":{pid},"tid":{tid},"args":{{"name":{dumps(current_thread().name)}}}}},\n')
+
+        self.__buffer.append(f'{{{fields},"pid":{pid},"tid":{tid}' + (f',"args":{dumps(args, default=str)}}},\n' if args else '},\n'))
+        if pid != self.__owner or len(self.__buffer) >= self.buffer_size:
+            self.flush()
+
+
+ACTIVE: List[TraceRecorder] = []
+# recorders started in the current process
+
+@contextmanager
+def traced(name: str, category: str) -> Iterator[None]:
+    """
+    Record the enclosed block as a complete event in the started recorders.
+
+    Args:
+        name (str): The name of the event.
+        category (str): The category of the event.
+    """
+    if not ACTIVE:
+        yield
+        return
+    started = perf_counter_ns()
+    try:
+        yield
+    finally:
+        [recorder.complete(name, category, started) for recorder in list(ACTIVE)]
+
+def target_name(kind: str, target: Any) -> str:
+    """
+    Return the name of the event of a function run by a timer.
+
+    Args:
+        kind (str): The class of the timer.
+        target (Any): The function of the timer.
+    """
+    return f"{kind} {getattr(target, '__qualname__', None) or repr(target)}" if target is not None else kind
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,274 @@
+from contextlib import ContextDecorator
+from ctypes import c_ulong, py_object, pythonapi
+from datetime import timedelta
+from functools import wraps
+from inspect import iscoroutinefunction
+from math import ceil
+from threading import Lock, current_thread, get_ident, main_thread
+from time import monotonic
+from typing import Any, Callable, List, Optional, Union
+import asyncio
+import signal
+import sys
+from ._wheel import Timeout, TimeoutWheel
+
+GUARDS: List["Watchdog"] = []
+# watchdogs of the main thread on the interval timer, the innermost last
+
+_PREVIOUS_HANDLER: Any = None
+# `SIGALRM` handler replaced while `GUARDS` is not empty
+
+SWITCH_DELAY: float = 1e-3
+# seconds before the interval timer signals again, when it fired while a watchdog was armed or disarmed
+
+def _interval(seconds: float) -> None:
+    """
+    Arm the interval timer of the process, or disarm it with 0.
+    """
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+
+def _rearm() -> None:
+    """
+    Arm the interval timer at the earliest deadline of `GUARDS` that has not expired yet.
+    """
+    deadlines = [guard.deadline for guard in GUARDS if not guard.expired]
+    if deadlines:
+        _interval(max(min(deadlines) - monotonic(), 1e-6))
+        # 0 would disarm the timer, an overdue deadline fires at once
+
+def _switching(frame: Any) -> bool:
+    """
+    Check if a thread is arming or disarming a watchdog, where raising would leave it half done.
+    """
+    while frame is not None:
+        if frame.f_code is Watchdog.__enter__.__code__ or frame.f_code is Watchdog.__exit__.__code__:
+            return True
+        frame = frame.f_back
+    return False
+
+def _alarm(signum: int, frame: Any) -> None:
+    """
+    Handle `SIGALRM`: raise `TimeoutError` in the main thread for the earliest expired watchdog.
+    """
+    if _switching(frame):
+        _interval(SWITCH_DELAY) if GUARDS else None
+        return
+    # Signal again shortly, `__enter__()` or `__exit__()` will be done by then. Once the last watchdog is removed,
+    # the timer must stay disarmed, since its previous handler is about to be restored
+    now = monotonic()
+    expired = [guard for guard in GUARDS if not guard.expired and guard.deadline <= now]
+    if not expired:
+        _rearm()
+        return
+    # The timer may fire a little early
+    for guard in expired:
+        guard.expired = True
+    _rearm()
+    print("Watchdog expired!") if expired[0].visibility else None
+    raise expired[0]._error()
+
+
+class Watchdog(ContextDecorator):
+    def __init__(self, seconds: Union[int, float], visibility: bool = False) -> None:
+        """
+        Initialize a watchdog, which interrupts a block of code that runs longer than `seconds`.
+
+        Args:
+            seconds (Union[int, float]): The time budget of the block in seconds. Must be a positive number,
+                fractions of a second are allowed.
+            visibility (bool): Determines if messages should be displayed. Default is False.
+
+        Raises:
+            TypeError: If `seconds` is not numeric or if `visibility` is not a boolean.
+            ValueError: If `seconds` is not greater than 0.
+
+        Notes:
+            - Unlike an `HourGlass`, which suspends the main process to run a function, the watchdog raises
+            `TimeoutError` inside the guarded block, so the runaway work actually stops. No thread or process is started.
+            - In the main thread, the watchdog arms the interval timer of the process (`signal.setitimer()`), whose
+            `SIGALRM` handler raises the error, also during a blocking call such as `time.sleep()`. Nested watchdogs
+            share the timer, which is armed at the earliest deadline.
+            - In other threads, or where `setitimer()` does not exist, the watchdog arms a timeout in the shared
+            `TimeoutWheel`, which raises the error in the guarded thread with `PyThreadState_SetAsyncExc()`. It is
+            raised as soon as the thread runs Python code again, so a blocking call is not interrupted.
+            - Leaving the block disarms the watchdog at once, and an error that was raised too late to be delivered
+            inside the block is cleared, so it never escapes past the `with` statement.
+            - An instance guards one block at a time. Used as a decorator, each call gets its own watchdog, and a
+            coroutine function is guarded by `asyncio.wait_for()`.
+        """
+        if not isinstance(seconds, (int, float)) or isinstance(seconds, bool):
+            raise TypeError(f"Seconds must be a number! Got {type(seconds)}!")
+        elif seconds <= 0:
+            raise ValueError(f"Seconds must be greater than 0! Got {seconds}!")
+        else: self.seconds: Union[int, float] = seconds
+        # Time budget of the block
+
+        if not isinstance(visibility, bool):
+            raise TypeError(f"Visibility must be a boolean! Got {type(visibility)}!")
+        else: self.visibility: bool = visibility
+        # Defines if messages will be displayed
+
+        self.deadline: Optional[float] = None
+        # Monotonic deadline of the guarded block, `None` outside of it
+        self.expired: bool = False
+        # Defines if the time budget ran out during the last block
+
+        self.__timeout: Optional[Timeout] = None
+        self.__thread: Optional[int] = None
+        self.__lock: Lock = Lock()
+        # Timeout of the wheel and identifier of the guarded thread, outside of the main thread
+
+    def __str__(self) -> str:
+        return f"Class Watchdog()\nVisibility: {self.visibility}\nSeconds: {self.seconds}\nArmed: {self.status}\nExpired: {self.expired}\n"
+
+    def __enter__(self) -> "Watchdog":
+        """
+        Arm the watchdog.
+
+        Returns:
+            Watchdog: The Watchdog instance itself.
+
+        Raises:
+            RuntimeError: If the watchdog is already armed.
+        """
+        global _PREVIOUS_HANDLER
+
+        if self.status:
+            raise RuntimeError("Watchdog already armed!")
+
+        self.expired = False
+        self.deadline = monotonic() + self.seconds
+        if current_thread() is main_thread() and hasattr(signal, "setitimer"):
+            if not GUARDS:
+                _PREVIOUS_HANDLER = signal.signal(signal.SIGALRM, _alarm)
+            GUARDS.append(self)
+            _rearm()
+        else:
+            with self.__lock:
+                self.__thread = get_ident()
+                self.__timeout = TimeoutWheel.shared().arm(self.seconds, self._interrupt)
+            # Under the lock of `_interrupt()`, so a timeout armed again by it is never overwritten here
+        print("Watchdog armed!") if self.visibility else None
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[BaseException], traceback: Any) -> None:
+        """
+        Disarm the watchdog.
+
+        Args:
+            exc_type (Optional[type]): The type of exception that occurred, if any.
+            exc_value (Optional[BaseException]): The exception, if any.
+            traceback (Any): The traceback information.
+
+        Raises:
+            TimeoutError: If the block ran out of time, with the traceback of the interrupted code.
+        """
+        global _PREVIOUS_HANDLER
+
+        if self in GUARDS:
+            GUARDS.remove(self)
+            _interval(0)
+            # Removed first, so a signal handled meanwhile does not arm the timer again after the last watchdog
+            if GUARDS:
+                _rearm()
+            else:
+                signal.signal(signal.SIGALRM, _PREVIOUS_HANDLER if _PREVIOUS_HANDLER is not None else signal.SIG_DFL)
+                _PREVIOUS_HANDLER = None
+                # A handler installed outside of Python is reported as `None`
+        else:
+            with self.__lock:
+                self.__timeout.cancel()
+                if self.expired:
+                    pythonapi.PyThreadState_SetAsyncExc(c_ulong(self.__thread), None)
+                self.__timeout, self.__thread = None, None
+            # Under the lock of `_interrupt()`: the error is either not raised, or cleared if it is still pending,
+            # also when the block is left by another exception
+        self.deadline = None
+
+        if self.expired and exc_type is TimeoutError and not exc_value.args:
+            raise self._error().with_traceback(traceback) from None
+        # An error raised by `PyThreadState_SetAsyncExc()` has no message
+
+    def __call__(self, func: Callable) -> Callable:
+        """
+        Decorate a function so each call is guarded.
+
+        Args:
+            func (Callable): The function to be guarded.
+
+        Returns:
+            Callable: The decorated function.
+
+        Notes:
+            - Each call arms a new watchdog with the same budget, so the function can run in many threads at once.
+            - A coroutine function is cancelled with `asyncio.wait_for()` when it runs out of time, which raises
+            `TimeoutError` (`asyncio.TimeoutError` before Python 3.11) without touching the event loop thread.
+        """
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def guarded_coroutine(*args, **kwargs):
+                return await asyncio.wait_for(func(*args, **kwargs), self.seconds)
+            return guarded_coroutine
+
+        @wraps(func)
+        def guarded(*args, **kwargs):
+            with Watchdog(self.seconds, self.visibility):
+                return func(*args, **kwargs)
+        return guarded
+
+    def _interrupt(self) -> None:
+        """
+        Raise `TimeoutError` in the guarded thread, from the driver of the `TimeoutWheel`.
+
+        Notes:
+            - If the thread is inside `__enter__()` or `__exit__()`, the timeout is armed again `SWITCH_DELAY` seconds
+            later (one tick of the wheel), like the interval timer of the main thread, so the expiry is never lost.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                return
+            elif _switching(sys._current_frames().get(self.__thread)):
+                self.__timeout = TimeoutWheel.shared().arm(SWITCH_DELAY, self._interrupt)
+            else:
+                self.expired = True
+                pythonapi.PyThreadState_SetAsyncExc(c_ulong(self.__thread), py_object(TimeoutError))
+                print("Watchdog expired!") if self.visibility else None
+
+    def _error(self) -> TimeoutError:
+        """
+        Return the error raised in the guarded block.
+        """
+        return TimeoutError(f"Block ran out of its {self.seconds} seconds!")
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the watchdog is armed.
+
+        Returns:
+            bool: `True` inside the guarded block, `False` otherwise.
+        """
+        return self.deadline is not None
+
+    @property
+    def remaining_seconds(self) -> Union[int, float]:
+        """
+        Show the remaining time in seconds.
+
+        Returns:
+            int | float: The remaining time in seconds, rounded up to the millisecond, or 0 if the watchdog is not armed.
+        """
+        return ceil(max(self.deadline - monotonic(), 0) * 1000) / 1000 if self.status else 0
+
+    @property
+    def remaining_time(self) -> timedelta:
+        """
+        Show the remaining time in `timedelta` format (HH:MM:SS.ms).
+
+        Returns:
+            timedelta: The remaining time of the watchdog.
+        """
+        return timedelta(seconds=self.remaining_seconds)
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,464 @@
+from datetime import timedelta
+from math import ceil, inf
+from os import getpid
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+from ._dispatch import run_function
+
+BITS: int = 8
+SLOTS: int = 1 << BITS
+MASK: int = SLOTS - 1
+# each level of the wheel has 256 slots, and a slot of a level spans the whole level below
+
+
+class Timeout:
+    __slots__ = ("wheel", "tick", "deadline", "target", "args", "slot")
+
+    def __init__(self, wheel: "TimeoutWheel", target: Optional[Callable], args: Optional[tuple]) -> None:
+        """
+        Initialize the handle of a timeout armed in a `TimeoutWheel`.
+
+        Args:
+            wheel (TimeoutWheel): The wheel that holds the timeout.
+            target (Optional[Callable]): The function to be executed when the timeout expires.
+            args (Optional[tuple]): The arguments of the function.
+
+        Notes:
+            - Handles are created by `TimeoutWheel.arm()`, they are not meant to be instantiated directly.
+            - `slot` is the set of the wheel that holds the timeout, or `None` once it has expired or been cancelled,
+            so cancelling is a single removal from a set.
+        """
+        self.wheel: "TimeoutWheel" = wheel
+        self.tick: int = 0
+        self.deadline: float = 0.0
+        self.target: Optional[Callable] = target
+        self.args: Optional[tuple] = args
+        self.slot: Optional[Set["Timeout"]] = None
+
+    def __str__(self) -> str:
+        return f"Class Timeout()\nArmed: {self.status}\nRemaining time: {self.remaining_seconds}\nFunction: {self.target}\nArguments: {self.args}\n"
+
+    def cancel(self) -> bool:
+        """
+        Cancel the timeout.
+
+        Returns:
+            bool: `True` if the timeout was armed, `False` if it had already expired or been cancelled.
+
+        Notes:
+            - Unlike `HourGlass.stop()`, cancelling a timeout that is not armed does not raise: a request usually
+            finishes right before or after its timeout, and both are normal.
+        """
+        return self.wheel._cancel(self)
+
+    def reschedule(self, seconds: Union[int, float]) -> None:
+        """
+        Arm the timeout again, to expire `seconds` from now, whether it is armed, expired or cancelled.
+
+        Args:
+            seconds (Union[int, float]): The new remaining time in seconds.
+
+        Raises:
+            TypeError: If `seconds` is not numeric.
+            ValueError: If `seconds` is negative.
+        """
+        self.wheel._arm(self, seconds)
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the timeout is armed.
+
+        Returns:
+            bool: `True` until the timeout expires or is cancelled, `False` otherwise.
+        """
+        return self.slot is not None
+
+    @property
+    def remaining_seconds(self) -> Union[int, float]:
+        """
+        Show the remaining time in seconds.
+
+        Returns:
+            int | float: The remaining time in seconds, rounded up to the millisecond, or 0 if the timeout is not armed.
+        """
+        return ceil(max(self.deadline - monotonic(), 0) * 1000) / 1000 if self.slot is not None else 0
+
+    @property
+    def remaining_time(self) -> timedelta:
+        """
+        Show the remaining time in `timedelta` format (HH:MM:SS.ms).
+
+        Returns:
+            timedelta: The remaining time of the timeout.
+        """
+        return timedelta(seconds=self.remaining_seconds)
+
+
+class TimeoutWheel:
+    __shared: Dict[int, "TimeoutWheel"] = {}
+    # shared wheel of each process, indexed by process id
+
+    __shared_lock: Lock = Lock()
+    # lock guarding the creation of the shared wheels
+
+    def __init__(self, resolution: Union[int, float] = 0.01, levels: int = 4, visibility: bool = False) -> None:
+        """
+        Initialize a hierarchical timing wheel, which holds many short timeouts in the current process.
+
+        Args:
+            resolution (Union[int, float]): The duration of a tick in seconds. Timeouts expire on tick boundaries,
+                never early and at most one tick late. Defaults to 0.01.
+            levels (int): The number of levels of the wheel. With 256 slots per level, the wheel covers
+                `resolution * 256 ** levels` seconds, about 497 days by default. Defaults to 4.
+            visibility (bool): Determines if messages should be displayed. Default is False.
+
+        Raises:
+            TypeError: If `resolution` is not numeric, if `levels` is not an integer or if `visibility` is not a boolean.
+            ValueError: If `resolution` or `levels` is not greater than 0.
+
+        Notes:
+            - A timeout is a small handle stored in the set of a slot: arming hashes its expiry tick to a slot and
+            cancelling removes it from that set, both in O(1). A cancelled timeout releases its memory at once.
+            - The slots of the first level are the next 256 ticks. A timeout further away is stored in a higher level,
+            and moved down ("cascaded") when the lower level wraps around, so each timeout moves at most `levels` times.
+            - A single driver thread, started by `start()`, sleeps until the next non-empty slot and runs the functions
+            of the expired timeouts. Without it, `poll()` drives the wheel from any loop, e.g. an asyncio task.
+            - A timeout beyond the range of the wheel is kept in its last level until it gets close enough.
+        """
+        if not isinstance(resolution, (int, float)) or isinstance(resolution, bool):
+            raise TypeError(f"Resolution must be a number! Got {type(resolution)}!")
+        elif resolution <= 0:
+            raise ValueError(f"Resolution must be greater than 0! Got {resolution}!")
+        else: self.resolution: Union[int, float] = resolution
+        # Duration of a tick in seconds
+
+        if not isinstance(levels, int) or isinstance(levels, bool):
+            raise TypeError(f"Levels must be an integer! Got {type(levels)}!")
+        elif levels <= 0:
+            raise ValueError(f"Levels must be greater than 0! Got {levels}!")
+        else: self.levels: int = levels
+        # Number of levels of the wheel
+
+        if not isinstance(visibility, bool):
+            raise TypeError(f"Visibility must be a boolean! Got {type(visibility)}!")
+        else: self.visibility: bool = visibility
+        # Defines if messages will be displayed
+
+        self.__origin: float = monotonic()
+        self.__tick: int = 0
+        # Next tick to process, counted from `__origin`
+        self.__wheels: List[List[Set[Timeout]]] = [[set() for _ in range(SLOTS)] for _ in range(levels)]
+        self.__pending: int = 0
+        self.__lock: Lock = Lock()
+        self.__wake: Event = Event()
+        self.__next: Union[int, float] = -1
+        # Tick the driver sleeps until: infinite while it waits for a timeout, -1 without driver
+        self.__driver: Optional[Thread] = None
+        self.__control: Lock = Lock()
+        # Lock serializing `start()` and `stop()`, so a wheel never has two drivers
+
+    def __str__(self) -> str:
+        return f"Class TimeoutWheel()\nResolution: {self.resolution}\nLevels: {self.levels}\nPending timeouts: {self.__pending}\nRunning: {self.status}\n"
+
+    def __len__(self) -> int:
+        return self.__pending
+
+    @classmethod
+    def shared(cls) -> "TimeoutWheel":
+        """
+        Return the shared wheel of the current process, creating and starting it if needed.
+
+        Returns:
+            TimeoutWheel: The wheel shared by the whole process, with the default resolution.
+
+        Notes:
+            - The wheel is created and started under a class lock, so concurrent first calls share one wheel and one
+            driver. Once it runs, it is returned without taking the lock, since a `Timer` with a budget calls this
+            method on every run. A forked child has another process id, so it gets its own wheel.
+        """
+        wheel = cls.__shared.get(getpid())
+        if wheel is not None and wheel.status:
+            return wheel
+        with cls.__shared_lock:
+            wheel = cls.__shared.get(getpid())
+            if wheel is None or not wheel.status:
+                wheel = cls.__shared[getpid()] = cls().start()
+            return wheel
+
+    def start(self) -> "TimeoutWheel":
+        """
+        Start the driver thread.
+
+        Returns:
+            TimeoutWheel: The current instance of the `TimeoutWheel` class.
+
+        Raises:
+            RuntimeError: If the driver is already running.
+        """
+        with self.__control:
+            if self.status:
+                raise RuntimeError("Timeout wheel already running!")
+            self.__driver = Thread(target=self._drive, name="ptymer-wheel", daemon=True)
+            self.__driver.start()
+        print("Timeout wheel started!") if self.visibility else None
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the driver thread and cancel every pending timeout.
+
+        Raises:
+            RuntimeError: If the driver is not running.
+        """
+        with self.__control:
+            if not self.status:
+                raise RuntimeError("There is no timeout wheel running!")
+            driver, self.__driver = self.__driver, None
+            self.__wake.set()
+            driver.join()
+            with self.__lock:
+                self.__next = -1
+                for wheel in self.__wheels:
+                    for slot in wheel:
+                        for timeout in slot:
+                            timeout.slot = None
+                        slot.clear()
+                self.__pending = 0
+        print("Timeout wheel stopped!") if self.visibility else None
+
+    @property
+    def status(self) -> bool:
+        """
+        Check if the driver thread is running.
+
+        Returns:
+            bool: `True` if the driver is alive, `False` otherwise.
+        """
+        return self.__driver is not None and self.__driver.is_alive()
+
+    def arm(self, seconds: Union[int, float], target: Optional[Callable] = None, args: Optional[tuple] = None) -> Timeout:
+        """
+        Arm a timeout.
+
+        Args:
+            seconds (Union[int, float]): The time in seconds until the timeout expires.
+            target (Optional[Callable]): The function to be executed when the timeout expires. Defaults to None.
+            args (Optional[tuple]): The arguments of the function. Defaults to None.
+
+        Returns:
+            Timeout: The handle of the timeout, to cancel or reschedule it.
+
+        Raises:
+            TypeError: If `seconds` is not numeric, if `target` is not a callable function or if `args` is not a tuple.
+            ValueError: If `seconds` is negative, or if `args` are defined without a target function.
+
+        Notes:
+            - The function runs in the driver thread, or in the thread that calls `poll()`, so it should be short.
+        """
+        if target is not None and not callable(target):
+            raise TypeError(f"Target must be a function! Got {type(target)}!")
+        elif args is not None and not isinstance(args, tuple):
+            raise TypeError(f"Arguments must be a tuple! Got {type(args)}!")
+        elif args and not target:
+            raise ValueError(f"Arguments cannot be defined without a target function!")
+        timeout = Timeout(self, target, args)
+        self._arm(timeout, seconds)
+        return timeout
+
+    def poll(self) -> Optional[float]:
+        """
+        Expire the due timeouts and run their functions.
+
+        Returns:
+            Optional[float]: The time in seconds until the next non-empty slot, or `None` if no timeout is pending.
+
+        Notes:
+            - `start()` runs this method in its driver thread. Without a driver, call it from any loop, for instance
+            `await asyncio.sleep(wheel.poll() or 1)` in an asyncio task.
+            - After a stall longer than a turn of the first level, the wheel leaps to the current tick (see `_leap()`)
+            instead of walking each elapsed tick.
+        """
+        now = int((monotonic() - self.__origin) / self.resolution)
+        expired: List[Timeout] = []
+        with self.__lock:
+            if not self.__pending:
+                self.__tick = now + 1
+            # An empty wheel jumps to the current tick at once
+            elif now - self.__tick > SLOTS:
+                self._leap(now, expired)
+            while self.__tick <= now:
+                self._expire(expired)
+            upcoming = self._upcoming()
+        for timeout in expired:
+            run_function(timeout.target, timeout.args)
+        if upcoming is None:
+            return None
+        return max(self.__origin + upcoming * self.resolution - monotonic(), 0)
+
+    def _arm(self, timeout: Timeout, seconds: Union[int, float]) -> None:
+        """
+        Insert a timeout at `seconds` from now, after removing it from its current slot.
+
+        Raises:
+            TypeError: If `seconds` is not numeric.
+            ValueError: If `seconds` is negative.
+        """
+        if seconds.__class__ is bool or not isinstance(seconds, (int, float)):
+            raise TypeError(f"Seconds must be a number! Got {type(seconds)}!")
+        elif seconds < 0:
+            raise ValueError(f"Seconds must not be negative! Got {seconds}!")
+
+        with self.__lock:
+            now = monotonic() - self.__origin
+            timeout.deadline = self.__origin + now + seconds
+            timeout.tick = tick = ceil((now + seconds) / self.resolution)
+            # The first tick at or after the deadline, so a timeout never expires early. Written with the lock held,
+            # since the driver reads them to expire or move the timeout
+            if timeout.slot is not None:
+                timeout.slot.discard(timeout)
+            elif not self.__pending:
+                self.__tick = max(min(self.__tick, tick), int(now / self.resolution))
+                self.__pending += 1
+            else:
+                self.__pending += 1
+            # The next tick of an empty wheel may be stale or ahead, it moves to the current tick
+            self._insert(timeout)
+            if tick < self.__next:
+                self.__wake.set()
+            # The driver sleeps until a later tick, or until a timeout is armed
+
+    def _cancel(self, timeout: Timeout) -> bool:
+        """
+        Remove a timeout from its slot.
+
+        Returns:
+            bool: `True` if the timeout was armed, `False` otherwise.
+        """
+        with self.__lock:
+            slot = timeout.slot
+            if slot is None:
+                return False
+            slot.discard(timeout)
+            timeout.slot = None
+            self.__pending -= 1
+            return True
+
+    def _insert(self, timeout: Timeout) -> None:
+        """
+        Store a timeout in the slot of its expiry tick, in the lowest level that reaches it.
+
+        Notes:
+            - Must be called with `__lock` held.
+        """
+        tick, ticks = timeout.tick, timeout.tick - self.__tick
+        if ticks < SLOTS:
+            slot = self.__wheels[0][(tick if ticks > 0 else self.__tick) & MASK]
+        else:
+            level = (ticks.bit_length() - 1) // BITS
+            if level >= self.levels:
+                level = self.levels - 1
+                tick = self.__tick + (1 << (BITS * self.levels)) - 1
+            # Beyond the range of the wheel, the timeout waits in the farthest slot and is inserted again from there
+            slot = self.__wheels[level][(tick >> (BITS * level)) & MASK]
+        slot.add(timeout)
+        timeout.slot = slot
+
+    def _expire(self, expired: List[Timeout]) -> None:
+        """
+        Process the next tick: cascade the higher levels if the first one wraps around, and expire its slot.
+
+        Args:
+            expired (List[Timeout]): The list that receives the expired timeouts.
+
+        Notes:
+            - Must be called with `__lock` held.
+        """
+        tick = self.__tick
+        if not tick & MASK:
+            for level in range(1, self.levels):
+                position = (tick >> (BITS * level)) & MASK
+                slot = self.__wheels[level][position]
+                if slot:
+                    self.__wheels[level][position] = set()
+                    [self._insert(timeout) for timeout in slot]
+                if position:
+                    break
+        # Each higher slot is emptied into the lower levels when its turn comes
+
+        position = tick & MASK
+        slot = self.__wheels[0][position]
+        if slot:
+            self.__wheels[0][position] = set()
+            for timeout in slot:
+                if timeout.tick > tick:
+                    self._insert(timeout)
+                    continue
+                # A timeout beyond the range of a single-level wheel goes around again
+                timeout.slot = None
+                self.__pending -= 1
+                expired.append(timeout)
+        self.__tick = tick + 1
+
+    def _leap(self, now: int, expired: List[Timeout]) -> None:
+        """
+        Move the wheel to the tick after `now` at once: expire the due timeouts and insert the others again.
+
+        Args:
+            now (int): The current tick.
+            expired (List[Timeout]): The list that receives the expired timeouts, in the order of their ticks.
+
+        Notes:
+            - Must be called with `__lock` held.
+            - Costs O(levels * 256 + pending) whatever the number of elapsed ticks: the pending timeouts are inserted
+            from the new tick as if they were armed now, so the next cascades find them where `arm()` would put them.
+        """
+        timeouts: List[Timeout] = []
+        for wheel in self.__wheels:
+            for slot in wheel:
+                timeouts.extend(slot)
+                slot.clear()
+        self.__tick = now + 1
+        due = sorted((timeout for timeout in timeouts if timeout.tick <= now), key=lambda timeout: timeout.tick)
+        for timeout in due:
+            timeout.slot = None
+        self.__pending -= len(due)
+        expired.extend(due)
+        [self._insert(timeout) for timeout in timeouts if timeout.tick > now]
+
+    def _upcoming(self) -> Optional[int]:
+        """
+        Return the next tick to wake up at: the next non-empty slot of the first level, or the next cascade.
+
+        Notes:
+            - Must be called with `__lock` held.
+        """
+        if not self.__pending:
+            return None
+        first = self.__wheels[0]
+        for tick in range(self.__tick, (self.__tick | MASK) + 1):
+            if first[tick & MASK]:
+                return tick
+        return (self.__tick | MASK) + 1
+
+    def _drive(self) -> None:
+        """
+        Run the driver loop.
+
+        Notes:
+            - The driver sleeps on the `__wake` event until its next tick. `arm()` sets the event when a timeout
+            expires earlier, and `stop()` to end the loop, so an idle wheel does not consume CPU.
+        """
+        driver = self.__driver
+        while self.__driver is driver:
+            self.poll()
+            with self.__lock:
+                upcoming = self._upcoming()
+                self.__next = inf if upcoming is None else upcoming
+                self.__wake.clear()
+            # Cleared with the lock held, so a timeout armed from now on wakes the driver
+            self.__wake.wait(None if upcoming is None else max(self.__origin + upcoming * self.resolution - monotonic(), 0))
+
+if __name__ == "__main__":
+    pass
@@ -7,7 +7,10 @@ except ImportError:
 finally:
     from datetime import datetime, timedelta
     import pytest
-    from psutil import pid_exists
+    from psutil import Process, pid_exists
+    from time import sleep
+    from multiprocessing import Value
+    import threading
 
 #####################################################################
 #                                                                   #
@@ -81,4 +84,109 @@ def test_error_alarm_pid():
 def test_error_alarm_wait():
     a = Alarm([datetime.now() + timedelta(seconds=2)])
     with pytest.raises(RuntimeError):
-        a.wait()
\ No newline at end of file
+        a.wait()
+
+def test_alarm_idle_cpu():
+    a = Alarm([datetime.now() + timedelta(seconds=5)])
+    a.start()
+    sleep(1)
+    times = Process(a.pid).cpu_times()
+    assert times.user + times.system < 0.5
+    a.stop()
+
+def test_alarm_multiple_schedules():
+    now = datetime.now()
+    a = Alarm([now + timedelta(seconds=2), now + timedelta(seconds=1)])
+    a.start()
+    a.wait()
+    assert a.status == False
+
+def count_up(counter):
+    with counter.get_lock():
+        counter.value += 1
+
+def test_alarm_add_remove_schedule():
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=30)], target=count_up, args=(counter,)).start()
+    a.add_schedule(now + timedelta(seconds=1))
+    a.remove_schedule(now + timedelta(seconds=30))
+    assert a.schedules == [now + timedelta(seconds=1)]
+    a.wait()
+    assert counter.value == 1
+    assert a.status == False
+
+def test_alarm_reschedule_thread():
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=30)], target=count_up, args=(counter,), backend="thread").start()
+    a.reschedule(now + timedelta(seconds=30), now + timedelta(seconds=1))
+    a.wait()
+    assert counter.value == 1
+
+def test_alarm_remove_while_firing(monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+    now = datetime.now().replace(microsecond=0)
+    schedules = [now + timedelta(seconds=offset) for offset in (3, 2, 1)] * 500
+    a = Alarm(list(schedules), backend="thread", misfire="all").start()
+    assert a.schedules[:3] == [now + timedelta(seconds=1)] * 3
+    # The dates are sorted, so each firing removes the first one
+    sleep(0.9)
+    for date in schedules[::-1]:
+        try:
+            a.remove_schedule(date)
+        except ValueError:
+            pass
+        # Already fired
+    a.wait()
+    assert errors == []
+    assert a.schedules == []
+
+def slow_count_up(counter):
+    sleep(1.5)
+    count_up(counter)
+
+@pytest.mark.parametrize("misfire, fired, missed", [("skip", 2, [(1, False)]), ("coalesce", 3, [(1, True), (2, True)])])
+def test_alarm_misfire(misfire, fired, missed):
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    schedules = [now + timedelta(seconds=offset) for offset in (1, 2, 3)]
+    a = Alarm(list(schedules), target=slow_count_up, args=(counter,), backend="thread", misfire=misfire, grace=0.2).start()
+    a.wait()
+    # The second schedule passes while the function of the first one runs, and so does the third one if the second fires
+    assert counter.value == fired
+    assert [(date, was_fired, count) for date, _, was_fired, count in a.misfires] == [(schedules[index], value, 1) for index, value in missed]
+    assert a.schedules == []
+
+def test_alarm_misfire_past_schedule():
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now - timedelta(seconds=5), now + timedelta(seconds=1)], target=count_up, args=(counter,),
+              backend="inline", misfire="all").start()
+    assert a.schedules == [now + timedelta(seconds=1)]
+    # A date already passed when the alarm starts is not a misfire
+    a.wait()
+    assert counter.value == 1
+    assert a.misfires == []
+
+def test_error_alarm_misfire():
+    with pytest.raises(ValueError):
+        Alarm([datetime.now()], misfire="later")
+    with pytest.raises(TypeError):
+        Alarm([datetime.now()], grace="1")
+    with pytest.raises(ValueError):
+        Alarm([datetime.now()], grace=-1)
+
+def test_alarm_add_schedule_not_running():
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=5)])
+    a.add_schedule((now + timedelta(seconds=6)).isoformat())
+    assert a.schedules == [now + timedelta(seconds=5), now + timedelta(seconds=6)]
+
+def test_error_alarm_remove_schedule():
+    a = Alarm([datetime.now() + timedelta(seconds=5)])
+    with pytest.raises(ValueError):
+        a.remove_schedule(datetime.now() + timedelta(hours=1))
+    with pytest.raises(TypeError):
+        a.add_schedule("not a date")
@@ -0,0 +1,191 @@
+try:
+    from ptymer import AsyncHourGlass, AsyncAlarm
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import AsyncHourGlass, AsyncAlarm
+finally:
+    from datetime import datetime, timedelta
+    from time import monotonic
+    from threading import Thread, active_count
+    import asyncio
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                           ASYNC TESTS                             #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def test_async_hourglass_wait():
+    fired = []
+
+    async def main():
+        h = AsyncHourGlass(0.2, target=fired.append, args=(True,)).start()
+        assert h.status == True
+        await h.wait()
+        assert h.status == False
+
+    start = monotonic()
+    asyncio.run(main())
+    assert 0.2 <= monotonic() - start < 0.5
+    assert fired == [True]
+
+def test_async_hourglass_coroutine_target():
+    fired = []
+
+    async def target(value):
+        await asyncio.sleep(0.1)
+        fired.append(value)
+
+    async def main():
+        h = AsyncHourGlass(0.1, target=target, args=(True,)).start()
+        await h.wait()
+
+    asyncio.run(main())
+    assert fired == [True]
+
+def test_async_hourglass_coroutine_future():
+    async def target(value):
+        await asyncio.sleep(0.1)
+        return 2 * value
+
+    async def fail():
+        raise ValueError("boom")
+
+    async def main():
+        h = AsyncHourGlass(0.1, target=target, args=(21,)).start()
+        failing = AsyncHourGlass(0.1, target=fail).start()
+        await asyncio.gather(h.wait(), failing.wait())
+        return h.future, failing.future
+
+    future, failing = asyncio.run(main())
+    assert future.result(timeout=0) == 42
+    assert isinstance(failing.exception(timeout=0), ValueError)
+
+def test_async_hourglass_stop():
+    fired = []
+
+    async def main():
+        h = AsyncHourGlass(0.2, target=fired.append, args=(True,)).start()
+        await asyncio.sleep(0.05)
+        h.stop()
+        assert h.status == False
+        assert 0.1 <= h.remaining_seconds <= 0.15
+        await asyncio.sleep(0.3)
+
+    asyncio.run(main())
+    assert fired == []
+
+def test_async_hourglass_call():
+    async def main():
+        h = AsyncHourGlass(5).start()
+        h(0.1)
+        start = monotonic()
+        await h.wait()
+        assert monotonic() - start < 0.5
+
+    asyncio.run(main())
+
+def test_async_hourglass_reschedule_thread():
+    async def main():
+        h = AsyncHourGlass(5).start()
+        await asyncio.sleep(0.05)
+        threads = [Thread(target=h, args=(0.1 * (i + 1),)) for i in range(8)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        start = monotonic()
+        await h.wait()
+        return monotonic() - start
+
+    assert asyncio.run(main(), debug=True) < 1.5
+    # Concurrent changes from other threads are applied by the loop, one wake-up at a time
+
+def test_async_no_thread():
+    threads = active_count()
+    async def main():
+        await AsyncHourGlass(0.1, target=len, args=((),)).start().wait()
+        assert active_count() == threads
+
+    asyncio.run(main())
+
+def test_async_hourglass_many():
+    fired = []
+
+    async def main():
+        hourglasses = [AsyncHourGlass(0.5, target=fired.append, args=(i,)).start() for i in range(1000)]
+        await asyncio.gather(*(h.wait() for h in hourglasses))
+
+    asyncio.run(main())
+    assert len(fired) == 1000
+
+def test_async_alarm_wait():
+    fired = []
+
+    async def target():
+        fired.append(True)
+
+    async def main():
+        a = AsyncAlarm([datetime.now() + timedelta(seconds=1)], target=target).start()
+        assert a.status == True
+        await a.wait()
+
+    asyncio.run(main())
+    assert fired == [True]
+
+def test_async_alarm_coroutine_futures():
+    async def target():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        a = AsyncAlarm([datetime.now() + timedelta(seconds=1)], target=target).start()
+        assert a.dispatch == "suspend"
+        await a.wait()
+        return a.futures
+
+    futures = asyncio.run(main(), debug=True)
+    # In debug mode, the loop raises if the coroutine is scheduled from another thread
+    assert [future.result(timeout=0) for future in futures] == ["done"]
+
+def test_async_alarm_stop():
+    async def main():
+        a = AsyncAlarm([datetime.now() + timedelta(seconds=5)]).start()
+        a.stop()
+        assert a.status == False
+
+    asyncio.run(main())
+
+def test_async_alarm_reschedule():
+    fired = []
+    async def main():
+        now = datetime.now().replace(microsecond=0)
+        a = AsyncAlarm([now + timedelta(seconds=30)], target=lambda: fired.append(monotonic())).start()
+        await asyncio.sleep(0)
+        a.reschedule(now + timedelta(seconds=30), now + timedelta(seconds=1))
+        await a.wait()
+
+    asyncio.run(main())
+    assert len(fired) == 1
+
+def test_error_async_without_loop():
+    with pytest.raises(RuntimeError):
+        AsyncHourGlass(1).start()
+    with pytest.raises(RuntimeError):
+        AsyncAlarm([datetime.now()]).start()
+
+def test_error_async_validation():
+    with pytest.raises(TypeError):
+        AsyncHourGlass("5")
+    with pytest.raises(TypeError):
+        AsyncAlarm("5")
+    with pytest.raises(TypeError):
+        AsyncAlarm([datetime.now()], backend="process")
+    with pytest.raises(TypeError):
+        AsyncAlarm([datetime.now()], dispatch="queue")
+
+def test_error_async_wait_not_started():
+    with pytest.raises(RuntimeError):
+        asyncio.run(AsyncHourGlass(1).wait())
@@ -0,0 +1,109 @@
+try:
+    from ptymer import HourGlass, Alarm
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import HourGlass, Alarm
+finally:
+    from datetime import datetime, timedelta
+    from time import sleep, monotonic
+    from os import getpid
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                         BACKEND TESTS                             #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def test_thread_hourglass_start_stop():
+    h = HourGlass(5, backend="thread").start()
+    assert h.status == True
+    assert h.pid == getpid()
+    h.stop()
+    assert h.status == False
+    assert 4.9 <= h.remaining_seconds <= 5
+
+def test_thread_hourglass_wait():
+    fired = []
+    h = HourGlass(0.2, target=fired.append, args=(True,), backend="thread").start()
+    h.wait()
+    assert h.status == False
+    assert fired == [True]
+
+def test_thread_hourglass_stop_does_not_fire():
+    fired = []
+    h = HourGlass(0.2, target=fired.append, args=(True,), backend="thread").start()
+    h.stop()
+    sleep(0.4)
+    assert fired == []
+
+def test_thread_hourglass_restart():
+    fired = []
+    h = HourGlass(0.3, target=fired.append, args=(True,), backend="thread").start()
+    h.stop()
+    h.start()
+    h.wait()
+    sleep(0.1)
+    assert fired == [True]
+
+def test_inline_hourglass_poll():
+    fired = []
+    h = HourGlass(0.2, target=fired.append, args=(True,), backend="inline").start()
+    assert h.status == True
+    assert 0 < h.poll() <= 0.2
+    assert fired == []
+    sleep(0.2)
+    assert h.poll() is None
+    assert fired == [True]
+    assert h.status == False
+
+def test_inline_hourglass_wait():
+    fired = []
+    start = monotonic()
+    h = HourGlass(0.2, target=fired.append, args=(True,), backend="inline").start()
+    h.wait()
+    assert 0.2 <= monotonic() - start < 0.5
+    assert fired == [True]
+
+def test_thread_alarm_wait():
+    fired = []
+    now = datetime.now()
+    a = Alarm([now + timedelta(seconds=1), now + timedelta(seconds=2)], target=fired.append, args=(True,), backend="thread").start()
+    assert a.pid == getpid()
+    a.wait()
+    assert a.status == False
+    assert fired == [True, True]
+    assert a.schedules == []
+
+def test_thread_alarm_stop():
+    a = Alarm([datetime.now() + timedelta(seconds=5)], backend="thread").start()
+    assert a.status == True
+    a.stop()
+    assert a.status == False
+
+def test_inline_alarm_poll():
+    fired = []
+    a = Alarm([datetime.now() + timedelta(seconds=1)], target=fired.append, args=(True,), backend="inline").start()
+    assert 0 < a.poll() <= 1
+    a.wait()
+    assert fired == [True]
+    assert a.poll() is None
+
+def test_error_poll_not_inline():
+    with pytest.raises(RuntimeError):
+        HourGlass(1).poll()
+    with pytest.raises(RuntimeError):
+        Alarm([datetime.now()], backend="thread").poll()
+
+def test_error_backend():
+    with pytest.raises(ValueError):
+        HourGlass(1, backend="fiber")
+    with pytest.raises(TypeError):
+        HourGlass(1, backend=1)
+    with pytest.raises(ValueError):
+        Alarm([datetime.now()], backend="fiber")
+    with pytest.raises(ValueError):
+        HourGlass(1, backend="thread", shared=True)
@@ -0,0 +1,169 @@
+try:
+    from ptymer import HourGlass, Alarm
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import HourGlass, Alarm
+finally:
+    from ptymer._dispatch import Dispatcher, check_policy
+    from ptymer import Every
+    import ptymer._alarm as alarm_module
+    from datetime import datetime, timedelta
+    from threading import Event, current_thread, active_count
+    from time import monotonic, sleep
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                         DISPATCH TESTS                            #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+FIRED = []
+# Only the main process sees its own list
+
+def record(value):
+    FIRED.append((value, current_thread().name))
+
+def slow():
+    sleep(0.6)
+
+def longest_pause(seconds):
+    """
+    Return the longest gap between two iterations of a busy loop of the main process.
+    """
+    longest, last, end = 0, monotonic(), monotonic() + seconds
+    while last < end:
+        now = monotonic()
+        longest, last = max(longest, now - last), now
+    return longest
+
+def test_check_policy():
+    assert check_policy("queue") == "queue"
+    with pytest.raises(TypeError):
+        check_policy(1)
+    with pytest.raises(ValueError):
+        check_policy("later")
+
+def test_dispatcher_shared():
+    assert Dispatcher.shared() is Dispatcher.shared()
+
+def test_dispatcher_queue():
+    dispatcher, done, futures = Dispatcher(), Event(), []
+    key = dispatcher.register(done.set, futures.append)
+    dispatcher.queue(key, last=True)
+    assert done.wait(1)
+    done.clear()
+    dispatcher.queue(key)
+    assert not done.wait(0.2)
+    # Released after its last run
+    assert len(futures) == 1
+
+def test_dispatcher_complete():
+    threads = active_count()
+    dispatcher, futures = Dispatcher(), []
+    key = dispatcher.register(None, futures.append)
+    dispatcher.complete(key, None)
+    dispatcher.complete(key, (True, 1))
+    dispatcher.complete(key, (False, ValueError("boom")), last=True)
+    dispatcher.complete(key, (True, 2))
+    assert [f.result() for f in futures[:2]] == [None, 1]
+    assert isinstance(futures[2].exception(), ValueError)
+    assert len(futures) == 3
+    assert active_count() == threads
+    # Outcomes completed in the main process need neither the pool nor the listener
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_hourglass_dispatch_queue(backend):
+    FIRED.clear()
+    h = HourGlass(0.2, target=record, args=(backend,), backend=backend, dispatch="queue").start()
+    h.wait()
+    sleep(0.2)
+    assert FIRED[0][0] == backend
+    assert FIRED[0][1].startswith("ptymer-dispatch")
+
+def test_hourglass_dispatch_concurrent():
+    HourGlass(0.2, target=slow, dispatch="concurrent").start()
+    assert longest_pause(1) < 0.3
+
+def test_hourglass_dispatch_suspend():
+    HourGlass(0.2, target=slow).start()
+    assert longest_pause(1.2) > 0.5
+
+def test_hourglass_dispatch_shared():
+    FIRED.clear()
+    h = HourGlass(0.2, target=record, args=("shared",), shared=True, dispatch="queue").start()
+    h.wait()
+    sleep(0.2)
+    assert FIRED[0][0] == "shared"
+
+def test_alarm_dispatch_queue():
+    FIRED.clear()
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=1), now + timedelta(seconds=2)], target=record, args=("alarm",), dispatch="queue").start()
+    a.wait()
+    sleep(0.2)
+    assert [value for value, _ in FIRED] == ["alarm", "alarm"]
+
+def double(value):
+    return 2 * value
+
+def fail():
+    raise ValueError("boom")
+
+@pytest.mark.parametrize("backend", ["process", "thread", "inline"])
+@pytest.mark.parametrize("dispatch", ["suspend", "concurrent", "queue"])
+def test_hourglass_future(backend, dispatch):
+    h = HourGlass(0.2, target=double, args=(21,), backend=backend, dispatch=dispatch).start()
+    h.wait() if backend == "inline" else None
+    # An inline hourglass only fires while the main thread waits or polls
+    assert h.future.result(timeout=2) == 42
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_hourglass_future_exception(backend):
+    h = HourGlass(0.2, target=fail, backend=backend, visibility=False).start()
+    assert isinstance(h.future.exception(timeout=2), ValueError)
+
+def test_hourglass_future_shared():
+    h = HourGlass(0.2, target=double, args=(2,), shared=True).start()
+    assert h.future.result(timeout=2) == 4
+
+def payload(fill):
+    return fill * (4 << 20)
+
+def test_hourglass_future_large_concurrent():
+    fills = (b"a", b"b", b"c", b"d")
+    hourglasses = [HourGlass(0.3, target=payload, args=(fill,), dispatch="concurrent").start() for fill in fills]
+    # The workers send results far larger than the atomic write size of a pipe at the same time
+    assert [h.future.result(timeout=5) for h in hourglasses] == [payload(fill) for fill in fills]
+
+def test_hourglass_future_unpicklable():
+    h = HourGlass(0.2, target=Event).start()
+    assert h.future.exception(timeout=2) is not None
+
+def test_hourglass_future_cancelled():
+    h = HourGlass(1, target=double, args=(1,)).start()
+    h.stop()
+    assert h.future.cancelled()
+
+def test_alarm_futures():
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=1), now + timedelta(seconds=2)], target=double, args=(3,)).start()
+    a.wait()
+    sleep(0.2)
+    assert [future.result(timeout=1) for future in a.futures] == [6, 6]
+
+def test_alarm_futures_bounded(monkeypatch):
+    monkeypatch.setattr(alarm_module, "HISTORY", 3)
+    a = Alarm([Every(0.05, until=datetime.now() + timedelta(seconds=0.5))], target=double, args=(1,), backend="inline").start()
+    a.wait()
+    assert len(a.futures) == 3
+    # Only the latest futures of a recurring alarm are kept
+
+def test_error_dispatch():
+    with pytest.raises(ValueError):
+        HourGlass(1, dispatch="later")
+    with pytest.raises(TypeError):
+        Alarm([datetime.now()], dispatch=None)
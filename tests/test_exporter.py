@@ -0,0 +1,98 @@
+try:
+    from ptymer import MetricsServer, render_metrics, Registry, Timer
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import MetricsServer, render_metrics, Registry, Timer
+finally:
+    from threading import Thread
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                        EXPORTER TESTS                             #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def test_render_histogram():
+    r = Registry()
+    for nanoseconds in (50_000, 2_000_000, 2_000_000, 3_000_000_000, 20_000_000_000):
+        r.record("job", nanoseconds)
+    lines = render_metrics(r).splitlines()
+    assert lines[0] == "# TYPE ptymer_timer_seconds histogram"
+    assert lines[-1] == "# EOF"
+    assert 'ptymer_timer_seconds_bucket{name="job",le="0.0001"} 1' in lines
+    assert 'ptymer_timer_seconds_bucket{name="job",le="0.0025"} 3' in lines
+    assert 'ptymer_timer_seconds_bucket{name="job",le="5"} 4' in lines
+    assert 'ptymer_timer_seconds_bucket{name="job",le="+Inf"} 5' in lines
+    assert 'ptymer_timer_seconds_count{name="job"} 5' in lines
+    assert 'ptymer_timer_seconds_sum{name="job"} 23.00405' in lines
+
+def test_render_tags():
+    r = Registry()
+    with Timer(name="request", registry=r, tags={"route": "/users", "method": "GET"}):
+        pass
+    with Timer(name="request", registry=r, tags={"route": "/items", "method": "GET"}):
+        pass
+    text = render_metrics(r)
+    assert 'ptymer_timer_seconds_count{name="request",method="GET",route="/users"} 1' in text
+    assert 'ptymer_timer_seconds_count{name="request",method="GET",route="/items"} 1' in text
+    assert set(r.snapshot()) == {'request{method="GET",route="/items"}', 'request{method="GET",route="/users"}'}
+
+def test_render_tag_keys():
+    r = Registry()
+    r.record("request", 1, tags={"http.route": "/users", "2xx": "yes", "_ok": "1"})
+    assert 'ptymer_timer_seconds_count{name="request",_2xx="yes",_ok="1",http_route="/users"} 1' in render_metrics(r)
+    # Keys recorded straight in a registry are sanitized, a timer rejects them
+
+def test_render_escape():
+    r = Registry()
+    r.record('say "hi"\n', 1)
+    assert 'name="say \\"hi\\"\\n"' in render_metrics(r)
+
+def test_render_while_recording():
+    r = Registry()
+    running = [True]
+
+    def work():
+        while running[0]:
+            r.record("hot", 1_000)
+
+    thread = Thread(target=work)
+    thread.start()
+    counts = [int(render_metrics(r).splitlines()[-2].rsplit(" ", 1)[1]) for _ in range(20)]
+    running[0] = False
+    thread.join()
+    assert counts == sorted(counts)
+
+def test_metrics_server():
+    r = Registry()
+    r.record("job", 1_000)
+    with MetricsServer(port=0, registry=r) as server:
+        response = urlopen(server.url)
+        assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+        assert 'ptymer_timer_seconds_count{name="job"} 1' in response.read().decode()
+        with pytest.raises(HTTPError):
+            urlopen(server.url.replace("/metrics", "/other"))
+    assert server.status == False
+
+def test_error_exporter():
+    with pytest.raises(TypeError):
+        render_metrics({})
+    with pytest.raises(ValueError):
+        render_metrics(Registry(), family="ptymer")
+    with pytest.raises(TypeError):
+        MetricsServer(port="9464")
+    with pytest.raises(TypeError):
+        Timer(tags={"route": 1})
+    with pytest.raises(ValueError):
+        Timer(tags={"http.route": "/users"})
+    with pytest.raises(ValueError):
+        Timer(tags={"2xx": "yes"})
+    server = MetricsServer(port=0, registry=Registry())
+    with pytest.raises(RuntimeError):
+        server.stop()
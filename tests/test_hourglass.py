@@ -5,7 +5,7 @@ except ImportError:
     sys.path.insert(1, r'.\src')
     from ptymer import HourGlass
 finally:
-    from time import sleep
+    from time import sleep, monotonic
     from psutil import pid_exists
     import pytest
 
@@ -39,7 +39,7 @@ def test_hourglass_remaining_time():
     h.start()
     sleep(2)
     h.stop()
-    assert h.remaining_seconds == 3
+    assert 2.9 <= h.remaining_seconds <= 3
 
 def test_hourglass_call():
     h = HourGlass(2)
@@ -47,12 +47,109 @@ def test_hourglass_call():
     h(3)
     assert h.remaining_seconds == 3
 
+def test_hourglass_fractional_seconds():
+    h = HourGlass(0.5)
+    start = monotonic()
+    h.start()
+    h.wait()
+    assert 0.5 <= monotonic() - start < 1
+    assert h.remaining_seconds == 0
+
+def test_hourglass_remaining_deadline():
+    h = HourGlass(2.5).start()
+    sleep(0.5)
+    assert 1.9 <= h.remaining_seconds <= 2
+    h.stop()
+
+def test_hourglass_call_wakes_up():
+    h = HourGlass(5).start()
+    start = monotonic()
+    h(0.5)
+    h.wait()
+    assert monotonic() - start < 1
+
 def test_hourglass_wait():
     h = HourGlass(2)
     h.start()
     h.wait()
     assert h.status == False
 
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_hourglass_pause_resume(backend):
+    h = HourGlass(seconds=0.5, backend=backend).start()
+    h.pause()
+    assert h.paused == True
+    remaining = h.remaining_seconds
+    sleep(0.7)
+    assert h.status == True
+    assert h.remaining_seconds == remaining
+    started = monotonic()
+    h.resume()
+    assert h.paused == False
+    h.wait()
+    assert 0.2 < monotonic() - started < 0.9
+
+def test_hourglass_extend():
+    h = HourGlass(seconds=0.3).start()
+    started = monotonic()
+    for _ in range(10000):
+        h.extend(0.0001)
+    # Kicks of a watchdog
+    assert h.remaining_seconds > 1
+    h.extend(-1)
+    h.wait()
+    assert monotonic() - started < 1
+
+def test_hourglass_extend_stopped():
+    h = HourGlass(seconds=1)
+    h.extend(2)
+    assert h.remaining_seconds == 3
+    with pytest.raises(ValueError):
+        h.extend(-3)
+    with pytest.raises(TypeError):
+        h.extend("1")
+
+def test_hourglass_reset():
+    h = HourGlass(seconds=0.6, backend="thread").start()
+    sleep(0.4)
+    h.reset()
+    assert h.remaining_seconds > 0.5
+    h.pause().reset()
+    assert h.paused == True and h.remaining_seconds == 0.6
+    h.stop()
+    assert h.remaining_seconds == 0.6
+
+def test_hourglass_pause_shared():
+    h = HourGlass(seconds=0.5, shared=True).start()
+    h.pause()
+    sleep(0.7)
+    assert h.status == True
+    h.resume()
+    h.wait()
+    assert h.status == False
+
+def test_hourglass_pause_inline():
+    h = HourGlass(seconds=0.3, backend="inline").start()
+    h.pause()
+    assert 0.29 < h.poll() <= 0.3
+    h.resume()
+    h.wait()
+    assert h.status == False
+
+def test_error_hourglass_pause():
+    h = HourGlass(seconds=1)
+    with pytest.raises(RuntimeError):
+        h.pause()
+    with pytest.raises(RuntimeError):
+        h.reset()
+    h.start()
+    with pytest.raises(RuntimeError):
+        h.resume()
+    h.pause()
+    with pytest.raises(RuntimeError):
+        h.pause()
+    h.stop()
+
 def test_hourglass_eq():
     h1 = HourGlass(5)
     h2 = HourGlass(5)
@@ -99,6 +196,9 @@ def test_hourglass_parameters():
     with pytest.raises(TypeError):
         a = HourGlass(seconds="5", visibility='Yes')
 
+    with pytest.raises(ValueError):
+        a = HourGlass(seconds=0)
+
 def test_error_if_hourglass_already_executing():
     h = HourGlass(5).start()
     with pytest.raises(RuntimeError):
@@ -0,0 +1,175 @@
+try:
+    from ptymer import Instrumenter, instrument, Registry
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Instrumenter, instrument, Registry
+finally:
+    from functools import wraps
+    from threading import Thread
+    from types import ModuleType
+    from time import sleep
+    import sys
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #
+#                      INSTRUMENT TESTS                             #
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+SOURCE = '''
+from functools import wraps
+
+def decorate(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+def work(seconds):
+    sleep(seconds)
+    return helper()
+
+def helper():
+    return 1
+
+@decorate
+def decorated():
+    return 2
+
+def failing():
+    raise ValueError("failing")
+
+def generator():
+    yield 1
+
+class Service:
+    def handle(self):
+        return helper()
+
+    @staticmethod
+    def static():
+        return 3
+
+    @property
+    def value(self):
+        return 4
+'''
+
+def make_module(name="sample"):
+    module = ModuleType(name)
+    module.sleep = sleep
+    exec(SOURCE, module.__dict__)
+    return module
+
+def test_instrument_functions():
+    module, registry = make_module(), Registry()
+    with instrument(module, registry=registry) as instrumenter:
+        assert instrumenter.status == True
+        module.work(0.01)
+        module.helper()
+        module.decorated()
+        module.Service().handle()
+        module.Service.static()
+        module.Service().value
+        list(module.generator())
+        with pytest.raises(ValueError):
+            module.failing()
+    assert instrumenter.status == False
+    assert instrumenter.functions == []
+    stats = registry.snapshot()
+    assert stats["sample.work"]["count"] == 1
+    assert stats["sample.work"]["min"] >= 10_000_000
+    assert stats["sample.helper"]["count"] == 3
+    assert stats["sample.decorated"]["count"] == 1
+    assert stats["sample.failing"]["count"] == 1
+    assert stats["sample.Service.handle"]["count"] == 1
+    assert stats["sample.Service.static"]["count"] == 1
+    assert stats["sample.Service.value"]["count"] == 1
+    assert "sample.generator" not in stats
+    # Generators are left out, functions imported from other modules too
+    assert "sample.wraps" not in stats and "sample.sleep" not in stats
+
+def test_instrument_patterns():
+    module, registry = make_module(), Registry()
+    instrumenter = Instrumenter(module, include="sample.*", exclude=["*.helper", "sample.Service.*"], registry=registry).start()
+    assert instrumenter.functions == ["sample.decorate", "sample.decorated", "sample.failing", "sample.work"]
+    module.work(0)
+    instrumenter.stop()
+    assert registry.snapshot()["sample.work"]["count"] == 1
+    assert registry.snapshot().get("sample.helper", {"count": 0})["count"] == 0
+
+def test_instrument_toggle():
+    module, registry = make_module(), Registry()
+    instrumenter = Instrumenter(module, include="*.helper", registry=registry)
+    for _ in range(2):
+        instrumenter.start()
+        module.helper()
+        instrumenter.stop()
+        module.helper()
+    # Calls made while stopped are not recorded
+    assert registry.snapshot()["sample.helper"]["count"] == 2
+    assert sys.getprofile() is None
+
+def test_instrument_stop_during_call():
+    module, registry = make_module(), Registry()
+    exec("def slow():\n    sleep(0.3)\n    return 1\n", module.__dict__)
+    errors = []
+    def call():
+        try:
+            module.slow()
+        except Exception as e:
+            errors.append(e)
+    instrumenter = instrument(module, include="*.slow", registry=registry)
+    thread = Thread(target=call)
+    thread.start()
+    sleep(0.1)
+    instrumenter.stop()
+    thread.join()
+    # The call returns after the stop in a thread still holding the profiler
+    assert errors == []
+    assert registry.snapshot().get("sample.slow", {"count": 0})["count"] == 0
+
+def test_instrument_threads_and_recursion():
+    module, registry = make_module(), Registry()
+    exec("def countdown(n):\n    return countdown(n - 1) if n else 0\n", module.__dict__)
+    with instrument(module, include="*.countdown", registry=registry):
+        threads = [Thread(target=module.countdown, args=(10,)) for _ in range(4)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+    assert registry.snapshot()["sample.countdown"]["count"] == 44
+
+def test_instrument_package(tmp_path, monkeypatch):
+    package = tmp_path / "instrumented_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("def top():\n    return 1\n")
+    (package / "inner.py").write_text("def nested():\n    return 2\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import instrumented_package.inner
+    registry = Registry()
+    with instrument("instrumented_package", registry=registry) as instrumenter:
+        assert instrumenter.functions == ["instrumented_package.inner.nested", "instrumented_package.top"]
+        instrumented_package.inner.nested()
+    assert registry.snapshot()["instrumented_package.inner.nested"]["count"] == 1
+
+def test_error_instrument():
+    with pytest.raises(TypeError):
+        Instrumenter(1)
+    with pytest.raises(TypeError):
+        Instrumenter("sample", include=[1])
+    with pytest.raises(TypeError):
+        Instrumenter("sample", registry={})
+    with pytest.raises(ImportError):
+        Instrumenter("no_such_module_here").start()
+    instrumenter = Instrumenter(make_module())
+    with pytest.raises(RuntimeError):
+        instrumenter.stop()
+    with instrumenter:
+        with pytest.raises(RuntimeError):
+            instrumenter.start()
+        with pytest.raises(RuntimeError):
+            Instrumenter(make_module()).start()
+    # Only one instrumenter at a time
@@ -0,0 +1,136 @@
+try:
+    from ptymer import Every, Cron, Alarm
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Every, Cron, Alarm
+finally:
+    from ptymer._recurrence import Recurrence
+    from datetime import datetime, timedelta
+    from multiprocessing import Value
+    from time import sleep, time
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                        RECURRENCE TESTS                           #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+NOW = datetime(2026, 10, 18, 12, 34, 56) # a Sunday
+
+def next_date(rule, date=NOW):
+    epoch = rule.next_after(date.timestamp())
+    return None if epoch is None else datetime.fromtimestamp(epoch)
+
+def count_up(counter):
+    with counter.get_lock():
+        counter.value += 1
+
+def test_every():
+    rule = Every(90, start=datetime(2026, 10, 18, 12, 0, 0))
+    assert next_date(rule) == datetime(2026, 10, 18, 12, 36, 0)
+    assert next_date(rule, datetime(2026, 10, 18, 11, 0, 0)) == datetime(2026, 10, 18, 12, 0, 0)
+    assert next_date(rule, datetime(2026, 10, 18, 12, 36, 0)) == datetime(2026, 10, 18, 12, 37, 30)
+
+def test_every_rounding():
+    rule = Every(0.05, start=1792297455.852307)
+    epoch, epochs = rule.start, []
+    for _ in range(100):
+        epoch = rule.next_after(epoch)
+        epochs.append(epoch)
+    assert epochs == sorted(set(epochs))
+    # The division rounds some occurrences below their own index, which must not repeat them
+    assert rule.occurrences(rule.start, epochs[-1]) == (100, epochs[-1])
+
+def test_every_until():
+    rule = Every(60, start=NOW, until=NOW + timedelta(minutes=2))
+    assert next_date(rule, NOW + timedelta(minutes=1)) == NOW + timedelta(minutes=2)
+    assert next_date(rule, NOW + timedelta(minutes=2)) is None
+
+def test_recurrence_abstract():
+    with pytest.raises(TypeError):
+        Recurrence()
+
+def test_occurrences():
+    epoch = NOW.timestamp()
+    every = Every(7, start=NOW - timedelta(minutes=5), until=NOW + timedelta(minutes=30))
+    for start, end in [(epoch, epoch + 600), (epoch - 400, epoch), (epoch, epoch + 3600), (epoch, epoch + 0.5)]:
+        assert every.occurrences(start, end) == super(Every, every).occurrences(start, end)
+    # The closed form of `Every` agrees with walking the occurrences
+    assert every.occurrences(epoch, epoch + 0.5) == (0, None)
+    assert Cron("*/15 * * * *").occurrences(epoch, epoch + 3600) == (4, datetime(2026, 10, 18, 13, 30, 0).timestamp())
+
+def test_cron_fields():
+    assert next_date(Cron("*/15 * * * *")) == datetime(2026, 10, 18, 12, 45, 0)
+    assert next_date(Cron("0 9 * * mon-fri")) == datetime(2026, 10, 19, 9, 0, 0)
+    assert next_date(Cron("30 */10 * * * *")) == datetime(2026, 10, 18, 12, 40, 30)
+    assert next_date(Cron("0 0 1 jan,jul *")) == datetime(2027, 1, 1, 0, 0, 0)
+    assert next_date(Cron("0 0 * * 7")) == datetime(2026, 10, 25, 0, 0, 0)
+    assert next_date(Cron("* * * * *")) == datetime(2026, 10, 18, 12, 35, 0)
+
+def test_cron_macros():
+    assert next_date(Cron("@hourly")) == datetime(2026, 10, 18, 13, 0, 0)
+    assert next_date(Cron("@monthly")) == datetime(2026, 11, 1, 0, 0, 0)
+    assert next_date(Cron("@yearly")) == datetime(2027, 1, 1, 0, 0, 0)
+
+def test_cron_day_or_weekday():
+    assert next_date(Cron("0 0 13 * fri")) == datetime(2026, 10, 23, 0, 0, 0)
+    assert next_date(Cron("0 0 13 * *")) == datetime(2026, 11, 13, 0, 0, 0)
+
+def test_cron_day_step_and_weekday():
+    assert next_date(Cron("0 0 */2 * mon")) == datetime(2026, 10, 19, 0, 0, 0)
+    assert next_date(Cron("0 0 */2 * mon"), datetime(2026, 10, 19, 1, 0, 0)) == datetime(2026, 11, 9, 0, 0, 0)
+    # A day-of-month field starting with `*` is not restricted, so an odd day must also be a Monday
+    assert next_date(Cron("0 0 1-31/2 * mon"), datetime(2026, 10, 19, 1, 0, 0)) == datetime(2026, 10, 21, 0, 0, 0)
+    # The same days written as a range are restricted, so an odd day or a Monday matches
+
+def test_cron_rare():
+    assert next_date(Cron("0 0 29 2 *")) == datetime(2028, 2, 29, 0, 0, 0)
+    assert next_date(Cron("0 0 30 2 *")) is None
+
+def test_cron_until():
+    assert next_date(Cron("@daily", until=NOW + timedelta(hours=1))) is None
+
+def test_alarm_every():
+    counter = Value('i', 0)
+    alarm = Alarm(schedules=[Every(1, until=time() + 2.5)], target=count_up, args=(counter,), backend="thread").start()
+    alarm.wait()
+    assert counter.value == 3
+    assert alarm.schedules == []
+
+def append_line(path):
+    with open(path, "a") as file:
+        file.write("fired\n")
+
+def test_alarm_every_shared(tmp_path):
+    path = str(tmp_path / "fired.txt")
+    alarm = Alarm(schedules=[Every(1, until=time() + 1.5)], target=append_line, args=(path,), shared=True).start()
+    alarm.wait()
+    assert open(path).read().count("fired") == 2
+
+def test_alarm_every_keep_schedules():
+    rule = Every(1, until=time() + 0.5)
+    alarm = Alarm(schedules=[rule], keep_schedules=True, backend="inline").start()
+    alarm.wait()
+    assert alarm.schedules == [rule]
+
+def test_error_recurrence():
+    with pytest.raises(TypeError):
+        Every("1")
+    with pytest.raises(ValueError):
+        Every(0)
+    with pytest.raises(TypeError):
+        Every(1, start=[])
+    with pytest.raises(TypeError):
+        Cron(1)
+    with pytest.raises(ValueError):
+        Cron("* * *")
+    with pytest.raises(ValueError):
+        Cron("61 * * * *")
+    with pytest.raises(ValueError):
+        Cron("*/0 * * * *")
+    with pytest.raises(ValueError):
+        Cron("0 0 * foo *")
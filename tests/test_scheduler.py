@@ -0,0 +1,112 @@
+try:
+    from ptymer import Scheduler, HourGlass, Alarm
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Scheduler, HourGlass, Alarm
+finally:
+    from datetime import datetime, timedelta
+    from time import sleep
+    from psutil import pid_exists
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                        SCHEDULER TESTS                            #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def touch(path):
+    open(path, 'a').close()
+
+def test_scheduler_shared():
+    assert Scheduler.shared() is Scheduler.shared()
+
+def test_scheduler_start_stop():
+    s = Scheduler().start()
+    assert s.status == True
+    assert pid_exists(s.pid)
+    s.stop()
+    assert s.status == False
+
+def test_scheduler_single_worker():
+    h1 = HourGlass(5, shared=True).start()
+    h2 = HourGlass(5, shared=True).start()
+    a = Alarm([datetime.now() + timedelta(seconds=5)], shared=True).start()
+    assert h1.pid == h2.pid == a.pid == Scheduler.shared().pid
+    h1.stop()
+    h2.stop()
+    a.stop()
+
+def test_scheduler_hourglass_start_stop():
+    h = HourGlass(5, shared=True).start()
+    assert h.status == True
+    h.stop()
+    assert h.status == False
+    assert 4 <= h.remaining_seconds <= 5
+    assert Scheduler.shared().status == True
+
+def test_scheduler_hourglass_wait(tmp_path):
+    path = tmp_path / "hourglass"
+    h = HourGlass(1, target=touch, args=(str(path),), shared=True).start()
+    h.wait()
+    assert h.status == False
+    assert path.exists()
+
+def test_scheduler_hourglass_call():
+    h = HourGlass(5, shared=True).start()
+    h(1)
+    assert h.remaining_seconds <= 1
+    h.wait()
+    assert h.status == False
+
+def test_scheduler_alarm_wait(tmp_path):
+    path = tmp_path / "alarm"
+    now = datetime.now()
+    a = Alarm([now + timedelta(seconds=1), now + timedelta(seconds=2)], target=touch, args=(str(path),), shared=True).start()
+    a.wait()
+    assert a.status == False
+    assert path.exists()
+
+def test_scheduler_alarm_reschedule(tmp_path):
+    path = tmp_path / "alarm"
+    now = datetime.now().replace(microsecond=0)
+    a = Alarm([now + timedelta(seconds=30)], target=touch, args=(str(path),), shared=True).start()
+    a.reschedule(now + timedelta(seconds=30), now + timedelta(seconds=1))
+    a.wait()
+    assert path.exists()
+
+def test_scheduler_stop_finishes_handles():
+    s = Scheduler()
+    handle = s._submit("hourglass", 5, None, None, False)
+    assert handle.active == True
+    s.stop()
+    handle.wait()
+    assert handle.active == False
+
+def test_error_scheduler_not_started():
+    s = Scheduler()
+    with pytest.raises(RuntimeError):
+        s.stop()
+    with pytest.raises(AttributeError):
+        s.pid
+
+def test_error_scheduler_already_running():
+    s = Scheduler().start()
+    with pytest.raises(RuntimeError):
+        s.start()
+    s.stop()
+
+def test_error_scheduler_hourglass_already_stopped():
+    h = HourGlass(5, shared=True).start()
+    h.stop()
+    with pytest.raises(RuntimeError):
+        h.stop()
+
+def test_error_scheduler_shared_type():
+    with pytest.raises(TypeError):
+        HourGlass(5, shared='Yes')
+    with pytest.raises(TypeError):
+        Alarm([datetime.now()], shared='Yes')
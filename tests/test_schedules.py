@@ -0,0 +1,164 @@
+try:
+    from ptymer import Alarm, Every
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Alarm, Every
+finally:
+    from ptymer._schedules import Schedules, Cursor, ScheduleQueue, parse_date
+    from array import array
+    from datetime import datetime, timedelta
+    from multiprocessing import Value
+    from time import time
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                        SCHEDULES TESTS                            #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def count_up(counter):
+    with counter.get_lock():
+        counter.value += 1
+
+def test_parse_date():
+    cache = {}
+    assert parse_date("2026-10-18T12:34:56.789", cache) == datetime(2026, 10, 18, 12, 34, 56)
+    assert parse_date("October 18 2026 12:34:56", cache) == datetime(2026, 10, 18, 12, 34, 56)
+    # dateutil fallback
+    assert len(cache) == 2
+    assert parse_date((2026, 10, 18, 12, 34, 56)) == datetime(2026, 10, 18, 12, 34, 56)
+    assert parse_date(datetime(2026, 10, 18, 12, 34, 56).timestamp()) == datetime(2026, 10, 18, 12, 34, 56)
+
+def test_schedules_load():
+    dates = (datetime(2026, 10, 18, 12, 0, second) for second in (30, 10, 20))
+    schedules = Schedules.load(dates)
+    assert list(schedules) == [datetime(2026, 10, 18, 12, 0, second) for second in (10, 20, 30)]
+    assert schedules[-1] == datetime(2026, 10, 18, 12, 0, 30)
+    assert schedules.epochs.typecode == "d"
+
+def test_schedules_mixed():
+    rule = Every(60)
+    epoch = datetime(2026, 10, 18, 12, 0, 0).timestamp()
+    schedules = Schedules.load(["2026-10-18 12:00:01", int(epoch), rule, "2026-10-18 12:00:01"])
+    assert len(schedules) == 4
+    assert schedules[0] == datetime(2026, 10, 18, 12, 0, 0)
+    assert schedules[-1] is rule
+    assert schedules[1:3] == [datetime(2026, 10, 18, 12, 0, 1)] * 2
+    assert schedules[::-1][0] is rule and schedules[-2:][0] == datetime(2026, 10, 18, 12, 0, 1)
+    # Slices are lists, like the slices of the list of schedules
+
+def test_schedules_remove():
+    schedules = Schedules.load([datetime(2026, 10, 18, 12, 0, second) for second in range(5)])
+    schedules.remove(datetime(2026, 10, 18, 12, 0, 0))
+    schedules.remove(datetime(2026, 10, 18, 12, 0, 3))
+    assert schedules == [datetime(2026, 10, 18, 12, 0, second) for second in (1, 2, 4)]
+    with pytest.raises(ValueError):
+        schedules.remove(datetime(2026, 10, 18, 12, 0, 0))
+
+def test_schedules_add():
+    schedules = Schedules.load([datetime(2026, 10, 18, 12, 0, second) for second in (0, 2)])
+    schedules.add(datetime(2026, 10, 18, 12, 0, 1))
+    rule = Every(60)
+    schedules.add(rule)
+    assert schedules == [datetime(2026, 10, 18, 12, 0, second) for second in range(3)] + [rule]
+    assert datetime(2026, 10, 18, 12, 0, 1) in schedules
+    assert datetime(2026, 10, 18, 12, 0, 5) not in schedules
+
+def test_schedule_queue():
+    queue = ScheduleQueue()
+    rule = Every(10, start=100)
+    queue.walk(Cursor(array('d', [1, 3, 3])))
+    queue.push(2, datetime.fromtimestamp(2))
+    queue.push(100, rule)
+    assert len(queue) == 5
+    assert queue.remove(3.0) and queue.remove(Every(10, start=100))
+    assert not queue.remove(Every(10, start=100))
+    assert not queue.remove(7.0)
+    assert len(queue) == 3
+    assert [queue.pop()[0] for _ in range(3) if queue.peek() is not None] == [1, 2, 3]
+    assert queue.peek() is None
+    assert len(queue) == 0
+
+@pytest.mark.parametrize("misfire, epochs, fires", [
+    ("all", [80, 90, 90, 98.5, 100], [True, True, True, True, True]),
+    ("coalesce", [80, 90, 98.5], [True, True, True]),
+    ("skip", [80, 90, 98.5], [True, False, True]),
+])
+def test_schedule_queue_due(misfire, epochs, fires):
+    queue = ScheduleQueue()
+    queue.walk(Cursor(array('d', [90, 98.5])))
+    queue.push(80, Every(10, start=80, until=100))
+    queue.push(200, datetime.fromtimestamp(200))
+    due = queue.due(100, misfire, grace=2)
+    assert [epoch for epoch, _, _, _ in due] == epochs
+    # The occurrences missed by the recurring schedule are due too, in a single entry unless each one fires
+    assert [fired for _, _, fired, _ in due] == fires
+    assert sum(count for _, _, _, count in due) == 5
+    assert queue.peek() == 200
+
+@pytest.mark.parametrize("misfire", ["coalesce", "skip"])
+def test_schedule_queue_due_stall(misfire):
+    queue = ScheduleQueue()
+    rule = Every(0.1, start=0)
+    queue.push(0, rule)
+    due = queue.due(3600.05, misfire, grace=1)
+    assert len(due) == 1
+    assert due[0][0] == 0 and due[0][3] == 36_001
+    # An hour of occurrences every 100 ms is one entry, counted without walking them
+    assert due[0][2]
+    # The latest occurrence is within the grace period, so it fires whatever the policy
+    assert 3600.05 < queue.peek() <= 3600.1 + 1e-6
+    assert queue.due(3600.2, misfire, grace=1)[0][3] == 1
+
+def test_alarm_bulk():
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    dates = (now + timedelta(seconds=offset) for offset in (2, 1, -5))
+    alarm = Alarm.bulk(dates, target=count_up, args=(counter,), backend="thread").start()
+    assert len(alarm.schedules) == 2
+    # The past date is dropped when the alarm starts
+    alarm.wait()
+    assert counter.value == 2
+    assert len(alarm.schedules) == 0
+
+def test_alarm_bulk_keep_schedules():
+    now = datetime.now().replace(microsecond=0)
+    alarm = Alarm.bulk([now + timedelta(seconds=1)], keep_schedules=True, backend="inline").start()
+    alarm.wait()
+    assert alarm.schedules == [now + timedelta(seconds=1)]
+
+def append_line(path):
+    with open(path, "a") as file:
+        file.write("fired\n")
+
+def test_alarm_bulk_shared(tmp_path):
+    path = str(tmp_path / "fired.txt")
+    now = time()
+    alarm = Alarm.bulk([now + 1, now + 1.5], target=append_line, args=(path,), shared=True).start()
+    alarm.wait()
+    assert open(path).read().count("fired") == 2
+
+def test_alarm_bulk_add_schedule():
+    counter = Value('i', 0)
+    now = datetime.now().replace(microsecond=0)
+    alarm = Alarm.bulk([now + timedelta(seconds=2), now + timedelta(seconds=3)], target=count_up, args=(counter,), backend="thread").start()
+    alarm.add_schedule(now + timedelta(seconds=1))
+    alarm.remove_schedule(now + timedelta(seconds=3))
+    assert alarm.schedules == [now + timedelta(seconds=1), now + timedelta(seconds=2)]
+    alarm.wait()
+    assert counter.value == 2
+    assert len(alarm.schedules) == 0
+
+def test_error_schedules():
+    with pytest.raises(TypeError):
+        Alarm.bulk(1)
+    with pytest.raises(TypeError):
+        Alarm.bulk("2026-10-18")
+    with pytest.raises(TypeError):
+        Alarm.bulk(["not a date"])
+    with pytest.raises(ValueError):
+        Alarm.bulk(iter([]))
@@ -0,0 +1,99 @@
+try:
+    from ptymer import SpanTree, SPANS, Timer, Registry
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import SpanTree, SPANS, Timer, Registry
+finally:
+    from ptymer._spans import CURRENT
+    from time import sleep
+    import asyncio
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                          SPANS TESTS                              #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def handler(tree, registry):
+    with Timer(name="handler", spans=tree, registry=registry):
+        with Timer(name="parse", registry=registry):
+            sleep(0.01)
+        for _ in range(2):
+            with Timer(name="query", registry=registry):
+                sleep(0.02)
+
+def test_spans_tree():
+    tree = SpanTree()
+    handler(tree, Registry())
+    handler(tree, Registry())
+    paths = {path: node for path, node in tree.walk()}
+    assert set(paths) == {("handler",), ("handler", "parse"), ("handler", "query")}
+    assert paths[("handler",)].count == 2
+    assert paths[("handler", "query")].count == 4
+    assert paths[("handler",)].total >= paths[("handler", "parse")].total + paths[("handler", "query")].total
+    assert paths[("handler", "query")].self_time == paths[("handler", "query")].total
+    assert CURRENT.get() is None
+
+def test_spans_collapsed():
+    tree = SpanTree()
+    handler(tree, Registry())
+    lines = tree.collapsed().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["handler", "handler;query", "handler;parse"]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in lines)
+
+def test_spans_report():
+    tree = SpanTree()
+    handler(tree, Registry())
+    report = tree.report().splitlines()
+    assert report[0].startswith("handler: count=1")
+    assert report[0].endswith("(100.0%)")
+    assert report[1].startswith("  query: count=2")
+
+def test_spans_decorator():
+    tree = SpanTree()
+    registry = Registry()
+
+    @Timer(name="child", registry=registry)
+    def child():
+        pass
+
+    @Timer(name="parent", registry=registry, spans=tree)
+    def parent():
+        child()
+        child()
+
+    parent()
+    assert [path for path, _ in tree.walk()] == [("parent",), ("parent", "child")]
+
+def test_spans_tasks():
+    tree = SpanTree()
+    registry = Registry()
+
+    async def stage(name):
+        with Timer(name=name, registry=registry):
+            await asyncio.sleep(0.01)
+
+    async def request():
+        with Timer(name="request", registry=registry, spans=tree):
+            await asyncio.gather(stage("a"), stage("b"))
+
+    asyncio.run(request())
+    assert {path for path, _ in tree.walk()} == {("request",), ("request", "a"), ("request", "b")}
+
+def test_spans_without_tree():
+    with Timer(registry=Registry()):
+        assert CURRENT.get() is None
+
+def test_spans_reset():
+    tree = SpanTree()
+    handler(tree, Registry())
+    tree.reset()
+    assert list(tree.walk()) == []
+
+def test_error_spans():
+    with pytest.raises(TypeError):
+        Timer(spans="tree")
@@ -0,0 +1,110 @@
+try:
+    from ptymer import Registry, REGISTRY, Timer
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Registry, REGISTRY, Timer
+finally:
+    from ptymer._stats import Metric, bucket_index, bucket_bounds, BUCKETS
+    from threading import Thread
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                          STATS TESTS                              #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def test_bucket_bounds():
+    for value in (0, 1, 31, 32, 63, 64, 65, 1000, 123456789, 2**62 + 12345):
+        lowest, highest = bucket_bounds(bucket_index(value))
+        assert lowest <= value <= highest
+        assert highest - lowest <= max(value // 32, 1)
+    assert bucket_index(2**63 - 1) == BUCKETS - 1
+
+def test_metric_record():
+    m = Metric("test")
+    for value in (10, 20, 30):
+        m.record(value)
+    stats = m.snapshot()
+    assert stats["count"] == 3
+    assert stats["sum"] == 60
+    assert stats["min"] == 10
+    assert stats["max"] == 30
+    assert stats["mean"] == 20
+
+def test_metric_percentiles():
+    m = Metric("test")
+    for value in range(1, 100001):
+        m.record(value)
+    assert m.snapshot()["count"] == 100000
+    for percentile in (50, 90, 99, 99.9):
+        estimate = m.copy().percentile(percentile)
+        assert abs(estimate - percentile * 1000) <= percentile * 1000 / 32
+
+def test_metric_weight():
+    m = Metric("test")
+    m.record(100, weight=10)
+    stats = m.snapshot()
+    assert stats["count"] == 10
+    assert stats["sum"] == 1000
+
+def test_metric_threads():
+    m = Metric("test")
+
+    def work():
+        for value in range(10000):
+            m.record(value)
+
+    threads = [Thread(target=work) for _ in range(4)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    assert m.snapshot()["count"] == 40000
+
+def test_registry_snapshot():
+    r = Registry()
+    r.record("a", 100)
+    r.record("b", 200)
+    snapshot = r.snapshot(percentiles=(50,))
+    assert set(snapshot) == {"a", "b"}
+    assert snapshot["a"]["p50"] == 100
+    assert "p99" not in snapshot["a"]
+
+def test_registry_reset():
+    r = Registry()
+    r.record("a", 100)
+    r.reset()
+    assert r.snapshot()["a"]["count"] == 0
+
+def test_timer_records():
+    r = Registry()
+    with Timer(name="block", registry=r):
+        pass
+    timer = Timer(name="block", registry=r).start()
+    timer.stop()
+    assert r.snapshot()["block"]["count"] == 2
+
+def test_timer_decorator_records():
+    @Timer()
+    def decorated():
+        pass
+
+    for _ in range(10):
+        decorated()
+    assert REGISTRY.snapshot()[f"{__name__}.test_timer_decorator_records.<locals>.decorated"]["count"] == 10
+
+def test_timer_without_name_does_not_record():
+    r = Registry()
+    with Timer(registry=r):
+        pass
+    assert len(r) == 0
+
+def test_error_stats():
+    with pytest.raises(ValueError):
+        Metric("test").percentile(101)
+    with pytest.raises(TypeError):
+        Timer(name=1)
+    with pytest.raises(TypeError):
+        Timer(registry={})
@@ -7,6 +7,10 @@ except ImportError:
 finally:
     from datetime import timedelta
     from time import sleep
+    from ptymer import Registry
+    from concurrent.futures import ThreadPoolExecutor
+    from contextvars import copy_context
+    import asyncio
     import pytest
 
 #####################################################################
@@ -57,6 +61,29 @@ def test_timer_decorator():
 
     assert test_func() == "Test function"
 
+def test_timer_decorator_recursive():
+    timer = Timer()
+
+    @timer
+    def countdown(n):
+        assert timer.status == True
+        return countdown(n - 1) if n > 0 else n
+
+    assert countdown(5) == 0
+    assert timer.status == False
+
+def test_timer_clock():
+    for clock in ("perf_counter_ns", "monotonic_ns", "process_time_ns", "thread_time_ns"):
+        timer = Timer(clock=clock).start()
+        assert isinstance(timer.stop(), timedelta)
+
+def test_timer_custom_clock():
+    readings = iter([1_000, 3_000, 6_000])
+    timer = Timer(clock=lambda: next(readings)).start()
+    timer.mark("Test mark")
+    assert timer.marks[0][0] == timedelta(microseconds=2)
+    assert timer.stop() == timedelta(microseconds=5)
+
 def test_timer_eq():
     h1 = Timer().start()
     h2 = Timer().start()
@@ -118,6 +145,12 @@ def test_error_current_time_not_started():
     with pytest.raises(RuntimeError):
         print(timer.current_time)
 
+def test_error_timer_clock():
+    with pytest.raises(ValueError):
+        Timer(clock="sundial")
+    with pytest.raises(TypeError):
+        Timer(clock=1)
+
 def test_timer_error_eq():
     h1 = Timer().start()
     h2 = 777
@@ -152,4 +185,157 @@ def test_timer_error_ge():
     h2 = 777
     h1 = Timer().start()
     with pytest.raises(TypeError):
-        h1 >= h2
\ No newline at end of file
+        h1 >= h2
+
+def test_timer_sample_rate():
+    r = Registry()
+
+    @Timer(registry=r, sample_rate=0.1)
+    def sampled():
+        pass
+
+    for _ in range(100):
+        sampled()
+    stats = r.snapshot()[f"{__name__}.test_timer_sample_rate.<locals>.sampled"]
+    assert stats["count"] == 100
+    # 10 calls timed, each one recorded with a weight of 10
+
+    tm = Timer(name="block", registry=r, sample_rate=0.5)
+    for _ in range(10):
+        with tm:
+            pass
+    assert r.snapshot()["block"]["count"] == 10
+    assert not tm.status
+
+    tm = Timer(name="explicit", registry=r, sample_rate=0.1)
+    for _ in range(3):
+        tm.start()
+        tm.stop()
+    assert r.snapshot()["explicit"]["count"] == 3
+    # Explicit runs are always measured, each one stands for a single call
+
+def test_error_sample_rate():
+    with pytest.raises(TypeError):
+        Timer(sample_rate="0.5")
+    with pytest.raises(ValueError):
+        Timer(sample_rate=0)
+    with pytest.raises(ValueError):
+        Timer(sample_rate=2)
+
+def test_timer_marks_view():
+    readings = iter(range(0, 10_000, 1_000))
+    timer = Timer(clock=lambda: next(readings)).start()
+    [timer.mark("loop") for _ in range(5)]
+    marks = timer.marks
+    assert len(marks) == 5
+    assert marks[-1] == (timedelta(microseconds=5), "loop")
+    assert [mark[0] for mark in marks[1:4:2]] == [timedelta(microseconds=2), timedelta(microseconds=4)]
+    assert marks.nanoseconds(0) == 1_000
+    timer.mark()
+    assert len(marks) == 6
+    # The view follows the marks added later
+    assert dict(marks.items())[5][1] == ""
+
+def test_timer_slots():
+    timer = Timer()
+    assert "_Timer__marks" in vars(Timer)
+    assert not hasattr(timer, "__dict__")
+    with pytest.raises(AttributeError):
+        timer.unknown = 1
+
+def test_timer_marks_threads():
+    timer = Timer()
+    def work(label):
+        with timer:
+            [timer.mark(label) for _ in range(2000)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, [f"thread {index}" for index in range(8)]))
+    marks = timer.marks
+    assert len(marks) == 16000
+    for index in range(8):
+        offsets = [marks.nanoseconds(position) for position, (_, label) in marks.items() if label == f"thread {index}"]
+        assert len(offsets) == 2000
+        assert offsets == sorted(offsets)
+    # Each offset keeps the label of the thread that marked it
+
+def test_timer_context_size():
+    before = len(copy_context())
+    for _ in range(1000):
+        with Timer(budget=10, clock="process_time_ns"):
+            pass
+        Timer().start().stop()
+    assert len(copy_context()) <= before + 1
+    # Stopped timers leave no variable behind in the context of the thread
+
+def test_timer_decorator_threads():
+    r = Registry()
+
+    @Timer(registry=r)
+    def work():
+        sleep(0.05)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        [future.result() for future in [pool.submit(work) for _ in range(16)]]
+    stats = r.snapshot()[f"{__name__}.test_timer_decorator_threads.<locals>.work"]
+    assert stats["count"] == 16
+    assert stats["min"] >= 50_000_000
+    assert stats["max"] < 150_000_000
+
+def test_timer_decorator_tasks():
+    r = Registry()
+    timer = Timer(registry=r)
+
+    @timer
+    async def work():
+        assert timer.status == True
+        await asyncio.sleep(0.05)
+
+    async def main():
+        await asyncio.gather(*(work() for _ in range(10)))
+        assert timer.status == False
+
+    asyncio.run(main())
+    stats = r.snapshot()[f"{__name__}.test_timer_decorator_tasks.<locals>.work"]
+    assert stats["count"] == 10
+    assert stats["min"] >= 50_000_000
+    assert stats["max"] < 150_000_000
+
+def test_timer_budget_overrun():
+    overruns = []
+
+    def slow_stage():
+        sleep(0.3)
+
+    @Timer(budget=0.1, on_overrun=lambda elapsed, stack: overruns.append((elapsed, stack)))
+    def work():
+        slow_stage()
+        assert len(overruns) == 1
+        # Reported while the call is still running
+
+    work()
+    elapsed, stack = overruns[0]
+    assert timedelta(seconds=0.1) <= elapsed < timedelta(seconds=0.3)
+    assert stack[-1].name in ("slow_stage", "sleep")
+    assert any(frame.name == "slow_stage" for frame in stack)
+
+def test_timer_budget_in_time():
+    overruns = []
+    timer = Timer(budget=0.1, on_overrun=lambda elapsed, stack: overruns.append(elapsed))
+    for _ in range(100):
+        with timer:
+            pass
+    timer.start()
+    timer.stop()
+    sleep(0.2)
+    # Disarmed when the runs end
+    assert overruns == []
+
+def test_error_timer_budget():
+    with pytest.raises(TypeError):
+        Timer(budget="1")
+    with pytest.raises(ValueError):
+        Timer(budget=0)
+    with pytest.raises(TypeError):
+        Timer(budget=1, on_overrun=1)
+    with pytest.raises(ValueError):
+        Timer(on_overrun=print)
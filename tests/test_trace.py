@@ -0,0 +1,134 @@
+try:
+    from ptymer import TraceRecorder, Timer, HourGlass, Alarm, Registry
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import TraceRecorder, Timer, HourGlass, Alarm, Registry
+finally:
+    from datetime import datetime, timedelta
+    from threading import Thread
+    from os import getpid
+    from time import sleep
+    import json
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                          TRACE TESTS                              #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def read_trace(path):
+    text = open(path).read().rstrip().rstrip(",")
+    return json.loads(text + "]")
+
+def target():
+    sleep(0.01)
+
+def test_trace_timer(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path):
+        with Timer(name="outer", registry=Registry()) as tm:
+            tm.mark("checkpoint")
+            with Timer(name="inner", registry=Registry()):
+                sleep(0.01)
+    events = read_trace(path)
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert set(complete) == {"outer", "inner"}
+    assert complete["inner"]["dur"] >= 10_000
+    assert complete["outer"]["ts"] <= complete["inner"]["ts"]
+    assert complete["outer"]["pid"] == getpid()
+    instant = [event for event in events if event["ph"] == "i"]
+    assert instant[0]["name"] == "checkpoint"
+    assert instant[0]["args"]["timer"] == "outer"
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+
+def test_trace_timer_clock(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path):
+        with Timer(name="outer", registry=Registry()):
+            with Timer(name="cpu", clock="process_time_ns", registry=Registry()):
+                sleep(0.05)
+    complete = {event["name"]: event for event in read_trace(path) if event["ph"] == "X"}
+    assert complete["outer"]["ts"] <= complete["cpu"]["ts"]
+    assert complete["cpu"]["ts"] + complete["cpu"]["dur"] <= complete["outer"]["ts"] + complete["outer"]["dur"]
+    # The event is placed on the wall clock, inside its parent
+    assert complete["cpu"]["dur"] >= 50_000
+    assert complete["cpu"]["args"]["elapsed_ns"] < 50_000_000
+    # Sleeping costs no processor time
+
+def test_trace_threads(tmp_path):
+    path = str(tmp_path / "trace.json")
+    timer = Timer(name="work", registry=Registry())
+
+    @timer
+    def work():
+        sleep(0.01)
+
+    with TraceRecorder(path):
+        threads = [Thread(target=work) for _ in range(3)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+    tids = {event["tid"] for event in read_trace(path) if event["ph"] == "X"}
+    assert len(tids) == 3
+
+def test_trace_buffer(tmp_path):
+    path = str(tmp_path / "trace.json")
+    recorder = TraceRecorder(path, buffer_size=4).start()
+    for _ in range(10):
+        with Timer(name="block", registry=Registry()):
+            pass
+    assert len(read_trace(path)) >= 4
+    # Events are written before the recorder stops
+    recorder.stop()
+    assert len([event for event in read_trace(path) if event["ph"] == "X"]) == 10
+
+def test_trace_hourglass_thread(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path):
+        hg = HourGlass(seconds=0.1, target=target, backend="thread").start()
+        hg.wait()
+    events = [event for event in read_trace(path) if event["ph"] == "X"]
+    assert events[0]["name"] == "HourGlass target"
+    assert events[0]["cat"] == "hourglass"
+
+def test_trace_hourglass_process(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path):
+        hg = HourGlass(seconds=0.2, target=target).start()
+        hg.wait()
+    events = [event for event in read_trace(path) if event["ph"] == "X"]
+    assert events[0]["name"] == "HourGlass target"
+    assert events[0]["pid"] != getpid()
+
+def test_trace_alarm(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path):
+        alarm = Alarm(schedules=[datetime.now() + timedelta(seconds=1)], target=target, backend="thread").start()
+        alarm.wait()
+    events = [event for event in read_trace(path) if event["ph"] == "X"]
+    assert events[0]["cat"] == "alarm"
+
+def test_trace_stopped(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with TraceRecorder(path) as recorder:
+        pass
+    with Timer(name="block", registry=Registry()):
+        pass
+    assert read_trace(path) == []
+    assert recorder.status == False
+
+def test_error_trace(tmp_path):
+    with pytest.raises(TypeError):
+        TraceRecorder(1)
+    with pytest.raises(ValueError):
+        TraceRecorder(str(tmp_path / "trace.json"), buffer_size=0)
+    recorder = TraceRecorder(str(tmp_path / "trace.json"))
+    with pytest.raises(RuntimeError):
+        recorder.stop()
+    recorder.start()
+    with pytest.raises(RuntimeError):
+        recorder.start()
+    recorder.stop()
@@ -0,0 +1,166 @@
+try:
+    from ptymer import Watchdog
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import Watchdog
+finally:
+    import ptymer._watchdog as watchdog_module
+    from socket import socketpair
+    from threading import Thread
+    from time import monotonic, sleep
+    import asyncio
+    import signal
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                        WATCHDOG TESTS                             #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def busy(seconds):
+    end = monotonic() + seconds
+    while monotonic() < end:
+        pass
+
+@pytest.mark.parametrize("work", [sleep, busy])
+def test_watchdog_main_thread(work):
+    started = monotonic()
+    with pytest.raises(TimeoutError):
+        with Watchdog(0.2) as w:
+            work(2)
+    assert monotonic() - started < 0.5
+    assert w.expired == True
+    assert w.status == False
+    assert signal.getsignal(signal.SIGALRM) == signal.SIG_DFL
+
+def test_watchdog_in_time():
+    with Watchdog(0.5) as w:
+        assert 0 < w.remaining_seconds <= 0.5
+        sleep(0.1)
+    sleep(0.6)
+    # Disarmed when the block ends
+    assert w.expired == False
+
+def test_watchdog_nested():
+    started = monotonic()
+    with Watchdog(0.2) as outer:
+        with pytest.raises(TimeoutError):
+            with Watchdog(5) as inner:
+                sleep(2)
+    # The outer budget interrupts the inner block
+    assert monotonic() - started < 0.5
+    assert outer.expired == True
+    assert inner.expired == False
+
+def test_watchdog_signal_while_switching(monkeypatch):
+    started = monotonic()
+    with pytest.raises(TimeoutError):
+        with Watchdog(0.1):
+            monkeypatch.setattr(watchdog_module, "_switching", lambda frame: True)
+            sleep(0.3)
+            # The signal arrives while the watchdog seems to be switching, it must not be lost
+            monkeypatch.setattr(watchdog_module, "_switching", lambda frame: False)
+            sleep(2)
+    assert monotonic() - started < 0.5
+
+def test_watchdog_thread():
+    results = []
+    def work():
+        started = monotonic()
+        try:
+            with Watchdog(0.2):
+                busy(2)
+        except TimeoutError as e:
+            results.append((str(e), monotonic() - started))
+    thread = Thread(target=work)
+    thread.start()
+    thread.join()
+    assert results[0][0]
+    assert results[0][1] < 0.5
+
+def test_watchdog_thread_while_switching(monkeypatch):
+    results = []
+    def work():
+        started = monotonic()
+        try:
+            with Watchdog(0.1):
+                monkeypatch.setattr(watchdog_module, "_switching", lambda frame: True)
+                busy(0.3)
+                # The wheel fires while the watchdog seems to be switching, it must not be lost
+                monkeypatch.setattr(watchdog_module, "_switching", lambda frame: False)
+                busy(2)
+        except TimeoutError as e:
+            results.append(monotonic() - started)
+    thread = Thread(target=work)
+    thread.start()
+    thread.join()
+    assert results and results[0] < 0.6
+
+def test_watchdog_thread_no_leak():
+    results = []
+    def work():
+        for index in range(500):
+            try:
+                with Watchdog(0.01):
+                    busy(0.0095 if index % 2 else 0)
+            except TimeoutError as e:
+                if not e.args:
+                    results.append("leaked")
+            # Running out inside the block is allowed, the error then gets its message from `__exit__()`
+        results.append("done")
+    # Budgets expiring right as the block ends never raise after it, as a bare `TimeoutError`
+    thread = Thread(target=work)
+    thread.start()
+    thread.join()
+    assert results == ["done"]
+
+def test_watchdog_thread_other_exception():
+    results = []
+    def work():
+        left, right = socketpair()
+        left.settimeout(0.3)
+        try:
+            with Watchdog(0.1):
+                left.recv(1)
+        except OSError:
+            results.append("raised")
+        # The budget runs out during the call, which then raises an error of its own
+        try:
+            busy(0.2)
+            results.append("done")
+        except TimeoutError:
+            results.append("leaked")
+        left.close(), right.close()
+    thread = Thread(target=work)
+    thread.start()
+    thread.join()
+    assert results == ["raised", "done"]
+
+def test_watchdog_decorator():
+    @Watchdog(0.1)
+    def slow():
+        sleep(1)
+    with pytest.raises(TimeoutError):
+        slow()
+
+def test_watchdog_coroutine():
+    @Watchdog(0.1)
+    async def slow():
+        await asyncio.sleep(1)
+    with pytest.raises((TimeoutError, asyncio.TimeoutError)):
+        asyncio.run(slow())
+
+def test_error_watchdog():
+    with pytest.raises(TypeError):
+        Watchdog("1")
+    with pytest.raises(ValueError):
+        Watchdog(0)
+    w = Watchdog(1)
+    with pytest.raises(RuntimeError):
+        with w:
+            with w:
+                pass
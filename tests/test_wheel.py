@@ -0,0 +1,157 @@
+try:
+    from ptymer import TimeoutWheel
+except ImportError:
+    import sys
+    sys.path.insert(1, r'.\src')
+    from ptymer import TimeoutWheel
+finally:
+    from threading import Barrier, Thread
+    from time import monotonic, sleep
+    import pytest
+
+#####################################################################
+#                                                                   #
+#                                                                   #              
+#                          WHEEL TESTS                              #                                      
+#                                                                   #
+#                                                                   #
+#####################################################################
+
+def stamp(fired, value):
+    fired.append((value, monotonic()))
+
+def test_wheel_shared():
+    assert TimeoutWheel.shared() is TimeoutWheel.shared()
+    assert TimeoutWheel.shared().status == True
+
+def test_wheel_start_stop():
+    w = TimeoutWheel().start()
+    assert w.status == True
+    w.arm(10)
+    w.stop()
+    assert w.status == False
+    assert len(w) == 0
+
+def test_wheel_start_concurrent():
+    w, barrier, started = TimeoutWheel(), Barrier(8), []
+    def start():
+        barrier.wait()
+        try:
+            w.start()
+            started.append(True)
+        except RuntimeError:
+            started.append(False)
+    threads = [Thread(target=start) for _ in range(8)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    assert started.count(True) == 1
+    w.stop()
+
+def test_wheel_reschedule_concurrent():
+    w, fired = TimeoutWheel().start(), []
+    timeouts = [w.arm(0.01, stamp, (fired, index)) for index in range(200)]
+    def reschedule():
+        for _ in range(50):
+            [timeout.reschedule(0.01) for timeout in timeouts]
+    threads = [Thread(target=reschedule) for _ in range(4)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    sleep(0.2)
+    # Rescheduled while the driver expires them, each one still fires once it is left alone
+    assert sorted(set(value for value, _ in fired)) == list(range(200))
+    assert len(w) == 0
+    w.stop()
+
+def test_wheel_fire():
+    w, fired = TimeoutWheel().start(), []
+    started = monotonic()
+    t = w.arm(0.1, stamp, (fired, "a"))
+    assert t.status == True
+    sleep(0.3)
+    assert fired[0][0] == "a"
+    assert 0.1 <= fired[0][1] - started < 0.2
+    assert t.status == False
+    assert len(w) == 0
+    w.stop()
+
+def test_wheel_cancel():
+    w, fired = TimeoutWheel().start(), []
+    t = w.arm(0.1, stamp, (fired, "a"))
+    assert t.cancel() == True
+    assert t.cancel() == False
+    sleep(0.2)
+    assert fired == []
+    w.stop()
+
+def test_wheel_many():
+    w = TimeoutWheel()
+    timeouts = [w.arm(30) for _ in range(10000)]
+    assert len(w) == 10000
+    [timeout.cancel() for timeout in timeouts]
+    assert len(w) == 0
+
+def test_wheel_reschedule():
+    w, fired = TimeoutWheel().start(), []
+    t = w.arm(10, stamp, (fired, "a"))
+    t.reschedule(0.1)
+    assert len(w) == 1
+    assert t.remaining_seconds <= 0.11
+    sleep(0.3)
+    assert [value for value, _ in fired] == ["a"]
+    t.reschedule(0.1)
+    # An expired timeout can be armed again
+    sleep(0.3)
+    assert [value for value, _ in fired] == ["a", "a"]
+    w.stop()
+
+@pytest.mark.parametrize("levels", [1, 4])
+def test_wheel_cascade(levels):
+    w, fired = TimeoutWheel(resolution=0.001, levels=levels).start(), []
+    started = monotonic()
+    [w.arm(seconds, stamp, (fired, seconds)) for seconds in (0.6, 0.05, 0.3)]
+    # 300 and 600 ticks are beyond the first level, and beyond the range of a single level
+    sleep(0.9)
+    assert [value for value, _ in fired] == [0.05, 0.3, 0.6]
+    assert all(0 <= stamped - started - value < 0.1 for value, stamped in fired)
+    w.stop()
+
+def test_wheel_poll():
+    w, fired = TimeoutWheel(), []
+    assert w.poll() is None
+    w.arm(0.1, stamp, (fired, "a"))
+    assert 0 < w.poll() <= 0.11
+    sleep(0.15)
+    assert w.poll() is None
+    assert [value for value, _ in fired] == ["a"]
+
+def test_wheel_poll_jump(monkeypatch):
+    import ptymer._wheel as wheel_module
+    w, fired, skew = TimeoutWheel(), [], [0]
+    monkeypatch.setattr(wheel_module, "monotonic", lambda: monotonic() + skew[0])
+    [w.arm(seconds, stamp, (fired, seconds)) for seconds in (2e6, 5, 1)]
+    skew[0] = 1e6
+    # A jump of 1e8 ticks leaps to the current tick instead of walking each of them
+    started = monotonic()
+    assert 0 < w.poll() <= 1e6
+    assert monotonic() - started < 1
+    assert [value for value, _ in fired] == [1, 5]
+    skew[0] = 2e6 + 1
+    assert w.poll() is None
+    assert [value for value, _ in fired] == [1, 5, 2e6]
+
+def test_error_wheel():
+    with pytest.raises(TypeError):
+        TimeoutWheel(resolution="1")
+    with pytest.raises(ValueError):
+        TimeoutWheel(levels=0)
+    w = TimeoutWheel()
+    with pytest.raises(TypeError):
+        w.arm("1")
+    with pytest.raises(ValueError):
+        w.arm(-1)
+    with pytest.raises(TypeError):
+        w.arm(1, target=1)
+    with pytest.raises(ValueError):
+        w.arm(1, args=(1,))
+    with pytest.raises(RuntimeError):
+        w.stop()